@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the skill scripts.
+
+Runs every script under `python -X importtime` on its usage-error path (no
+input) and, for the scripts the daemon serves, on the daemon-forwarding path
+(against a stub daemon socket). Reports the import time each script adds on
+top of interpreter startup, and fails when a script loads a module that only
+network calls need or exceeds the time budget.
+
+Usage:
+    python3 benchmarks/import_budget.py [--budget-ms 30] [--runs 5] [--output FILE]
+"""
+import os
+import ast
+import sys
+import json
+import glob
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load on a code path that makes a network call
+FORBIDDEN = (
+    "http.client", "ssl", "email.parser", "urllib.request", "concurrent.futures",
+    "asyncio", "sqlite3", "gzip", "hashlib", "random", "socketserver",
+)
+
+# Input that makes a forwarding script hand its action to the daemon
+FORWARD_INPUT = json.dumps({"action": "matches"})
+
+
+def parse_importtime(stderr):
+    """Return {module: self microseconds} from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        if self_us.strip().isdigit():
+            modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_importtime(args, cwd=None, env=None, stdin_data=None):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd, env=env, input=stdin_data or "", capture_output=True, text=True,
+    )
+    return proc.stdout, parse_importtime(proc.stderr)
+
+
+def forwarded_scripts(scripts_dir):
+    """Read daemon.SCRIPTS without importing the daemon."""
+    path = os.path.join(scripts_dir, "daemon.py")
+    if not os.path.exists(path):
+        return ()
+    for node in ast.parse(open(path).read()).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "SCRIPTS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return ()
+
+
+def find_scripts():
+    """Yield (scripts dir, script name) for every runnable script."""
+    for path in sorted(glob.glob(os.path.join(ROOT, "skills", "*", "scripts", "*.py"))):
+        with open(path) as f:
+            if 'if __name__ == "__main__":' in f.read():
+                yield os.path.dirname(path), os.path.splitext(os.path.basename(path))[0]
+
+
+class StubDaemon:
+    """Unix socket that answers every daemon request with an empty success."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="jobclaw-bench-")
+        self.path = os.path.join(self.dir, "daemon.sock")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(self.path)
+        self.sock.listen(8)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn, conn.makefile("rb") as reader:
+                if reader.readline():
+                    conn.sendall(b'{"result": {"success": true}}\n')
+
+    def close(self):
+        self.sock.close()
+        os.remove(self.path)
+        os.rmdir(self.dir)
+
+
+def measure(scripts_dir, script, path, baseline, runs, env):
+    """Return the measurement record for one script on one code path."""
+    args = [f"{script}.py"]
+    stdin_data = FORWARD_INPUT if path == "forward" else None
+
+    best = None
+    for _ in range(runs + 1):  # The first run only warms the bytecode cache
+        stdout, modules = run_importtime(args, scripts_dir, env, stdin_data)
+        added = {name: us for name, us in modules.items() if name not in baseline}
+        cost = sum(added.values())
+        if best is None or cost < best[0]:
+            best = (cost, added, stdout)
+
+    cost, added, stdout = best
+    forbidden = sorted(name for name in added
+                       if any(name == f or name.startswith(f + ".") for f in FORBIDDEN))
+    record = {
+        "script": os.path.relpath(os.path.join(scripts_dir, f"{script}.py"), ROOT),
+        "path": path,
+        "importMs": round(cost / 1000, 2),
+        "modules": len(added),
+        "forbidden": forbidden,
+    }
+    if path == "forward" and '"success": true' not in stdout:
+        record["error"] = "script did not forward to the daemon"
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=30.0,
+                        help="maximum import time a script may add to interpreter startup")
+    parser.add_argument("--runs", type=int, default=5, help="runs per measurement (the fastest counts)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    _, baseline = run_importtime(["-c", "pass"])
+    daemon = StubDaemon()
+    env = dict(os.environ, JOBCLAW_DAEMON_SOCKET=daemon.path)
+    env.pop("JOBCLAW_DAEMON", None)
+    # Measure imports from cached bytecode, as installed scripts run
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    results = []
+    try:
+        for scripts_dir, script in find_scripts():
+            paths = ["usage"]
+            if script in forwarded_scripts(scripts_dir):
+                paths.append("forward")
+            for path in paths:
+                record = measure(scripts_dir, script, path, baseline, args.runs, env)
+                record["ok"] = (record["importMs"] <= args.budget_ms and not record["forbidden"]
+                                and "error" not in record)
+                results.append(record)
+    finally:
+        daemon.close()
+
+    report = {
+        "python": sys.version.split()[0],
+        "budgetMs": args.budget_ms,
+        "ok": all(r["ok"] for r in results),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
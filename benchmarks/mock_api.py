@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the JobClaw API, for benchmarks.
+
+Implements the endpoints the skill scripts call (/auth/token, /auth/verify,
+/jobs, /jobs/my-jobs, /jobs/{id}, /matches, /matches/job/{id} and
+/job-seekers/*) with configurable data sizes, injected latency and error
+rates. It speaks keep-alive HTTP/1.1, pages list endpoints that are given
+page/pageSize (or cursor/pageSize) parameters, answers conditional GETs
+with 304, gzips large responses for clients that accept it and accepts
+gzip request bodies. Request counts and bytes on the wire are recorded.
+
+Usage:
+    python3 benchmarks/mock_api.py [--port 8765] [--jobs 50] [--matches 10]
+                                   [--latency-ms 0] [--error-rate 0]
+
+The server prints its base URL on the first line of stdout (use --port 0
+for a free port). GET /__stats returns the counters, POST /__reset clears
+them and POST /__configure changes settings such as {"jobs": 50}; none of
+these are counted.
+"""
+import re
+import json
+import time
+import gzip
+import uuid
+import random
+import socket
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WORDS = (
+    "python", "backend", "platform", "distributed", "systems", "product", "design",
+    "data", "pipeline", "mentoring", "remote", "hybrid", "startup", "scale",
+    "latency", "reliability", "frontend", "mobile", "cloud", "security", "team",
+    "ownership", "growth", "analytics", "machine", "learning", "infrastructure",
+)
+
+
+class _Counted:
+    """File wrapper that adds the bytes read or written to a stats counter."""
+
+    def __init__(self, raw, api, key):
+        self._raw = raw
+        self._api = api
+        self._key = key
+
+    def read(self, *args):
+        data = self._raw.read(*args)
+        self._api.count(self._key, len(data))
+        return data
+
+    def readline(self, *args):
+        data = self._raw.readline(*args)
+        self._api.count(self._key, len(data))
+        return data
+
+    def write(self, data):
+        self._api.count(self._key, len(data))
+        return self._raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class MockAPI:
+    """
+    In-process JobClaw API stand-in.
+
+    Args:
+        jobs: Number of jobs returned by /jobs/my-jobs
+        matches: Number of matches per job (and for a job seeker's /matches)
+        latency_ms: Delay added before every response
+        jitter_ms: Random extra delay of up to this many milliseconds
+        payload_bytes: Size of the free-text field of every job, profile and match
+        error_rate: Fraction of non-auth requests answered with `error_status`
+        error_status: Status of injected errors (429 and 503 carry Retry-After: 0)
+        compress: Whether to gzip large responses for clients that accept it
+        seed: Seed for the generated text, latency jitter and injected errors
+    """
+
+    def __init__(self, jobs=5, matches=10, latency_ms=0.0, jitter_ms=0.0, payload_bytes=200,
+                 error_rate=0.0, error_status=503, compress=True, seed=0):
+        self.jobs = jobs
+        self.matches = matches
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.payload_bytes = payload_bytes
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.compress = compress
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._filler = {}
+        self._tokens = {}
+        self._profiles = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self.reset_stats()
+
+    def configure(self, **settings):
+        """Change data sizes, latency or error injection of a running server."""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+
+    # Stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"requests": 0, "connections": 0, "bytesReceived": 0, "bytesSent": 0,
+                           "notModified": 0, "injectedErrors": 0, "byEndpoint": {}}
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    # Server lifecycle
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve in a background thread and return the base URL."""
+        self._server = _Server((host, port), _make_handler(self))
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # Generated data
+
+    def filler(self, index):
+        """Deterministic, not trivially compressible text of payload_bytes length."""
+        size = self.payload_bytes
+        key = (size, index % 64)
+        text = self._filler.get(key)
+        if text is None:
+            rng = random.Random(f"{self.seed}-{key}")
+            words = []
+            length = 0
+            while length < size:
+                word = rng.choice(WORDS)
+                words.append(word)
+                length += len(word) + 1
+            text = self._filler[key] = " ".join(words)[:size]
+        return text
+
+    def job(self, number):
+        return {
+            "id": f"j{number}",
+            "title": f"Engineer {number}",
+            "companyName": f"Company {number % 97}",
+            "location": ("Beijing", "Shanghai", "Shenzhen", "Remote")[number % 4],
+            "salary": f"{20 + number % 30}k-{40 + number % 30}k",
+            "requirement": self.filler(number),
+            "status": "ACTIVE",
+        }
+
+    def candidate(self, number):
+        return {
+            "id": f"c{number}",
+            "name": f"Candidate {number}",
+            "jobIntention": f"Engineer {number % 13}",
+            "summary": self.filler(number + 7),
+        }
+
+    @staticmethod
+    def score(a, b):
+        return round(0.5 + ((a * 7919 + b * 104729) % 500) / 1000, 3)
+
+    def job_matches(self, job_number):
+        return [{"jobId": f"j{job_number}", "jobSeekerId": f"c{k}", "score": self.score(job_number, k),
+                 "jobSeeker": self.candidate(k)} for k in range(self.matches)]
+
+    def seeker_matches(self):
+        return [{"jobId": f"j{k}", "score": self.score(k, 1), "job": self.job(k)}
+                for k in range(self.matches)]
+
+    # Request handling
+
+    def handle(self, method, path, query, body, token):
+        """Return (status, payload, extra headers) for one API request."""
+        if path == "/auth/token" and method == "POST":
+            new_token = f"mock-{uuid.uuid4().hex}"
+            with self._lock:
+                self._tokens[new_token] = (body or {}).get("userType", "JOB_SEEKER")
+            return 200, {"success": True, "result": {"token": new_token}}, {}
+        if path == "/auth/verify":
+            return 200, {"success": True, "result": {"valid": token in self._tokens}}, {}
+
+        if token not in self._tokens:
+            return 401, {"success": False, "message": "Unauthorized"}, {}
+
+        with self._lock:
+            inject = self.error_rate and self._random.random() < self.error_rate
+        if inject:
+            self.count("injectedErrors")
+            retry = {"Retry-After": "0"} if self.error_status in (429, 503) else {}
+            return self.error_status, {"success": False, "message": "Injected error"}, retry
+
+        if path == "/jobs/my-jobs" and method == "GET":
+            return self._list([self.job(k) for k in range(self.jobs)], query)
+        if path == "/jobs" and method == "POST":
+            with self._lock:
+                self._created += 1
+                job_id = f"n{self._created}"
+            return 200, {"success": True, "result": dict(body or {}, id=job_id)}, {}
+        match = re.fullmatch(r"/jobs/(\w+)", path)
+        if match:
+            number = int(re.sub(r"\D", "", match.group(1)) or 0)
+            job = self.job(number)
+            if method == "PUT":
+                job.update(body or {})
+            return 200, {"success": True, "result": job}, {}
+
+        if path == "/matches" and method == "GET":
+            return self._list(self.seeker_matches(), query)
+        match = re.fullmatch(r"/matches/job/(\w+)", path)
+        if match and method == "GET":
+            number = int(re.sub(r"\D", "", match.group(1)) or 0)
+            return self._list(self.job_matches(number), query, cursor=True)
+
+        if path == "/job-seekers/resume" and method == "POST":
+            profile = dict(body or {}, status="ACTIVE")
+            self._profiles[token] = profile
+            return 200, {"success": True, "result": dict(profile, id=token[-8:])}, {}
+        if path == "/job-seekers/profile":
+            profile = self._profiles.setdefault(token, {
+                "name": "Candidate", "jobIntention": "Engineer",
+                "resumeRawContent": self.filler(3), "status": "ACTIVE",
+            })
+            if method == "PUT":
+                profile.update(body or {})
+            return 200, {"success": True, "result": profile}, {}
+        if path == "/job-seekers/chat-profile" and method == "POST":
+            received = len((body or {}).get("rawConversation") or "")
+            return 200, {"success": True, "result": {"received": received}}, {}
+
+        return 404, {"success": False, "message": f"Not found: {method} {path}"}, {}
+
+    @staticmethod
+    def _list(items, query, cursor=False):
+        """
+        Return a whole list, or one page of it when pageSize is given:
+        a plain list per page number, or an items/nextCursor page.
+        """
+        if "pageSize" not in query:
+            return 200, {"success": True, "result": items}, {}
+        size = max(1, int(query["pageSize"]))
+        if cursor:
+            start = int(query.get("cursor") or 0)
+            end = start + size
+            return 200, {"success": True, "result": {
+                "items": items[start:end],
+                "nextCursor": str(end) if end < len(items) else None,
+            }}, {}
+        start = (max(1, int(query.get("page", 1))) - 1) * size
+        return 200, {"success": True, "result": items[start:start + size]}, {}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients must not stall on the listen backlog (default 5)
+    request_queue_size = 256
+
+
+def _make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "JobClawMock/1.0"
+
+        def setup(self):
+            super().setup()
+            # Headers and body are written separately; don't let Nagle hold the body back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.rfile = _Counted(self.rfile, api, "bytesReceived")
+            self.wfile = _Counted(self.wfile, api, "bytesSent")
+            # Counted on its first API request, so harness control calls are left out
+            self.counted = False
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload, extra):
+            body = json.dumps(payload).encode("utf-8")
+            headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+            headers.update(extra)
+
+            if self.command == "GET" and status == 200:
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                headers["ETag"] = etag
+                if self.headers.get("If-None-Match") == etag:
+                    api.count("notModified")
+                    status, body = 304, b""
+
+            if body and api.compress and len(body) >= 1024 \
+                    and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_chunked(self):
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if not size:
+                    # Skip trailers up to the blank line that ends the body
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+
+        def _handle(self):
+            parts = urlsplit(self.path)
+            path = parts.path.rstrip("/") or "/"
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+            if "chunked" in (self.headers.get("Transfer-Encoding") or "").lower():
+                raw = self._read_chunked()
+            else:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+
+            if path == "/__stats":
+                return self._reply(200, api.stats(), {})
+            if path == "/__reset":
+                api.reset_stats()
+                return self._reply(200, {"success": True}, {})
+            if path == "/__configure":
+                try:
+                    api.configure(**json.loads(raw or b"{}"))
+                except (AttributeError, TypeError, ValueError) as e:
+                    return self._reply(400, {"success": False, "message": str(e)}, {})
+                return self._reply(200, {"success": True}, {})
+
+            api.count("requests")
+            if not self.counted:
+                self.counted = True
+                api.count("connections")
+            endpoint = re.sub(r"/(j|n|c)?\d+$", "/{id}", path)
+            with api._lock:
+                by_endpoint = api._stats["byEndpoint"]
+                by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + 1
+
+            delay = api.latency_ms + (api._random.uniform(0, api.jitter_ms) if api.jitter_ms else 0)
+            if delay:
+                time.sleep(delay / 1000)
+
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                return self._reply(400, {"success": False, "message": "Invalid JSON"}, {})
+            auth = self.headers.get("Authorization") or ""
+            token = auth[7:] if auth.startswith("Bearer ") else None
+            self._reply(*api.handle(self.command, path, query, body, token))
+
+        do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JobClaw API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--matches", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-compress", action="store_true")
+    args = parser.parse_args()
+
+    api = MockAPI(args.jobs, args.matches, args.latency_ms, args.jitter_ms, args.payload_bytes,
+                  args.error_rate, args.error_status, not args.no_compress)
+    print(api.start(args.host, args.port), flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark the skill scripts against a local mock of the JobClaw API.
+
+Every script action runs as its own process, as the skill invokes it, from a
+temporary copy of the scripts (so real tokens and caches are untouched)
+against benchmarks/mock_api.py. Each scenario sets the number of jobs and of
+matches per job; every action is run once to warm up and then --repeat times.
+Reported per action and scenario: wall time, HTTP requests, bytes on the
+wire, output size and the process's peak RSS.
+
+Usage:
+    python3 benchmarks/run.py [--scenarios 1x10,50x10,500x10,1x1000,50x1000,500x1000]
+                              [--repeat 3] [--actions FILTER] [--latency-ms 0]
+                              [--error-rate 0] [--output results.json]
+    python3 benchmarks/run.py --compare before.json after.json [--threshold 20]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+DEFAULT_SCENARIOS = "1x10,50x10,500x10,1x1000,50x1000,500x1000"
+
+JOB = {
+    "title": "Backend Engineer", "companyName": "Acme", "requirement": "Python, SQL, 3+ years",
+    "salary": "30k-50k", "location": "Remote", "jobType": "FULL_TIME",
+    "education": "Bachelor", "experience": "3-5 years",
+}
+RESUME = {
+    "resumeText": "Backend engineer with eight years of Python. " * 40, "name": "Candidate",
+    "email": "candidate@example.com", "phone": "+1 555 0100", "jobIntention": "Backend Engineer",
+}
+CONVERSATION = "User: I have built data pipelines for six years.\nAssistant: Tell me more.\n" * 200
+
+# (skill, script, name, input); names are unique per script
+ACTIONS = (
+    ("recruiter", "get_profile", "jobs", {"action": "jobs"}),
+    ("recruiter", "get_profile", "job", {"action": "job", "jobId": "j1"}),
+    ("recruiter", "get_profile", "matches", {"action": "matches", "jobId": "j1"}),
+    ("recruiter", "get_profile", "all-matches", {"action": "all-matches"}),
+    ("recruiter", "get_profile", "full", {"action": "full"}),
+    ("recruiter", "get_profile", "full-job", {"action": "full", "jobId": "j1"}),
+    ("recruiter", "publish_job", "publish", dict(JOB, action="publish")),
+    # Republishes the posting the warm-up run published
+    ("recruiter", "publish_job", "republish", dict(JOB, action="publish", externalId="bench-1")),
+    ("recruiter", "publish_job", "update", {"action": "update", "jobId": "j1", "salary": "35k-55k", "full": True}),
+    ("recruiter", "publish_job", "delete", {"action": "delete", "jobId": "j1", "full": True}),
+    ("recruiter", "publish_job", "matches", {"action": "matches", "jobId": "j1"}),
+    ("job-seeker", "submit_resume", "submit", dict(RESUME, action="submit")),
+    ("job-seeker", "submit_resume", "update", {"action": "update", "jobIntention": "Staff Engineer", "full": True}),
+    # Repeats the update the warm-up run sent
+    ("job-seeker", "submit_resume", "reupdate", {"action": "update", "jobIntention": "Senior Engineer"}),
+    ("job-seeker", "submit_resume", "delete", {"action": "delete"}),
+    ("job-seeker", "submit_resume", "matches", {"action": "matches"}),
+    ("job-seeker", "get_profile", "profile", {"action": "profile"}),
+    ("job-seeker", "get_profile", "matches", {"action": "matches"}),
+    ("job-seeker", "get_profile", "full", {"action": "full"}),
+    ("job-seeker", "get_profile", "summarize", {"action": "summarize"}),
+    ("job-seeker", "submit_chat_profile", "submit",
+     {"profileText": "Data engineer focused on pipelines.", "rawConversation": CONVERSATION, "full": True}),
+    # Resubmits the conversation the warm-up run uploaded
+    ("job-seeker", "submit_chat_profile", "resubmit",
+     {"profileText": "Data engineer focused on pipelines.", "rawConversation": CONVERSATION}),
+)
+
+# Files the scripts keep next to themselves that must not leak into a run
+STATE_FILES = (".token", ".token.lock", ".token.profile.json", ".cache.db*", ".identities", ".daemon.sock",
+               ".chat_ledger.json*", ".snapshot.db*", ".publish_map.json*", "__pycache__")
+
+METRICS = ("wallMs", "requests", "bytesSent", "bytesReceived", "peakRssKb")
+
+
+def parse_scenarios(text):
+    scenarios = []
+    for item in text.split(","):
+        jobs, _, matches = item.strip().lower().partition("x")
+        scenarios.append((int(jobs), int(matches)))
+    return scenarios
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "skills"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def child_env(workdir, cache):
+    """Environment for the scripts: no daemon, no shared state, optional cache."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("JOBCLAW_")}
+    env["JOBCLAW_DAEMON"] = "0"
+    env["JOBCLAW_DAEMON_SOCKET"] = os.path.join(workdir, "daemon.sock")
+    if cache:
+        env["JOBCLAW_CACHE"] = "1"
+    return env
+
+
+class MockServer:
+    """benchmarks/mock_api.py in its own process, so its memory never counts
+    toward the peak RSS of the scripts this process starts."""
+
+    def __init__(self, args):
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "mock_api.py"), "--port", "0",
+             "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+             "--payload-bytes", str(args.payload_bytes), "--error-rate", str(args.error_rate),
+             "--error-status", str(args.error_status)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        self.url = self.proc.stdout.readline().strip()
+        if not self.url:
+            raise Exception("Mock API did not start")
+
+    def call(self, path, data=None):
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        request = urllib.request.Request(self.url + path, body, method="POST" if body else "GET")
+        with urllib.request.urlopen(request) as resp:
+            return json.loads(resp.read())
+
+    def stop(self):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+# Runs a script as __main__ and, at exit, writes its peak RSS to stderr. The
+# peak is read inside the child: ru_maxrss seen by the parent starts from the
+# parent's own RSS at fork, so it never reports less than the harness uses.
+RSS_PROBE = """
+import os, sys, atexit, runpy
+
+def report():
+    rss_kb = None
+    try:
+        with open("/proc/self/status") as f:
+            rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration, ValueError):
+        import resource
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            rss_kb //= 1024  # bytes on macOS
+    sys.stderr.write("%s%d\\n" % (MARKER, rss_kb))
+    sys.stderr.flush()
+
+atexit.register(report)
+sys.argv = sys.argv[1:]
+sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0]))
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+RSS_MARKER = "JOBCLAW_BENCH_PEAK_RSS_KB="
+
+
+def run_once(script_path, data, env, workdir):
+    """Run one script invocation and return (wall ms, exit code, output bytes, failed, rss KB)."""
+    out_path = os.path.join(workdir, "out.json")
+    err_path = os.path.join(workdir, "err.txt")
+    probe = f"MARKER = {RSS_MARKER!r}\n{RSS_PROBE}"
+    with open(out_path, "wb") as out, open(err_path, "wb") as err:
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", probe, script_path, json.dumps(data)],
+                              cwd=os.path.dirname(script_path), env=env,
+                              stdin=subprocess.DEVNULL, stdout=out, stderr=err)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+    rss_kb = 0
+    with open(err_path, "r", errors="replace") as f:
+        for line in f:
+            if line.startswith(RSS_MARKER):
+                rss_kb = int(line[len(RSS_MARKER):])
+    with open(out_path, "rb") as f:
+        head = f.read(256)
+    failed = proc.returncode != 0 or b'"success": false' in head
+    return wall_ms, proc.returncode, os.path.getsize(out_path), failed, rss_kb
+
+
+def run_benchmarks(args):
+    scenarios = parse_scenarios(args.scenarios)
+    actions = [a for a in ACTIONS
+               if not args.actions or any(f in f"{a[0]}/{a[1]}:{a[2]}" for f in args.actions.split(","))]
+
+    workdir = tempfile.mkdtemp(prefix="jobclaw-bench-")
+    mock = MockServer(args)
+    env = child_env(workdir, args.cache)
+
+    results = []
+    try:
+        for skill in sorted({a[0] for a in actions}):
+            shutil.copytree(os.path.join(ROOT, "skills", skill, "scripts"), os.path.join(workdir, skill),
+                            ignore=shutil.ignore_patterns(*STATE_FILES))
+
+        for jobs, matches in scenarios:
+            mock.call("/__configure", {"jobs": jobs, "matches": matches})
+            scenario = f"{jobs}x{matches}"
+            for skill, script, name, data in actions:
+                script_path = os.path.join(workdir, skill, f"{script}.py")
+                payload = dict(data, apiUrl=mock.url)
+                run_once(script_path, payload, env, workdir)  # Warm-up: token, bytecode
+
+                runs = []
+                for _ in range(args.repeat):
+                    mock.call("/__reset", {})
+                    wall_ms, code, output_bytes, failed, rss_kb = run_once(script_path, payload, env, workdir)
+                    runs.append((wall_ms, code, output_bytes, failed, rss_kb, mock.call("/__stats")))
+
+                stats = runs[-1][5]
+                walls = [r[0] for r in runs]
+                record = {
+                    "scenario": scenario,
+                    "jobs": jobs,
+                    "matches": matches,
+                    "action": f"{skill}/{script}:{name}",
+                    "wallMs": round(statistics.median(walls), 1),
+                    "wallMsMin": round(min(walls), 1),
+                    "wallMsMax": round(max(walls), 1),
+                    "requests": stats["requests"],
+                    "connections": stats["connections"],
+                    "bytesSent": stats["bytesSent"],
+                    "bytesReceived": stats["bytesReceived"],
+                    "outputBytes": runs[-1][2],
+                    "peakRssKb": max(r[4] for r in runs),
+                    "failures": sum(1 for r in runs if r[3]),
+                    "byEndpoint": stats["byEndpoint"],
+                }
+                results.append(record)
+                print(f"{scenario:>9} {record['action']:<42} {record['wallMs']:>9.1f} ms "
+                      f"{record['requests']:>5} req {record['bytesSent']:>11} B "
+                      f"{record['peakRssKb']:>8} KB" + ("  FAILED" if record["failures"] else ""),
+                      file=sys.stderr)
+    finally:
+        mock.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "repeat": args.repeat,
+            "latencyMs": args.latency_ms,
+            "jitterMs": args.jitter_ms,
+            "payloadBytes": args.payload_bytes,
+            "errorRate": args.error_rate,
+            "errorStatus": args.error_status,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+
+
+def compare(before_path, after_path, threshold):
+    """Print per-action changes between two reports; return True if nothing regressed."""
+    with open(before_path) as f:
+        before = {(r["scenario"], r["action"]): r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = json.load(f)["results"]
+
+    ok = True
+    print(f"{'scenario':>9} {'action':<42} " + " ".join(f"{m:>18}" for m in METRICS))
+    for record in after:
+        old = before.get((record["scenario"], record["action"]))
+        if not old:
+            continue
+        cells = []
+        for metric in METRICS:
+            a, b = old[metric], record[metric]
+            change = (b - a) / a * 100 if a else (0.0 if a == b else 100.0)
+            # Ignore wall-time noise below 5 ms
+            regressed = change > threshold and not (metric == "wallMs" and b - a < 5)
+            ok = ok and not regressed
+            cells.append(f"{change:>+8.1f}%{'!' if regressed else ' '}".rjust(18))
+        print(f"{record['scenario']:>9} {record['action']:<42} " + " ".join(cells))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the skill scripts against a mock API")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS,
+                        help="comma-separated JOBSxMATCHES pairs (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="measured runs per action")
+    parser.add_argument("--actions", help="comma-separated substrings of action names to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--cache", action="store_true", help="run with JOBCLAW_CACHE=1")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two reports instead of running")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="percent increase reported as a regression by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.threshold) else 1)
+
+    report = run_benchmarks(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(1 if any(r["failures"] for r in report["results"]) else 0)
+
+
+if __name__ == "__main__":
+    main()
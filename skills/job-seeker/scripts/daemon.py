@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Optional resident daemon for the skill scripts.
+
+Keeps authenticated clients, pooled connections and tokens warm between
+invocations and serves script actions over a Unix domain socket. The
+scripts forward to it when it is running and run in-process otherwise.
+
+A forwarded action carries the caller's scripts directory and JOBCLAW_*
+settings; a daemon started from another skill, another copy of the
+scripts or with different settings (e.g., token file, cache, trace)
+declines it, and the caller runs it in-process.
+
+Usage:
+    python3 daemon.py start    # start in the background
+    python3 daemon.py stop
+    python3 daemon.py status
+    python3 daemon.py serve    # run in the foreground
+"""
+import os
+import sys
+import json
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Socket the daemon listens on
+SOCKET_PATH = os.environ.get("JOBCLAW_DAEMON_SOCKET", os.path.join(SCRIPT_DIR, ".daemon.sock"))
+
+# Seconds without requests after which the daemon exits
+IDLE_TIMEOUT = int(os.environ.get("JOBCLAW_DAEMON_IDLE", "1800"))
+
+# Seconds a forwarded action may take before the caller gives up on the daemon
+FORWARD_TIMEOUT = float(os.environ.get("JOBCLAW_DAEMON_TIMEOUT", "300"))
+
+# Settings of the daemon itself, which need not match between caller and daemon
+DAEMON_SETTINGS = ("JOBCLAW_DAEMON", "JOBCLAW_DAEMON_SOCKET", "JOBCLAW_DAEMON_IDLE", "JOBCLAW_DAEMON_TIMEOUT")
+
+# Scripts whose run() the daemon may execute
+SCRIPTS = ("get_profile", "publish_job", "submit_resume")
+
+
+def _context():
+    """What an action depends on besides its input: the scripts directory and JOBCLAW_* settings."""
+    return {
+        "scriptDir": SCRIPT_DIR,
+        "env": {k: v for k, v in os.environ.items() if k.startswith("JOBCLAW_") and k not in DAEMON_SETTINGS},
+    }
+
+
+def _call(message, timeout=None):
+    """
+    Send one message to the daemon and return its reply.
+
+    Returns None when no daemon accepts the message. Once the message is
+    sent, a missing reply is an error, not a reason to fall back: the
+    daemon may already have performed the action.
+    """
+    import socket
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(SOCKET_PATH):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        try:
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        except socket.timeout:
+            return None  # Not taken in full, so the daemon cannot have started it
+        try:
+            with sock.makefile("rb") as reader:
+                reply = reader.readline()
+        except socket.timeout:
+            raise Exception(f"Daemon did not answer within {timeout:g}s; the action may still be running there")
+
+    if not reply:
+        raise Exception("Daemon closed the connection without a reply")
+    return json.loads(reply.decode("utf-8"))
+
+
+def forward(script, data):
+    """
+    Run a script action in the daemon.
+
+    Args:
+        script: Script module name (e.g., "get_profile")
+        data: The script's JSON input
+
+    Returns:
+        dict: The action result, or None if no daemon is running or it
+        declined the action (see _context)
+
+    Raises:
+        Exception: The daemon failed the action or did not answer within
+            FORWARD_TIMEOUT; the caller must not run the action again
+    """
+    if os.environ.get("JOBCLAW_DAEMON") == "0":
+        return None
+
+    reply = _call({"script": script, "data": data, "context": _context()}, FORWARD_TIMEOUT)
+    if reply is None or "declined" in reply:
+        return None
+    if "error" in reply:
+        raise Exception(reply["error"])
+    return reply["result"]
+
+
+def serve():
+    """Run the daemon in the foreground until stopped or idle."""
+    import signal
+    import socket
+    import threading
+    import importlib
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise Exception("Unix domain sockets are not supported on this platform")
+    if _call({"command": "ping"}, timeout=5) is not None:
+        raise Exception(f"Daemon already running on {SOCKET_PATH}")
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)  # Stale socket from a daemon that did not exit cleanly
+
+    sys.path.insert(0, SCRIPT_DIR)
+    context = _context()
+    started_at = time.time()
+    state = {"last_active": started_at, "requests": 0}
+
+    def dispatch(message):
+        command = message.get("command")
+        if command == "ping":
+            return {"pid": os.getpid(), "uptime": round(time.time() - started_at, 1),
+                    "requests": state["requests"], "socket": SOCKET_PATH, "scriptDir": SCRIPT_DIR}
+        if command == "shutdown":
+            threading.Thread(target=server.shutdown, daemon=True).start()
+            return {"stopping": True}
+
+        script = message.get("script")
+        if script not in SCRIPTS or not os.path.exists(os.path.join(SCRIPT_DIR, f"{script}.py")):
+            raise Exception(f"Unknown script: {script}")
+        module = importlib.import_module(script)
+        return module.run(message.get("data") or {})
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            state["last_active"] = time.time()
+            state["requests"] += 1
+            try:
+                message = json.loads(line.decode("utf-8"))
+                if "script" in message and message.get("context") != context:
+                    # Another skill, scripts copy or token file; the caller runs it itself
+                    reply = {"declined": "caller's scripts directory or JOBCLAW_* settings differ"}
+                else:
+                    reply = {"result": dispatch(message)}
+            except Exception as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    # Only the current user may talk to the daemon
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(SOCKET_PATH, Handler)
+    finally:
+        os.umask(old_umask)
+
+    def stop(*_):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    def watch_idle():
+        while True:
+            time.sleep(min(IDLE_TIMEOUT, 30))
+            if time.time() - state["last_active"] >= IDLE_TIMEOUT:
+                stop()
+                return
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    if IDLE_TIMEOUT > 0:
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+
+
+def start():
+    """Start the daemon in the background and wait until it accepts requests."""
+    import subprocess
+
+    reply = _call({"command": "ping"}, timeout=5)
+    if reply is not None:
+        return {"success": True, "result": dict(reply["result"], running=True)}
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        reply = _call({"command": "ping"}, timeout=5)
+        if reply is not None:
+            return {"success": True, "result": dict(reply["result"], running=True)}
+        time.sleep(0.05)
+    return {"success": False, "error": "Daemon did not start"}
+
+
+def stop():
+    """Ask a running daemon to exit."""
+    reply = _call({"command": "shutdown"}, timeout=5)
+    if reply is None:
+        return {"success": True, "result": {"running": False}}
+    return {"success": True, "result": reply["result"]}
+
+
+def status():
+    """Report whether the daemon is running."""
+    reply = _call({"command": "ping"}, timeout=5)
+    if reply is None:
+        return {"success": True, "result": {"running": False}}
+    return {"success": True, "result": dict(reply["result"], running=True)}
+
+
+COMMANDS = {
+    "start": start,
+    "stop": stop,
+    "status": status,
+}
+
+
+if __name__ == "__main__":
+    try:
+        command = sys.argv[1] if len(sys.argv) > 1 else ""
+        if command == "serve":
+            serve()
+            sys.exit(0)
+
+        fn = COMMANDS.get(command)
+        if not fn:
+            print(json.dumps({
+                "success": False,
+                "error": "Usage: daemon.py start|stop|status|serve"
+            }))
+            sys.exit(1)
+
+        result = fn()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if not result.get("success"):
+            sys.exit(1)
+
+    except Exception as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        sys.exit(1)
@@ -5,26 +5,59 @@ View your profile information and matched job positions.
 """
 import sys
 import json
-from base import AuthenticatedClient, DEFAULT_API
+from base import (get_client, summarize_matches, MatchSummary, pop_output_options, render_output,
+                  shape_output, DEFAULT_API, DEFAULT_PAGE_SIZE)
+from daemon import forward
+import snapshot
 
 
 def get_profile(api_url):
     """Get job seeker profile information."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    client = get_client(api_url, "JOB_SEEKER")
     result = client.get("/job-seekers/profile")
     return result
 
 
-def get_matches(api_url):
-    """Get matched job positions."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
-    result = client.get("/matches")
+def get_matches(api_url, limit=None, page_size=None):
+    """Get matched job positions (paged lazily when limit or page_size is given)."""
+    client = get_client(api_url, "JOB_SEEKER")
+    result = client.get_list("/matches", limit, page_size)
     return result
 
 
+def get_match_summary(api_url, top=3, min_score=None, limit=None, page_size=None):
+    """Summarize matched job positions: top matches, score distribution and percentiles."""
+    client = get_client(api_url, "JOB_SEEKER")
+    matches = client.iter_items("/matches", page_size or DEFAULT_PAGE_SIZE, limit)
+    return {"success": True, "result": summarize_matches(matches, top, min_score)}
+
+
+def sync_snapshot(api_url, force=False):
+    """Refresh the local snapshot of profile and matches, fetching only what probably changed."""
+    return snapshot.sync_snapshot(get_client(api_url, "JOB_SEEKER"), force)
+
+
+def diff_snapshot(api_url, since=None, sync=False, force=False):
+    """Report new, removed and re-scored matches found by the last sync (or since sync `since`)."""
+    return snapshot.diff_snapshot(get_client(api_url, "JOB_SEEKER"), since, sync, force)
+
+
+def watch_matches(api_url, interval=snapshot.WATCH_INTERVAL, min_interval=snapshot.WATCH_MIN_INTERVAL,
+                  max_interval=snapshot.WATCH_MAX_INTERVAL, duration=None, fields=None, truncate=None):
+    """
+    Poll matches until interrupted, writing each change as an NDJSON line
+    (see snapshot.Snapshot.watch) and a summary line at the end.
+
+    `fields` and `truncate` prune each event (see base.shape_output).
+    """
+    shape = (lambda event: shape_output(event, fields, truncate)) if fields or truncate else None
+    return snapshot.watch_snapshot(get_client(api_url, "JOB_SEEKER"), None, interval, min_interval,
+                                   max_interval, None, duration, shape)
+
+
 def get_full_info(api_url):
     """Get complete information: profile + matches."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    client = get_client(api_url, "JOB_SEEKER")
 
     # Get profile
     profile_result = client.get("/job-seekers/profile")
@@ -45,10 +78,104 @@ def get_full_info(api_url):
 ACTIONS = {
     "profile": get_profile,
     "matches": get_matches,
+    "summarize": get_match_summary,
     "full": get_full_info,
+    "sync": sync_snapshot,
+    "diff": diff_snapshot,
 }
 
 
+def run(data):
+    """Execute the action described by `data` (the script's JSON input)."""
+    # Extract parameters
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "full")
+
+    # Execute action
+    fn = ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ACTIONS)}")
+
+    if action == "matches":
+        return fn(api_url, data.get("limit"), data.get("pageSize"))
+    if action == "summarize":
+        return fn(api_url, data.get("top", 3), data.get("minScore"), data.get("limit"), data.get("pageSize"))
+    if action == "sync":
+        return fn(api_url, data.get("force", False))
+    if action == "diff":
+        return fn(api_url, data.get("since"), data.get("sync", False), data.get("force", False))
+    return fn(api_url)
+
+
+def _async_client(api_url):
+    # Imported on demand so the command line does not load asyncio
+    from base_async import get_async_client
+    return get_async_client(api_url, "JOB_SEEKER")
+
+
+async def get_profile_async(api_url):
+    """Get job seeker profile information (asyncio)."""
+    return await _async_client(api_url).get("/job-seekers/profile")
+
+
+async def get_matches_async(api_url, limit=None, page_size=None):
+    """Get matched job positions (asyncio; paged lazily when limit or page_size is given)."""
+    return await _async_client(api_url).get_list("/matches", limit, page_size)
+
+
+async def get_match_summary_async(api_url, top=3, min_score=None, limit=None, page_size=None):
+    """Summarize matched job positions (asyncio)."""
+    summary = MatchSummary(top, min_score)
+    async for match in _async_client(api_url).iter_items("/matches", page_size or DEFAULT_PAGE_SIZE, limit):
+        summary.add(match)
+    return {"success": True, "result": summary.result()}
+
+
+async def get_full_info_async(api_url):
+    """Get complete information: profile + matches, fetched concurrently (asyncio)."""
+    import asyncio
+    client = _async_client(api_url)
+    # Resolve the token once so both requests can go out together
+    await client.token_manager.get_token_async()
+
+    profile_result, matches_result = await asyncio.gather(
+        client.get("/job-seekers/profile"), client.get("/matches")
+    )
+
+    return {
+        "success": True,
+        "result": {
+            "profile": profile_result.get("result"),
+            "matches": matches_result.get("result")
+        }
+    }
+
+
+ASYNC_ACTIONS = {
+    "profile": get_profile_async,
+    "matches": get_matches_async,
+    "summarize": get_match_summary_async,
+    "full": get_full_info_async,
+}
+
+
+async def run_async(data):
+    """Asyncio counterpart of run() for callers that already run an event loop."""
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "full")
+
+    fn = ASYNC_ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ASYNC_ACTIONS)}")
+
+    if action == "matches":
+        return await fn(api_url, data.get("limit"), data.get("pageSize"))
+    if action == "summarize":
+        return await fn(api_url, data.get("top", 3), data.get("minScore"), data.get("limit"),
+                        data.get("pageSize"))
+    return await fn(api_url)
+
+
 if __name__ == "__main__":
     try:
         # Parse input
@@ -64,25 +191,25 @@ if __name__ == "__main__":
             print(json.dumps({
                 "success": False,
                 "error": "Usage: get_profile.py <json> (or pipe json to stdin)\n"
-                         "Actions: profile, matches, full"
-            }))
-            sys.exit(1)
-
-        # Extract parameters
-        api_url = data.pop("apiUrl", DEFAULT_API)
-        action = data.pop("action", "full")
-
-        # Execute action
-        fn = ACTIONS.get(action)
-        if not fn:
-            print(json.dumps({
-                "success": False,
-                "error": f"Unknown action: {action}. Use: {', '.join(ACTIONS)}"
+                         "Actions: profile, matches, summarize, full, sync, diff, watch"
             }))
             sys.exit(1)
 
-        result = fn(api_url)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        options = pop_output_options(data)
+
+        # Watching runs until interrupted and streams its events, so it never goes to the daemon
+        if data.get("action") == "watch":
+            watch_matches(data.get("apiUrl", DEFAULT_API), data.get("interval", snapshot.WATCH_INTERVAL),
+                          data.get("minInterval", snapshot.WATCH_MIN_INTERVAL),
+                          data.get("maxInterval", snapshot.WATCH_MAX_INTERVAL), data.get("duration"),
+                          options.get("fields"), options.get("truncate"))
+            sys.exit(0)
+
+        # Prefer a running daemon; fall back to running in-process
+        result = forward("get_profile", data)
+        if result is None:
+            result = run(data)
+        print(render_output(result, **options))
 
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
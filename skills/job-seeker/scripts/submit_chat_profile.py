@@ -2,32 +2,336 @@
 """
 Submit a chat profile (career portrait from conversation) to the job matching system.
 """
+import os
 import sys
 import json
-import os
-import urllib.request
-import urllib.error
+import time
+from base import (DEFAULT_API, http_request, read_token_file, APIError, FileLock,
+                  StreamedBody, pop_output_options, render_output)
 
-TOKEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".token")
+# Hashes of the conversation segments already uploaded, per token
+LEDGER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chat_ledger.json")
 
-DEFAULT_API = "https://api.jobclaw.ai"
+# Statuses with which the server refuses a partial conversation
+DELTA_REJECTED = (400, 409, 412, 422)
+
+# Size of the pieces a streamed conversation is read and sent in
+STREAM_CHUNK_BYTES = 64 * 1024
 
 
 def _request(url, method="POST", data=None, token=None):
     """Send an HTTP request and return parsed JSON or an error dict."""
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "JobClaw-Skill-Script/1.0"
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    body = json.dumps(data).encode("utf-8") if data else None
-    req = urllib.request.Request(url, data=body, headers=headers, method=method)
     try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        return {"success": False, "error": e.read().decode("utf-8")}
+        return http_request(url, method, data, token)
+    except Exception as e:
+        # Connection failures still abort; API errors are reported as results
+        if str(e).startswith("Connection error"):
+            raise
+        return {"success": False, "error": str(e)}
+
+
+def _digest(text):
+    import hashlib
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _lines(blocks):
+    """Yield the lines of text that arrives in blocks of any size, split at "\\n"."""
+    partial = ""
+    for block in blocks:
+        lines = (partial + block).split("\n")
+        partial = lines.pop()
+        yield from lines
+    if partial:
+        yield partial
+
+
+def _segment_lines(lines):
+    """Yield (segment index, line) for every non-blank line, without its line ending."""
+    index, in_segment = 0, False
+    for line in lines:
+        line = line.rstrip("\r")
+        if line.strip():
+            in_segment = True
+            yield index, line
+        elif in_segment:
+            index += 1
+            in_segment = False
+
+
+class SegmentHasher:
+    """Computes the digest of each conversation segment from text fed piece by piece."""
+
+    def __init__(self):
+        import hashlib
+        self._sha256 = hashlib.sha256
+        self.digests = []
+        self._hasher = None
+        self._partial = ""
+
+    def feed(self, text):
+        """Add the next piece of the conversation; lines may span pieces."""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._add_line(line)
+
+    def _add_line(self, line):
+        line = line.rstrip("\r")
+        if not line.strip():
+            self._end_segment()
+        elif self._hasher is None:
+            self._hasher = self._sha256(line.encode("utf-8"))
+        else:
+            self._hasher.update(b"\n" + line.encode("utf-8"))
+
+    def _end_segment(self):
+        if self._hasher is not None:
+            self.digests.append(self._hasher.hexdigest()[:32])
+            self._hasher = None
+
+    def close(self):
+        """Finish the last segment and return all digests."""
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = ""
+        self._end_segment()
+        return self.digests
+
+
+def conversation_segments(raw_conversation):
+    """Split a conversation into turns: blank-line separated blocks, or list elements."""
+    if isinstance(raw_conversation, list):
+        return [s if isinstance(s, str) else json.dumps(s, ensure_ascii=False)
+                for s in raw_conversation]
+    blocks = []
+    for index, line in _segment_lines(raw_conversation.split("\n")):
+        if index < len(blocks):
+            blocks[index] += "\n" + line
+        else:
+            blocks.append(line)
+    return blocks
+
+
+def _read_ledger():
+    try:
+        with open(LEDGER_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_ledger(ledger):
+    """Save the ledger atomically (non-critical if it fails)."""
+    tmp_path = f"{LEDGER_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(ledger, f)
+        os.replace(tmp_path, LEDGER_FILE)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def plan_upload(entry, digests, profile_text):
+    """
+    Compare a conversation with what the ledger says was uploaded.
+
+    Segments are matched by content hash, counting repeats, so both a
+    growing transcript and a fresh session that quotes earlier turns
+    only send the turns the server has not seen.
+
+    Args:
+        entry: Ledger entry for the token ({"segments": {hash: count}, "profile": hash})
+        digests: Digests of the conversation segments to submit
+        profile_text: Career portrait to submit
+
+    Returns:
+        list: Indexes of the segments to send, or None when nothing changed
+    """
+    seen = dict(entry["segments"])
+    new = []
+    for index, key in enumerate(digests):
+        if seen.get(key):
+            seen[key] -= 1
+        else:
+            new.append(index)
+    if not new and entry.get("profile") == _digest(profile_text):
+        return None
+    return new
+
+
+def _record_upload(token_key, digests, profile_text, replace):
+    """Add uploaded segments to the token's ledger entry, or replace it after a full upload (under the ledger lock)."""
+    ledger = _read_ledger()
+    entry = ledger.get(token_key)
+    counts = {} if replace or not entry else entry["segments"]
+    for key in digests:
+        counts[key] = counts.get(key, 0) + 1
+    ledger[token_key] = {"segments": counts, "profile": _digest(profile_text),
+                         "updatedAt": time.time()}
+    _write_ledger(ledger)
+
+
+def _submit(api_url, token, profile_text, digests, make_body, full):
+    """
+    Send a chat profile as a delta when the ledger allows it, else whole.
+
+    Args:
+        digests: Segment digests, or None when they are only known once the
+            whole conversation has been sent (make_body then returns them)
+        make_body: Function(segment indexes or None for all) -> (body, digests of the sent segments)
+    """
+    url = f"{api_url}/job-seekers/chat-profile"
+    token_key = _digest(token) if token else None
+    if not token_key:
+        return _upload(url, token, None, profile_text, digests, make_body, full)
+    # Submissions planned against the same ledger would both send the same new turns
+    with FileLock(LEDGER_FILE + ".lock"):
+        return _upload(url, token, token_key, profile_text, digests, make_body, full)
+
+
+def _upload(url, token, token_key, profile_text, digests, make_body, full):
+    """Plan, send and record one submission (the caller holds the ledger lock)."""
+    entry = None
+    if token_key and digests is not None and not full:
+        entry = _read_ledger().get(token_key)
+
+    if entry:
+        new = plan_upload(entry, digests, profile_text)
+        if new is None:
+            return {"success": True, "result": None,
+                    "upload": {"mode": "skipped", "segments": 0, "total": len(digests)}}
+        body, _ = make_body(new)
+        try:
+            res = http_request(url, "POST", body, token)
+        except APIError as e:
+            if e.status is None:
+                raise
+            if e.status not in DELTA_REJECTED:
+                return {"success": False, "error": str(e)}
+            # With no new turns the server already holds the whole
+            # conversation; sending it again would only duplicate it
+            if not new:
+                return {"success": False, "error": str(e),
+                        "upload": {"mode": "skipped", "segments": 0, "total": len(digests)}}
+        else:
+            _record_upload(token_key, [digests[i] for i in new], profile_text, replace=False)
+            res["upload"] = {"mode": "delta", "segments": len(new), "total": len(digests)}
+            return res
+
+    body, sent = make_body(None)
+    res = _request(url, data=body, token=token)
+    if token_key and res.get("success", True):
+        _record_upload(token_key, sent, profile_text, replace=True)
+    res["upload"] = {"mode": "full", "segments": len(sent), "total": len(sent)}
+    return res
+
+
+def submit_chat_profile(api_url, token, profile_text, raw_conversation, full=False):
+    """
+    Submit a chat profile, sending only conversation turns not uploaded before.
+
+    The server appends every submitted conversation to the stored profile,
+    so after the first upload for a token only new turns are sent. The
+    whole conversation is sent when there is no ledger entry for the token,
+    when `full` is set, or when the server rejects a partial one that had
+    new turns.
+
+    Returns:
+        dict: API response, with "upload" describing what was sent
+    """
+    segments = conversation_segments(raw_conversation)
+    digests = [_digest(s) for s in segments]
+
+    def make_body(indexes):
+        if indexes is None:
+            return {"profileText": profile_text, "rawConversation": raw_conversation}, digests
+        new = [segments[i] for i in indexes]
+        delta = "\n\n".join(new) if isinstance(raw_conversation, str) else new
+        return {"profileText": profile_text, "rawConversation": delta}, None
+
+    return _submit(api_url, token, profile_text, digests, make_body, full)
+
+
+def _read_blocks(f):
+    return iter(lambda: f.read(STREAM_CHUNK_BYTES), "")
+
+
+def _file_blocks(path):
+    """Return a function yielding the text of a UTF-8 file in blocks, line endings kept."""
+    def blocks():
+        with open(path, 'r', encoding="utf-8", newline="") as f:
+            yield from _read_blocks(f)
+    return blocks
+
+
+def _json_chunks(profile_text, texts):
+    """Yield the chat profile JSON body as bytes, escaping the conversation piece by piece."""
+    from json.encoder import encode_basestring
+    buffer = bytearray(('{"profileText": %s, "rawConversation": "' % json.dumps(profile_text)).encode("utf-8"))
+    for text in texts:
+        buffer += encode_basestring(text)[1:-1].encode("utf-8")
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b'"}'
+    yield bytes(buffer)
+
+
+def submit_chat_profile_stream(api_url, token, profile_text, path, full=False):
+    """
+    Submit a chat profile whose conversation is read from a file ("-" for stdin).
+
+    The request body is written with chunked transfer encoding as the file is
+    read, so memory use does not grow with the conversation. A file is read
+    twice (hashing its turns first) and gets the same delta uploads as
+    submit_chat_profile; stdin can only be read once and is always sent whole.
+
+    Returns:
+        dict: API response, with "upload" describing what was sent
+    """
+    if path == "-":
+        import io
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        hasher = SegmentHasher()
+
+        def read_stdin():
+            for block in _read_blocks(stdin):
+                hasher.feed(block)
+                yield block
+            hasher.close()
+
+        def make_body(indexes):
+            body = StreamedBody(lambda: _json_chunks(profile_text, read_stdin()), replayable=False)
+            return body, hasher.digests
+
+        return _submit(api_url, token, profile_text, None, make_body, full)
+
+    blocks = _file_blocks(path)
+    hasher = SegmentHasher()
+    for block in blocks():
+        hasher.feed(block)
+    digests = hasher.close()
+
+    def make_body(indexes):
+        if indexes is None:
+            return StreamedBody(lambda: _json_chunks(profile_text, blocks())), digests
+        keep = set(indexes)
+
+        def delta_lines():
+            last = None
+            for index, line in _segment_lines(_lines(blocks())):
+                if index in keep:
+                    separator = "" if last is None else ("\n" if index == last else "\n\n")
+                    last = index
+                    yield separator + line
+
+        return StreamedBody(lambda: _json_chunks(profile_text, delta_lines())), None
+
+    return _submit(api_url, token, profile_text, digests, make_body, full)
 
 
 if __name__ == "__main__":
@@ -45,20 +349,20 @@ if __name__ == "__main__":
             sys.exit(1)
         api_url = data.pop("apiUrl", DEFAULT_API)
         token = data.pop("token", None)
+        options = pop_output_options(data)
         
         # Fallback to local token file if token not provided
-        if not token and os.path.exists(TOKEN_FILE):
-            try:
-                with open(TOKEN_FILE, 'r') as f:
-                    token = f.read().strip()
-            except:
-                pass
-        payload = {
-            "profileText": data["profileText"],
-            "rawConversation": data["rawConversation"],
-        }
-        res = _request(f"{api_url}/job-seekers/chat-profile", data=payload, token=token)
-        print(json.dumps(res, ensure_ascii=False, indent=2))
+        if not token:
+            saved = read_token_file()
+            if saved:
+                token = saved["token"]
+        if "rawConversationFile" in data:
+            res = submit_chat_profile_stream(api_url, token, data["profileText"],
+                                             data["rawConversationFile"], full=data.get("full", False))
+        else:
+            res = submit_chat_profile(api_url, token, data["profileText"], data["rawConversation"],
+                                      full=data.get("full", False))
+        print(render_output(res, **options))
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
         sys.exit(1)
@@ -2,14 +2,115 @@
 """
 Job seeker CLI: submit, update, delete resume and list matched jobs.
 """
+import os
 import sys
 import json
-from base import AuthenticatedClient, DEFAULT_API
+import time
+from base import (get_client, read_input, read_stream, run_batch, RateLimiter, summarize_matches,
+                  MatchSummary, pop_output_options, render_output, DEFAULT_API, DEFAULT_PAGE_SIZE,
+                  BATCH_WORKERS)
+from daemon import forward
+
+# Per-candidate token files and outcomes written by bulk onboarding
+IDENTITY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".identities")
+
+# Fields an update accepts, and the profile keys they are sent (and returned) as
+UPDATE_FIELDS = {
+    "resumeText": "resumeRawContent",
+    "name": "name",
+    "email": "email",
+    "phone": "phone",
+    "jobIntention": "jobIntention",
+}
+
+
+def identity_path(identity, suffix):
+    """Return the store file for a candidate identity (e.g., an email address)."""
+    import hashlib
+    key = hashlib.sha256(identity.strip().lower().encode("utf-8")).hexdigest()[:32]
+    os.makedirs(IDENTITY_DIR, mode=0o700, exist_ok=True)
+    return os.path.join(IDENTITY_DIR, key + suffix)
+
+
+def _client(api_url, data):
+    """Return the client for the candidate named by `identity`, or the default one."""
+    identity = data.get("identity")
+    if not identity:
+        return get_client(api_url, "JOB_SEEKER")
+    return get_client(api_url, "JOB_SEEKER", identity_path(identity, ".token"))
+
+
+def _digest(text):
+    import hashlib
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _profile_cache_path(client):
+    # Kept next to the token file, so each candidate identity has its own
+    return client.token_manager.token_file + ".profile.json"
+
+
+def _cached_profile(client, token):
+    """Return the last-known profile of the token, or None."""
+    try:
+        with open(_profile_cache_path(client), 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached.get("profile") if cached.get("token") == _digest(token) else None
+
+
+def _cache_profile(client, token, profile):
+    """Save the last-known profile atomically, or drop it when `profile` is None (non-critical if it fails)."""
+    path = _profile_cache_path(client)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if profile is None:
+            os.remove(path)
+            return
+        with open(tmp_path, 'w') as f:
+            json.dump({"token": _digest(token), "profile": profile, "updatedAt": time.time()}, f,
+                      ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def plan_update(profile, data, full=False):
+    """
+    Build the update payload from the fields that differ from the last-known profile.
+
+    Args:
+        profile: Last-known profile, or None when unknown (every field is sent)
+        data: Update input (resumeText, name, email, phone, jobIntention)
+        full: Send every given field, changed or not
+
+    Returns:
+        tuple: (payload keyed by profile key, names of the input fields sent)
+    """
+    payload, sent = {}, []
+    for field, key in UPDATE_FIELDS.items():
+        if field not in data:
+            continue
+        if full or profile is None or profile.get(key) != data[field]:
+            payload[key] = data[field]
+            sent.append(field)
+    return payload, sent
+
+
+def _updated_profile(profile, payload, result):
+    """Return the profile after a successful update: the server's copy, or the cached one with the sent fields."""
+    if isinstance(result.get("result"), dict) and result["result"]:
+        return {**(profile or {}), **result["result"], **payload}
+    return {**(profile or {}), **payload}
 
 
 def submit_resume(api_url, data):
     """Submit a new resume."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    client = _client(api_url, data)
 
     payload = {
         "resumeText": data["resumeText"],
@@ -21,43 +122,75 @@ def submit_resume(api_url, data):
 
     result = client.post("/job-seekers/resume", payload)
     result["token"] = client.token_manager.get_token()
+    # A new resume replaces the profile; the next update fetches it again
+    _cache_profile(client, result["token"], None)
     return result
 
 
 def update_resume(api_url, data):
-    """Update an existing resume / profile (partial update supported)."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    """
+    Update an existing resume / profile (partial update supported).
 
-    # Build payload with only provided fields
-    fields = ("resumeText", "name", "email", "phone", "jobIntention")
-    payload = {k: data[k] for k in fields if k in data}
+    Fields equal to the last-known profile are not sent, and nothing is sent
+    when none differ. The profile is fetched once and cached next to the
+    token file, then kept current from each successful update. `sentFields`
+    in the response lists the fields actually sent.
+    """
+    client = _client(api_url, data)
 
-    # Map resumeText to resumeRawContent for the update API
-    if "resumeText" in payload:
-        payload["resumeRawContent"] = payload.pop("resumeText")
+    if not any(field in data for field in UPDATE_FIELDS):
+        return {"success": False, "error": "No fields to update"}
 
+    token = client.token_manager.get_token()
+    full = data.get("full", False)
+    profile = None if full else _cached_profile(client, token)
+    if profile is None and not full:
+        try:
+            profile = client.get("/job-seekers/profile").get("result")
+        except Exception:
+            profile = None
+        # Unknown profile: every field is sent
+        profile = profile if isinstance(profile, dict) else None
+        if profile is not None:
+            _cache_profile(client, token, profile)
+
+    payload, sent = plan_update(profile, data, full)
     if not payload:
-        return {"success": False, "error": "No fields to update"}
+        return {"success": True, "result": None, "sentFields": [], "token": token}
 
     result = client.put("/job-seekers/profile", payload)
+    if result.get("success", True):
+        _cache_profile(client, token, _updated_profile(profile, payload, result))
+    result["sentFields"] = sent
     result["token"] = client.token_manager.get_token()
     return result
 
 
 def delete_resume(api_url, data):
     """Soft-delete resume by setting status to INACTIVE."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    client = _client(api_url, data)
 
     result = client.put("/job-seekers/profile", {"status": "INACTIVE"})
     result["token"] = client.token_manager.get_token()
+    _cache_profile(client, result["token"], None)
     return result
 
 
 def list_matches(api_url, data):
     """List matched job positions for the current job seeker."""
-    client = AuthenticatedClient(api_url, "JOB_SEEKER")
+    client = _client(api_url, data)
+
+    result = client.get_list("/matches", data.get("limit"), data.get("pageSize"))
+    result["token"] = client.token_manager.get_token()
+    return result
+
 
-    result = client.get("/matches")
+def list_match_summary(api_url, data):
+    """Summarize matched job positions: top matches, score distribution and percentiles."""
+    client = _client(api_url, data)
+
+    matches = client.iter_items("/matches", data.get("pageSize") or DEFAULT_PAGE_SIZE, data.get("limit"))
+    result = {"success": True, "result": summarize_matches(matches, data.get("top", 3), data.get("minScore"))}
     result["token"] = client.token_manager.get_token()
     return result
 
@@ -68,42 +201,226 @@ ACTIONS = {
     "update": update_resume,
     "delete": delete_resume,
     "matches": list_matches,
+    "summarize": list_match_summary,
 }
 
 
+def run(data):
+    """Execute the action described by `data` (the script's JSON input)."""
+    # Extract parameters
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "submit")
+
+    # Execute action
+    fn = ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ACTIONS)}")
+
+    return fn(api_url, data)
+
+
+def _async_client(api_url, data):
+    """Asyncio counterpart of _client()."""
+    # Imported on demand so the command line does not load asyncio
+    from base_async import get_async_client
+    identity = data.get("identity")
+    if not identity:
+        return get_async_client(api_url, "JOB_SEEKER")
+    return get_async_client(api_url, "JOB_SEEKER", identity_path(identity, ".token"))
+
+
+async def submit_resume_async(api_url, data):
+    """Submit a new resume (asyncio)."""
+    client = _async_client(api_url, data)
+
+    payload = {
+        "resumeText": data["resumeText"],
+        "name": data["name"],
+        "email": data["email"],
+        "phone": data["phone"],
+        "jobIntention": data["jobIntention"]
+    }
+
+    result = await client.post("/job-seekers/resume", payload)
+    result["token"] = await client.token_manager.get_token_async()
+    _cache_profile(client, result["token"], None)
+    return result
+
+
+async def update_resume_async(api_url, data):
+    """Update an existing resume / profile (asyncio; unchanged fields are not sent, see update_resume)."""
+    client = _async_client(api_url, data)
+
+    if not any(field in data for field in UPDATE_FIELDS):
+        return {"success": False, "error": "No fields to update"}
+
+    token = await client.token_manager.get_token_async()
+    full = data.get("full", False)
+    profile = None if full else _cached_profile(client, token)
+    if profile is None and not full:
+        try:
+            profile = (await client.get("/job-seekers/profile")).get("result")
+        except Exception:
+            profile = None
+        # Unknown profile: every field is sent
+        profile = profile if isinstance(profile, dict) else None
+        if profile is not None:
+            _cache_profile(client, token, profile)
+
+    payload, sent = plan_update(profile, data, full)
+    if not payload:
+        return {"success": True, "result": None, "sentFields": [], "token": token}
+
+    result = await client.put("/job-seekers/profile", payload)
+    if result.get("success", True):
+        _cache_profile(client, token, _updated_profile(profile, payload, result))
+    result["sentFields"] = sent
+    result["token"] = await client.token_manager.get_token_async()
+    return result
+
+
+async def delete_resume_async(api_url, data):
+    """Soft-delete resume by setting status to INACTIVE (asyncio)."""
+    client = _async_client(api_url, data)
+
+    result = await client.put("/job-seekers/profile", {"status": "INACTIVE"})
+    result["token"] = await client.token_manager.get_token_async()
+    _cache_profile(client, result["token"], None)
+    return result
+
+
+async def list_matches_async(api_url, data):
+    """List matched job positions for the current job seeker (asyncio)."""
+    client = _async_client(api_url, data)
+
+    result = await client.get_list("/matches", data.get("limit"), data.get("pageSize"))
+    result["token"] = await client.token_manager.get_token_async()
+    return result
+
+
+async def list_match_summary_async(api_url, data):
+    """Summarize matched job positions (asyncio)."""
+    client = _async_client(api_url, data)
+
+    summary = MatchSummary(data.get("top", 3), data.get("minScore"))
+    async for match in client.iter_items("/matches", data.get("pageSize") or DEFAULT_PAGE_SIZE,
+                                         data.get("limit")):
+        summary.add(match)
+    result = {"success": True, "result": summary.result()}
+    result["token"] = await client.token_manager.get_token_async()
+    return result
+
+
+ASYNC_ACTIONS = {
+    "submit": submit_resume_async,
+    "update": update_resume_async,
+    "delete": delete_resume_async,
+    "matches": list_matches_async,
+    "summarize": list_match_summary_async,
+}
+
+
+async def run_async(data):
+    """Asyncio counterpart of run() for callers that already run an event loop."""
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "submit")
+
+    fn = ASYNC_ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ASYNC_ACTIONS)}")
+
+    return await fn(api_url, data)
+
+
+def _save_outcome(identity, action, result):
+    """Record the latest bulk outcome for a candidate next to their token."""
+    outcome = {
+        "identity": identity,
+        "action": action,
+        "success": result.get("success", True),
+        "updatedAt": time.time()
+    }
+    if "error" in result:
+        outcome["error"] = result["error"]
+    try:
+        with open(identity_path(identity, ".json"), 'w') as f:
+            json.dump(outcome, f, ensure_ascii=False)
+    except Exception:
+        pass  # Non-critical if we can't save
+
+
+def bulk_submit(api_url, records, workers=BATCH_WORKERS, rate=None):
+    """
+    Onboard many candidates, each under their own token.
+
+    Each record is a normal action object (default action: submit) keyed by
+    `identity` or, failing that, `email`. Its token is created or reused from
+    the identity store, records run concurrently under an optional `rate`
+    cap (requests per second), and one NDJSON line is printed per record.
+
+    Returns:
+        dict: Batch summary
+    """
+    limiter = RateLimiter(rate) if rate else None
+
+    def handle(record):
+        identity = record.get("identity") or record.get("email")
+        if not identity:
+            raise Exception("Each candidate needs an identity or email")
+        record["identity"] = identity
+        record.setdefault("apiUrl", api_url)
+        action = record.get("action", "submit")
+
+        if limiter:
+            limiter.acquire()
+        try:
+            result = run(record)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        _save_outcome(identity, action, result)
+        return dict(result, identity=identity)
+
+    return run_batch(records, handle, workers)
+
+
 if __name__ == "__main__":
     try:
-        # Parse input
-        data = None
-        if len(sys.argv) > 1:
-            data = json.loads(sys.argv[1])
-        elif not sys.stdin.isatty():
-            input_data = sys.stdin.read()
-            if input_data.strip():
-                data = json.loads(input_data)
+        # Parse input: one action, or a JSON array / NDJSON stream of candidates.
+        # A piped single-line submit is a stream of one candidate, onboarded
+        # under its own identity; other one-line actions run as usual.
+        data = read_input(records=True)
+        if isinstance(data, list) and data[0].get("action", "submit") != "submit":
+            data = data[0]
 
         if not data:
             print(json.dumps({
                 "success": False,
-                "error": "Usage: submit_resume.py <json> (or pipe json to stdin)"
+                "error": "Usage: submit_resume.py <json> (or pipe json, a json array or ndjson to stdin)"
             }))
             sys.exit(1)
 
-        # Extract parameters
-        api_url = data.pop("apiUrl", DEFAULT_API)
-        action = data.pop("action", "submit")
+        if not isinstance(data, dict):
+            summary = bulk_submit(DEFAULT_API, data)
+            sys.exit(1 if summary["failed"] else 0)
 
-        # Execute action
-        fn = ACTIONS.get(action)
-        if not fn:
-            print(json.dumps({
-                "success": False,
-                "error": f"Unknown action: {action}. Use: {', '.join(ACTIONS)}"
-            }))
-            sys.exit(1)
+        if data.get("action") == "bulk":
+            if not data.get("file"):
+                raise Exception("Action 'bulk' requires file parameter")
+            with open(data["file"], 'r') as f:
+                records = read_stream(f, records=True)
+                if isinstance(records, dict):
+                    records = [records]
+                summary = bulk_submit(data.get("apiUrl", DEFAULT_API), records or [],
+                                      data.get("workers", BATCH_WORKERS), data.get("rate"))
+            sys.exit(1 if summary["failed"] else 0)
 
-        result = fn(api_url, data)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        # Prefer a running daemon; fall back to running in-process
+        options = pop_output_options(data)
+        result = forward("submit_resume", data)
+        if result is None:
+            result = run(data)
+        print(render_output(result, **options))
 
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
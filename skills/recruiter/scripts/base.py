@@ -4,9 +4,20 @@ Base module for recruiter CLI scripts.
 Handles token management, authentication, and HTTP requests.
 """
 import os
+import sys
 import json
-import urllib.request
-import urllib.error
+import time
+import threading
+import collections
+
+# http.client (with ssl and email), concurrent.futures, urllib.parse, gzip and
+# the like are imported where they are used, so usage errors and
+# daemon-forwarded calls start fast (see benchmarks/import_budget.py).
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process file locks are unavailable
+    fcntl = None
 
 # Token storage location
 TOKEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".token")
@@ -14,14 +25,428 @@ TOKEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".token")
 # Default API endpoint
 DEFAULT_API = "https://api.jobclaw.ai"
 
+# Socket timeout (seconds) for API connections
+DEFAULT_TIMEOUT = 60
+
+# Seconds a token verified (or successfully used) recently is trusted
+# without another /auth/verify round trip
+TOKEN_TRUST_TTL = int(os.environ.get("JOBCLAW_TOKEN_TTL", "600"))
+
+# Minimum seconds between rewrites of the token file's verifiedAt stamp
+TOKEN_TOUCH_INTERVAL = 60
+
+# Items processed concurrently in batch mode
+BATCH_WORKERS = int(os.environ.get("JOBCLAW_BATCH_WORKERS", "8"))
+
+# Shared clients kept by get_client(); beyond this the least recently used is
+# dropped (bulk onboarding makes one per candidate)
+CLIENT_CACHE_SIZE = int(os.environ.get("JOBCLAW_CLIENT_CACHE_SIZE", "64"))
+
+# Opt-in GET response cache (enabled by JOBCLAW_CACHE=1)
+CACHE_FILE = os.environ.get(
+    "JOBCLAW_CACHE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache.db")
+)
+CACHE_TTL = int(os.environ.get("JOBCLAW_CACHE_TTL", "60"))
+CACHE_MAX_BYTES = int(os.environ.get("JOBCLAW_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Cached endpoint prefixes made stale by a write, by the write's first path segment
+CACHE_INVALIDATION = {
+    "jobs": ("/jobs", "/matches"),
+    "job-seekers": ("/job-seekers", "/matches"),
+}
+
+# Request bodies at least this large are gzip-compressed when the host
+# advertises support (JOBCLAW_COMPRESS_REQUESTS: auto, always or off)
+COMPRESS_MIN_BYTES = int(os.environ.get("JOBCLAW_COMPRESS_MIN_BYTES", "8192"))
+COMPRESS_REQUESTS = os.environ.get("JOBCLAW_COMPRESS_REQUESTS", "auto").lower()
+
+# Paged list endpoints: query parameters, default page size and the result
+# keys a page's items or next cursor may be returned under
+PAGE_PARAM = "page"
+PAGE_SIZE_PARAM = "pageSize"
+CURSOR_PARAM = "cursor"
+DEFAULT_PAGE_SIZE = 50
+PAGE_ITEM_KEYS = ("items", "list", "records", "content", "data")
+PAGE_CURSOR_KEYS = ("nextCursor", "cursor", "next")
+
+# Retries of transient failures (connection errors and the statuses below);
+# only idempotent methods are retried unless the caller opts in
+MAX_RETRIES = int(os.environ.get("JOBCLAW_MAX_RETRIES", "3"))
+RETRY_STATUSES = (408, 429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+MAX_RETRY_AFTER = 120
+
+# Client-side rate limit shared by all requests of the process, in requests
+# per second (0 = unlimited until the server throttles). JOBCLAW_RATE_STATE
+# names a state file to share the limit with other processes.
+RATE_LIMIT = float(os.environ.get("JOBCLAW_RATE_LIMIT", "0"))
+RATE_STATE_FILE = os.environ.get("JOBCLAW_RATE_STATE") or None
+
+# Status codes that are followed as redirects
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Input keys that shape a script's printed output instead of its action
+OUTPUT_OPTIONS = ("fields", "compact", "truncate")
+
+# Match score bands (exclusive lower bound), best first; lower scores are "below"
+SCORE_BUCKETS = (("excellent", 0.85), ("good", 0.75), ("moderate", 0.65))
+MATCH_SCORE_KEYS = ("score", "similarity", "similarityScore", "matchScore")
+# Fields of the matched job or candidate kept in a match summary
+MATCH_BRIEF_FIELDS = ("id", "title", "companyName", "location", "salary", "name", "jobIntention")
+
+# Per-request phase timing trace: "stderr" or a file path to append NDJSON
+# records to, with a per-endpoint summary at exit (unset = off)
+TRACE_TARGET = os.environ.get("JOBCLAW_TRACE") or None
+
+
+def _elapsed_ms(start, end=None):
+    return round(((end if end is not None else time.perf_counter()) - start) * 1000, 3)
+
+
+_traced_classes = None
+
+
+def _traced_connection_classes():
+    """Return HTTP/HTTPS connection classes that time DNS, connect and TLS."""
+    global _traced_classes
+    if _traced_classes is not None:
+        return _traced_classes
+
+    import socket
+    import http.client
+
+    class TracedHTTPConnection(http.client.HTTPConnection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.timings = {}
+            self._create_connection = self._timed_create_connection
+
+        def _timed_create_connection(self, address, timeout, source_address=None):
+            host, port = address
+            start = time.perf_counter()
+            infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+            resolved = time.perf_counter()
+            self.timings = {"dns": _elapsed_ms(start, resolved)}
+
+            error = None
+            for family, sock_type, proto, _, sockaddr in infos:
+                sock = socket.socket(family, sock_type, proto)
+                try:
+                    sock.settimeout(timeout)
+                    if source_address:
+                        sock.bind(source_address)
+                    sock.connect(sockaddr)
+                except OSError as e:
+                    sock.close()
+                    error = e
+                    continue
+                self.timings["connect"] = _elapsed_ms(resolved)
+                return sock
+            raise error or OSError(f"getaddrinfo returned no addresses for {host}")
+
+    class TracedHTTPSConnection(http.client.HTTPSConnection, TracedHTTPConnection):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            # Whatever connect() spent beyond DNS and TCP went on the TLS handshake
+            total = _elapsed_ms(start)
+            self.timings["tls"] = round(total - sum(self.timings.values()), 3)
+
+    _traced_classes = (TracedHTTPConnection, TracedHTTPSConnection)
+    return _traced_classes
+
+
+def _proxy_route(scheme, host):
+    """
+    Return (proxy host, proxy port, proxy headers) for requests to `host`, or None to connect directly.
+
+    Follows urllib's settings: http_proxy / https_proxy and no_proxy in
+    either case, and the system proxy settings on macOS and Windows.
+    """
+    if sys.platform not in ("darwin", "win32") and not any(
+            name.lower() == f"{scheme}_proxy" for name in os.environ):
+        return None  # Spares every call the urllib.request import
+
+    import urllib.request
+    from urllib.parse import urlsplit, unquote
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if parts.scheme != "http":
+        raise APIError(f"Unsupported proxy for {scheme} requests: {proxy} (use an http:// proxy)")
+    headers = {}
+    if parts.username is not None:
+        import base64
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}".encode("utf-8")
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials).decode("ascii")
+    return parts.hostname, parts.port or 80, headers
+
+
+class ConnectionPool:
+    """
+    Keeps persistent HTTP/1.1 connections per host and one shared SSL context.
+
+    Requests go through the configured HTTP(S) proxy, if any (see
+    _proxy_route): HTTPS through a CONNECT tunnel, plain HTTP as
+    absolute-URI requests to the proxy.
+    """
+
+    def __init__(self, max_idle_per_host=16, timeout=DEFAULT_TIMEOUT):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._gzip_hosts = set()
+        self._ssl_context = None
+        self._lock = threading.Lock()
+
+    def ssl_context(self):
+        """Return the SSL context shared by every HTTPS connection of this pool."""
+        with self._lock:
+            if self._ssl_context is None:
+                import ssl
+                self._ssl_context = ssl.create_default_context()
+            return self._ssl_context
+
+    def _connect(self, key):
+        import http.client
+        scheme, host, port = key
+        http_class, https_class = http.client.HTTPConnection, http.client.HTTPSConnection
+        if TRACE_TARGET:
+            http_class, https_class = _traced_connection_classes()
+        route = _proxy_route(scheme, host)
+        if route is None:
+            if scheme == "https":
+                return https_class(host, port, timeout=self.timeout, context=self.ssl_context())
+            return http_class(host, port, timeout=self.timeout)
+
+        proxy_host, proxy_port, proxy_headers = route
+        if scheme == "https":
+            conn = https_class(proxy_host, proxy_port, timeout=self.timeout, context=self.ssl_context())
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn
+        return http_class(proxy_host, proxy_port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """Return (connection, reused) - an idle connection if one is available."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                return self._connect(key), False
+            if not self._dropped(conn):
+                return conn, True
+            conn.close()
+
+    @staticmethod
+    def _dropped(conn):
+        """Whether the server has closed an idle connection (its socket reads as ready: EOF)."""
+        import select
+        if conn.sock is None:
+            return True
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    def _key(url):
+        from urllib.parse import urlsplit
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        return (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80)), parts
+
+    def accepts_gzip(self, url):
+        """Whether the URL's host has advertised gzip-encoded request bodies."""
+        return self._key(url)[0] in self._gzip_hosts
+
+    def set_accepts_gzip(self, url, accepted):
+        key = self._key(url)[0]
+        with self._lock:
+            if accepted:
+                self._gzip_hosts.add(key)
+            else:
+                self._gzip_hosts.discard(key)
+
+    def request(self, method, url, body=None, headers=None, trace=None):
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: Full URL to request
+            body: Request body bytes, or a StreamedBody to send chunked
+            headers: Request headers
+            trace: Optional trace record to fill with connection and phase timings
+
+        Returns:
+            tuple: (status, response headers, response body bytes)
+        """
+        import http.client
+        key, parts = self._key(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        route = _proxy_route(key[0], key[1]) if key[0] == "http" else None
+        if route:
+            # A forward proxy takes the absolute URI, and its credentials with every request
+            path = f"http://{parts.netloc.rpartition('@')[2]}{path}"
+            headers = {**(headers or {}), **route[2]}
+
+        # A body that can only be read once goes out on a new connection, so
+        # a dropped keep-alive connection never consumes it
+        replayable = getattr(body, "replayable", True)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        while True:
+            conn, reused = self._acquire(key) if replayable else (self._connect(key), False)
+            sent = None
+            try:
+                start = time.perf_counter()
+                conn.request(method, path, body=body, headers=headers or {})
+                sent = time.perf_counter()
+                resp = conn.getresponse()
+                first_byte = time.perf_counter()
+                payload = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server dropped an idle keep-alive connection; retry on a fresh one.
+                # Once the whole request went out the server may have acted on it,
+                # so then only an idempotent one is sent again
+                if reused and (idempotent or sent is None):
+                    if trace is not None:
+                        trace["staleRetry"] = True
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            if trace is not None:
+                phases = {} if reused else dict(getattr(conn, "timings", {}))
+                # conn.request() also opened the connection if it was new
+                phases["send"] = round(_elapsed_ms(start, sent) - sum(phases.values()), 3)
+                phases["ttfb"] = _elapsed_ms(sent, first_byte)
+                phases["download"] = _elapsed_ms(first_byte)
+                trace.update(reused=reused, status=resp.status, bytesReceived=len(payload),
+                             phases=phases)
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+
+            # Servers may advertise the request encodings they accept (RFC 7694)
+            if "gzip" in (resp.headers.get("Accept-Encoding") or "").lower():
+                with self._lock:
+                    self._gzip_hosts.add(key)
+            return resp.status, resp.headers, payload
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+# Pool shared by every client in this process
+default_pool = ConnectionPool()
+
+
+def decode_token_expiry(token):
+    """Return the `exp` claim of a JWT-style token, or None if it carries none."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    import base64
+    try:
+        padded = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        exp = claims.get("exp")
+        return float(exp) if isinstance(exp, (int, float)) else None
+    except Exception:
+        return None
+
+
+def read_token_file(path=TOKEN_FILE):
+    """
+    Read a saved token and its metadata.
+
+    Files written by older versions hold only the bare token; those are
+    returned with empty metadata so they get verified before use.
+
+    Returns:
+        dict: {"token", "issuedAt", "verifiedAt", "expiresAt"}, or None
+    """
+    try:
+        with open(path, 'r') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+
+    if not content:
+        return None
+    if not content.startswith("{"):
+        return {"token": content, "issuedAt": None, "verifiedAt": None,
+                "expiresAt": decode_token_expiry(content)}
+
+    try:
+        meta = json.loads(content)
+    except ValueError:
+        return None
+    return meta if meta.get("token") else None
+
+
+def write_token_file(meta, path=TOKEN_FILE):
+    """Save a token and its metadata atomically (non-critical if it fails)."""
+    # Readers in other processes see either the old file or the new one
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
 class TokenManager:
-    """Manages user authentication tokens."""
+    """
+    Manages user authentication tokens.
 
-    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER"):
+    Minting a token is single-flight: threads of a process share one lock,
+    and processes sharing a token file take an advisory lock next to it,
+    re-read the file once they hold it and adopt a token another process
+    minted meanwhile instead of minting (and overwriting) their own.
+    """
+
+    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER", pool=None,
+                 trust_ttl=None, token_file=None):
         self.api_url = api_url
         self.user_type = user_type
+        self.pool = pool or default_pool
+        self.token_file = token_file or TOKEN_FILE
+        self.lock_file = self.token_file + ".lock"
+        self.trust_ttl = TOKEN_TRUST_TTL if trust_ttl is None else trust_ttl
         self._token = None
+        self._meta = None
+        self._lock = threading.Lock()
+        # Network round trips made for the token, reported by request traces
+        self.verifications = 0
+        self.creations = 0
 
     def get_token(self):
         """Get valid token (from cache, file, or create new)."""
@@ -29,30 +454,94 @@ class TokenManager:
         if self._token:
             return self._token
 
+        # Threads sharing this manager wait for one of them to load or create it
+        with self._lock:
+            if not self._token:
+                self._token = self._load_or_create_token()
+            return self._token
+
+    def _load_or_create_token(self):
         # 2. Try to load from file
-        if os.path.exists(TOKEN_FILE):
-            try:
-                with open(TOKEN_FILE, 'r') as f:
-                    saved_token = f.read().strip()
+        meta = read_token_file(self.token_file)
+        if meta and not self._is_expired(meta):
+            # Trust a recently verified token; otherwise verify it now
+            if self._is_fresh(meta):
+                self._meta = meta
+                return meta["token"]
+            if self._verify_token(meta["token"]):
+                meta["verifiedAt"] = time.time()
+                self._touch(meta)
+                self._meta = meta
+                return meta["token"]
 
-                # Verify token is still valid
-                if self._verify_token(saved_token):
-                    self._token = saved_token
-                    return self._token
-            except Exception:
-                pass
+        # 3. Create new token (or adopt one another process just created)
+        return self._mint(meta["token"] if meta else None)
+
+    def _mint(self, rejected):
+        """
+        Create a token while holding the token file lock.
 
-        # 3. Create new token
-        self._token = self._create_token()
-        return self._token
+        If the file holds a usable token other than `rejected` (the one
+        found unusable) once the lock is held, another process minted it
+        while we waited and it is adopted instead.
+        """
+        with FileLock(self.lock_file):
+            meta = read_token_file(self.token_file)
+            if meta and meta["token"] != rejected and not self._is_expired(meta):
+                if self._is_fresh(meta) or self._verify_token(meta["token"]):
+                    self._meta = meta
+                    return meta["token"]
+            return self._create_token()
+
+    def refresh_token(self, stale_token):
+        """
+        Replace a token the API rejected and return the new one.
+
+        Threads that hit a 401 with the same token share one refresh: those
+        arriving after it get the token it produced.
+        """
+        with self._lock:
+            if self._token and self._token != stale_token:
+                return self._token
+            self._token = None
+            self._meta = None
+            self._token = self._mint(stale_token)
+            return self._token
+
+    def _touch(self, meta):
+        """Save a newer verifiedAt unless another process has replaced the token since."""
+        with FileLock(self.lock_file):
+            current = read_token_file(self.token_file)
+            if current is None or current.get("token") == meta["token"]:
+                write_token_file(meta, self.token_file)
+
+    def mark_used(self):
+        """Record that the current token was just accepted by the API."""
+        meta = self._meta
+        if not meta or meta.get("token") != self._token:
+            return
+        now = time.time()
+        if now - (meta.get("verifiedAt") or 0) >= TOKEN_TOUCH_INTERVAL:
+            meta["verifiedAt"] = now
+            self._touch(meta)
+
+    def _is_expired(self, meta):
+        expires_at = meta.get("expiresAt")
+        return expires_at is not None and time.time() >= expires_at
+
+    def _is_fresh(self, meta):
+        verified_at = meta.get("verifiedAt")
+        return verified_at is not None and time.time() - verified_at <= self.trust_ttl
 
     def _verify_token(self, token):
         """Verify if token is valid."""
+        self.verifications += 1
         try:
             result = http_request(
                 f"{self.api_url}/auth/verify",
                 method="GET",
-                token=token
+                token=token,
+                pool=self.pool
             )
             return result.get("result", {}).get("valid", False)
         except Exception:
@@ -63,124 +552,881 @@ class TokenManager:
         result = http_request(
             f"{self.api_url}/auth/token",
             method="POST",
-            data={"userType": self.user_type}
+            data={"userType": self.user_type},
+            pool=self.pool
         )
 
         if "result" not in result:
             raise Exception(f"Failed to create token: {result.get('error', 'Unknown error')}")
 
-        new_token = result["result"]["token"]
+        return self._store_token(result["result"]["token"])
 
-        # Save token to file
-        try:
-            with open(TOKEN_FILE, 'w') as f:
-                f.write(new_token)
-        except Exception:
-            pass  # Non-critical if we can't save
+    def _store_token(self, new_token):
+        """Save a freshly issued token, which counts as verified, and return it."""
+        self.creations += 1
+        now = time.time()
+        self._meta = {
+            "token": new_token,
+            "issuedAt": now,
+            "verifiedAt": now,
+            "expiresAt": decode_token_expiry(new_token)
+        }
+        write_token_file(self._meta, self.token_file)
 
         return new_token
 
     def clear_token(self):
         """Clear cached token and file."""
         self._token = None
-        if os.path.exists(TOKEN_FILE):
+        self._meta = None
+        if os.path.exists(self.token_file):
             try:
-                os.remove(TOKEN_FILE)
+                os.remove(self.token_file)
             except Exception:
                 pass
 
 
-def http_request(url, method="GET", data=None, token=None):
+class APIError(Exception):
+    """Request failure with its HTTP status (None for connection errors) and response headers."""
+
+    def __init__(self, message, status=None, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class FileLock:
+    """Advisory exclusive lock on a file, held for the duration of a with block."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, blocking=True):
+        """Take the lock; without `blocking`, return False at once if another holder has it."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class StreamedBody:
     """
-    Send HTTP request and return parsed JSON response.
+    Request body produced piece by piece and sent with chunked transfer encoding.
+
+    `source` is a function returning an iterable of bytes. It is called again
+    whenever the body has to be resent (a redirect, an uncompressed retry or
+    an authentication retry); pass replayable=False for sources that can
+    only be read once, such as stdin.
+    """
+
+    def __init__(self, source, replayable=True):
+        self.source = source
+        self.replayable = replayable
+        self.compress = False
+        self.bytes_sent = 0
+        self._started = False
+
+    def __iter__(self):
+        if self._started and not self.replayable:
+            raise APIError("Streamed request body cannot be sent twice")
+        self._started = True
+        self.bytes_sent = 0
+        compressor = None
+        if self.compress:
+            import zlib
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in self.source():
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                self.bytes_sent += len(chunk)
+                yield chunk
+        if compressor:
+            chunk = compressor.flush()
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+def _should_compress(url, body, pool):
+    if COMPRESS_REQUESTS == "off" or len(body) < COMPRESS_MIN_BYTES:
+        return False
+    return COMPRESS_REQUESTS == "always" or pool.accepts_gzip(url)
+
+
+def _decode_body(raw, encoding):
+    """Undo a gzip or deflate Content-Encoding."""
+    encoding = (encoding or "").strip().lower()
+    if not raw or encoding in ("", "identity"):
+        return raw
+    if encoding in ("gzip", "x-gzip"):
+        import gzip
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        import zlib
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            # Some servers send raw deflate data without the zlib wrapper
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    raise Exception(f"Unsupported Content-Encoding: {encoding}")
+
+
+def send_request(url, method="GET", data=None, token=None, pool=None, headers=None, trace=None):
+    """
+    Send HTTP request and return the status, headers and parsed JSON body.
 
     Args:
         url: Full URL to request
         method: HTTP method (GET, POST, PUT, DELETE)
-        data: Request body data (will be JSON encoded)
+        data: Request body data (will be JSON encoded), or a StreamedBody
         token: Optional authentication token
+        pool: ConnectionPool to send through (defaults to the shared pool)
+        headers: Extra request headers (e.g., conditional-GET validators)
+        trace: Extra fields for this request's trace record (when tracing is on)
 
     Returns:
-        dict: Parsed JSON response
+        tuple: (status, response headers, parsed JSON); the body is None
+        for a 304 Not Modified reply
 
     Raises:
         Exception: If request fails
     """
-    headers = {
+    if not TRACE_TARGET:
+        return _send_request(url, method, data, token, pool, headers, None)
+
+    from urllib.parse import urlsplit
+    parts = urlsplit(url)
+    record = {"ts": round(time.time(), 3), "method": method,
+              "endpoint": parts.path + (f"?{parts.query}" if parts.query else "")}
+    record.update(trace or {})
+    start = time.perf_counter()
+    try:
+        return _send_request(url, method, data, token, pool, headers, record)
+    except Exception as e:
+        record["error"] = str(e)
+        raise
+    finally:
+        record["totalMs"] = _elapsed_ms(start)
+        request_tracer().emit(record)
+
+
+def _send_request(url, method, data, token, pool, headers, record):
+    import http.client
+    from urllib.parse import urljoin
+    pool = pool or default_pool
+    body, request_headers = _build_request(url, data, token, pool, headers)
+    compressed = "Content-Encoding" in request_headers
+    streamed = isinstance(body, StreamedBody)
+    if record is not None and not streamed:
+        record["bytesSent"] = len(body) if body else 0
+
+    try:
+        for _ in range(5):
+            status, resp_headers, raw = pool.request(method, url, body, request_headers, record)
+            if status == 415 and compressed:
+                # The server refused the compressed body; resend it as-is
+                pool.set_accepts_gzip(url, False)
+                compressed = False
+                if streamed:
+                    body.compress = False
+                else:
+                    body = _decode_body(body, "gzip")
+                del request_headers["Content-Encoding"]
+                continue
+            location = resp_headers.get("Location")
+            if status not in REDIRECT_CODES or not location:
+                break
+            # Follow redirects the way urllib does: 307/308 keep the method and body
+            url = urljoin(url, location)
+            if status not in (307, 308) and method not in ("GET", "HEAD"):
+                method, body = "GET", None
+    except (OSError, http.client.HTTPException) as e:
+        raise APIError(f"Connection error: {e}")
+
+    if record is not None and streamed:
+        record["bytesSent"] = body.bytes_sent
+    if record is None:
+        return _parse_response(status, resp_headers, raw)
+    start = time.perf_counter()
+    try:
+        return _parse_response(status, resp_headers, raw)
+    finally:
+        record["phases"]["decode"] = _elapsed_ms(start)
+
+
+def _build_request(url, data, token, pool, headers=None):
+    """
+    Return the (body, headers) of an API request, gzipping large bodies when allowed.
+
+    A StreamedBody is passed through as the body; its size is unknown up front,
+    so it is compressed whenever the server accepts compressed bodies.
+    """
+    request_headers = {
         "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate",
         "User-Agent": "JobClaw-Skill-Script/2.0"
     }
 
     if token:
-        headers["Authorization"] = f"Bearer {token}"
+        request_headers["Authorization"] = f"Bearer {token}"
+    if headers:
+        request_headers.update(headers)
+
+    if isinstance(data, StreamedBody):
+        data.compress = COMPRESS_REQUESTS == "always" or (
+            COMPRESS_REQUESTS != "off" and pool.accepts_gzip(url))
+        if data.compress:
+            request_headers["Content-Encoding"] = "gzip"
+        return data, request_headers
 
     body = json.dumps(data).encode("utf-8") if data else None
-    req = urllib.request.Request(url, data=body, headers=headers, method=method)
+    if body is not None and _should_compress(url, body, pool):
+        import gzip
+        body = gzip.compress(body, compresslevel=6)
+        request_headers["Content-Encoding"] = "gzip"
+    return body, request_headers
 
-    try:
-        with urllib.request.urlopen(req) as resp:
-            response_data = json.loads(resp.read().decode("utf-8"))
 
-            # Check if response indicates success
-            if not response_data.get("success", True):
-                raise Exception(response_data.get("error", "Request failed"))
+def _parse_response(status, resp_headers, raw):
+    """Decode a response into (status, headers, parsed JSON), raising APIError on failure."""
+    raw = _decode_body(raw, resp_headers.get("Content-Encoding"))
 
-            return response_data
+    if status == 304:
+        return status, resp_headers, None
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
+    if status >= 400:
+        error_body = raw.decode("utf-8", "replace")
         try:
             error_data = json.loads(error_body)
             error_msg = error_data.get("message", error_body)
         except Exception:
             error_msg = error_body
 
-        raise Exception(f"HTTP {e.code}: {error_msg}")
+        raise APIError(f"HTTP {status}: {error_msg}", status, resp_headers)
+
+    response_data = json.loads(raw.decode("utf-8"))
+
+    # Check if response indicates success
+    if not response_data.get("success", True):
+        raise APIError(response_data.get("error", "Request failed"), status, resp_headers)
+
+    return status, resp_headers, response_data
+
+
+def http_request(url, method="GET", data=None, token=None, pool=None):
+    """
+    Send HTTP request and return parsed JSON response.
+
+    Args:
+        url: Full URL to request
+        method: HTTP method (GET, POST, PUT, DELETE)
+        data: Request body data (will be JSON encoded), or a StreamedBody
+        token: Optional authentication token
+        pool: ConnectionPool to send through (defaults to the shared pool)
+
+    Returns:
+        dict: Parsed JSON response
+
+    Raises:
+        Exception: If request fails
+    """
+    return send_request(url, method, data, token, pool)[2]
+
+
+def retry_after_seconds(headers):
+    """Parse a Retry-After header (seconds or HTTP date), or return None."""
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestTracer:
+    """Writes one NDJSON record per request and a per-endpoint summary at exit."""
+
+    def __init__(self, target):
+        self.target = target
+        self._durations = {}
+        self._lock = threading.Lock()
+        import atexit
+        atexit.register(self.write_summary)
+
+    @staticmethod
+    def normalize(endpoint):
+        """Collapse IDs so /matches/job/j42?page=2 is summarised as /matches/job/{id}."""
+        path = endpoint.split("?", 1)[0]
+        return "/".join("{id}" if any(c.isdigit() for c in segment) else segment
+                        for segment in path.split("/"))
+
+    def _write(self, line):
+        if self.target == "stderr":
+            sys.stderr.write(line + "\n")
+            sys.stderr.flush()
+            return
+        with open(self.target, "a") as f:
+            f.write(line + "\n")
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            key = (record["method"], self.normalize(record["endpoint"]))
+            stats = self._durations.setdefault(key, {"totals": [], "phases": {}, "errors": 0,
+                                                     "reused": 0})
+            stats["totals"].append(record["totalMs"])
+            for phase, ms in record.get("phases", {}).items():
+                stats["phases"].setdefault(phase, []).append(ms)
+            stats["errors"] += "error" in record
+            stats["reused"] += bool(record.get("reused"))
+            self._write(line)
+
+    @staticmethod
+    def _percentile(values, fraction):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def summary(self):
+        """Return {"METHOD endpoint": {count, errors, reused, p50Ms, p95Ms, maxMs, phasesP50}}."""
+        with self._lock:
+            items = sorted(self._durations.items())
+        return {
+            f"{method} {endpoint}": {
+                "count": len(stats["totals"]),
+                "errors": stats["errors"],
+                "reused": stats["reused"],
+                "p50Ms": self._percentile(stats["totals"], 0.5),
+                "p95Ms": self._percentile(stats["totals"], 0.95),
+                "maxMs": max(stats["totals"]),
+                "phasesP50": {phase: self._percentile(values, 0.5)
+                              for phase, values in stats["phases"].items()},
+            }
+            for (method, endpoint), stats in items
+        }
 
-    except urllib.error.URLError as e:
-        raise Exception(f"Connection error: {e.reason}")
+    def write_summary(self):
+        if self._durations:
+            self._write(json.dumps({"traceSummary": self.summary()}, ensure_ascii=False))
+
+
+_request_tracer = None
+_request_tracer_lock = threading.Lock()
+
+
+def request_tracer():
+    """Return the process-wide RequestTracer for JOBCLAW_TRACE."""
+    global _request_tracer
+    with _request_tracer_lock:
+        if _request_tracer is None:
+            _request_tracer = RequestTracer(TRACE_TARGET)
+        return _request_tracer
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures, honouring Retry-After."""
+
+    def __init__(self, max_retries=None, base_delay=0.5, max_delay=30.0):
+        self.max_retries = MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, method, error, attempt, retry_unsafe=False):
+        """Whether a failed request may be sent again."""
+        if attempt >= self.max_retries or not isinstance(error, APIError):
+            return False
+        if method.upper() not in IDEMPOTENT_METHODS and not retry_unsafe:
+            return False
+        return error.status is None or error.status in RETRY_STATUSES
+
+    def delay(self, attempt, error):
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        import random
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = retry_after_seconds(getattr(error, "headers", None))
+        if retry_after is None:
+            return backoff
+        return max(backoff, min(retry_after, MAX_RETRY_AFTER))
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket shared by threads, and optionally by processes.
+
+    Starts at `rate` requests per second (None = unlimited until throttled).
+    Each throttle (HTTP 429) halves the rate and pauses until Retry-After;
+    each success raises it by `increase`, up to `max_rate`. With a
+    `state_file`, the bucket lives in that file under an advisory lock so
+    every process using it shares one budget.
+    """
+
+    def __init__(self, rate=None, burst=None, min_rate=0.5, max_rate=None, increase=0.1,
+                 state_file=None):
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.state_file = state_file
+        self._state = {"rate": float(rate) if rate else None, "tokens": float(burst or 1),
+                       "updated": time.time(), "pausedUntil": 0.0, "throttledAt": 0.0}
+        self._recent = []
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self._state["rate"]
+
+    def _update(self, fn):
+        """Apply `fn` to the bucket state under the thread lock (and file lock when shared)."""
+        with self._lock:
+            if not self.state_file:
+                return fn(self._state)
+            with FileLock(self.state_file + ".lock"):
+                try:
+                    with open(self.state_file, 'r') as f:
+                        self._state.update(json.load(f))
+                except (OSError, ValueError):
+                    pass
+                before = dict(self._state)
+                result = fn(self._state)
+                # Most successes leave the rate alone; skip the rewrite then
+                if self._state != before:
+                    with open(self.state_file, 'w') as f:
+                        json.dump(self._state, f)
+                return result
+
+    def _take(self, state):
+        now = time.time()
+        if state["pausedUntil"] > now:
+            return state["pausedUntil"] - now
+        rate = state["rate"]
+        if not rate:
+            return 0
+        capacity = float(self.burst or max(1.0, rate))
+        tokens = min(capacity, state["tokens"] + (now - state["updated"]) * rate)
+        state["updated"] = now
+        if tokens >= 1:
+            state["tokens"] = tokens - 1
+            return 0
+        state["tokens"] = tokens
+        return (1 - tokens) / rate
+
+    def acquire(self):
+        """Block until the next request may be sent."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """Take a send slot if one is free; otherwise return the seconds to wait."""
+        wait = self._update(self._take)
+        if wait > 0:
+            return wait
+
+        # Remember recent send times to estimate the rate that got throttled
+        now = time.time()
+        with self._lock:
+            self._recent.append(now)
+            del self._recent[:-50]
+        return 0
+
+    def on_success(self):
+        """Additively raise a throttled rate after a successful request."""
+        if self._state["rate"] is None and not self.state_file:
+            return
+
+        def grow(state):
+            if state["rate"] is not None:
+                rate = state["rate"] + self.increase
+                state["rate"] = min(rate, self.max_rate) if self.max_rate else rate
+        self._update(grow)
+
+    def on_throttle(self, retry_after=None):
+        """Halve the rate after an HTTP 429 and pause everyone until Retry-After."""
+        # Estimate the throttled rate from the sends of the last few seconds
+        now = time.time()
+        with self._lock:
+            recent = [t for t in self._recent if now - t <= 10]
+        observed = None
+        if len(recent) >= 5 and recent[-1] > recent[0]:
+            observed = (len(recent) - 1) / (recent[-1] - recent[0])
+
+        def shrink(state):
+            now = time.time()
+            if retry_after:
+                state["pausedUntil"] = max(state["pausedUntil"], now + retry_after)
+            # Concurrent requests throttled together count as one signal
+            if now - state["throttledAt"] < 1.0:
+                return
+            current = state["rate"] or observed or self.max_rate
+            if not current:
+                return  # No rate to scale down yet; the pause and backoff apply
+            state["rate"] = max(self.min_rate, current / 2)
+            state["tokens"] = 0.0
+            state["updated"] = now
+            state["throttledAt"] = now
+        self._update(shrink)
+
+
+# Limiter shared by every client in this process
+default_limiter = RateLimiter(RATE_LIMIT or None, state_file=RATE_STATE_FILE)
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of GET responses, stored in SQLite.
+
+    Entries are scoped by API URL and user identity. Entries with an ETag or
+    Last-Modified validator are revalidated with a conditional GET; entries
+    without one are served for `ttl` seconds.
+    """
+
+    def __init__(self, path=None, max_bytes=None, ttl=None):
+        import sqlite3
+        self.path = path or CACHE_FILE
+        self.max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " scope TEXT, endpoint TEXT, body TEXT, etag TEXT, last_modified TEXT,"
+            " stored_at REAL, accessed_at REAL, size INTEGER,"
+            " PRIMARY KEY (scope, endpoint))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+
+    def lookup(self, scope, endpoint):
+        """Return the cached entry as a dict, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses"
+                " WHERE scope = ? AND endpoint = ?", (scope, endpoint)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE scope = ? AND endpoint = ?",
+                (time.time(), scope, endpoint)
+            )
+        body, etag, last_modified, stored_at = row
+        return {"data": json.loads(body), "etag": etag, "lastModified": last_modified,
+                "storedAt": stored_at}
+
+    def is_fresh(self, entry):
+        """Whether an entry without validators may be served without a request."""
+        return time.time() - entry["storedAt"] <= self.ttl
+
+    def store(self, scope, endpoint, data, etag=None, last_modified=None):
+        """Cache a response and evict least recently used entries over the size limit."""
+        body = json.dumps(data, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (scope, endpoint, body, etag, last_modified, now, now, len(body))
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute(
+                "SELECT scope, endpoint, size FROM responses ORDER BY accessed_at"
+            ).fetchall()
+            for row_scope, row_endpoint, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute(
+                    "DELETE FROM responses WHERE scope = ? AND endpoint = ?",
+                    (row_scope, row_endpoint)
+                )
+                total -= size
+
+    def invalidate(self, scope, prefixes):
+        """Drop a scope's entries whose endpoint starts with any of `prefixes`."""
+        with self._lock:
+            for prefix in prefixes:
+                self._db.execute(
+                    "DELETE FROM responses WHERE scope = ? AND substr(endpoint, 1, ?) = ?",
+                    (scope, len(prefix), prefix)
+                )
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+
+def _page_info(result, page, page_size):
+    """
+    Split one page of a list endpoint into (items, next cursor, has more).
+
+    Plain lists are paged by number and have more while pages come back
+    full; dict pages may carry their own cursor, hasMore, total or
+    totalPages fields.
+    """
+    if isinstance(result, list):
+        # A page larger than requested means the server does not page at all
+        return result, None, len(result) == page_size
+    if not isinstance(result, dict):
+        raise Exception("Unexpected list response")
+
+    items = next((result[key] for key in PAGE_ITEM_KEYS if isinstance(result.get(key), list)), None)
+    if items is None:
+        raise Exception("Unexpected list response")
+    cursor = next((result[key] for key in PAGE_CURSOR_KEYS if result.get(key)), None)
+
+    for key in ("hasMore", "hasNext"):
+        if key in result:
+            return items, cursor, bool(result[key])
+    if cursor is not None:
+        return items, cursor, True
+    if result.get("totalPages") is not None:
+        return items, None, page < result["totalPages"]
+    if result.get("total") is not None:
+        return items, None, page * page_size < result["total"]
+    return items, None, len(items) == page_size
+
+
+def invalidation_prefixes(endpoint):
+    """Return the cached endpoint prefixes that a write to `endpoint` makes stale."""
+    segment = endpoint.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+    return CACHE_INVALIDATION.get(segment, (f"/{segment}",))
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache():
+    """Return the shared ResponseCache if JOBCLAW_CACHE enables it, else None."""
+    global _default_cache
+    if os.environ.get("JOBCLAW_CACHE", "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
 
 
 class AuthenticatedClient:
     """HTTP client with automatic token management."""
 
-    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER"):
+    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER", pool=None,
+                 token_file=None, cache=None, limiter=None, retry_policy=None):
         self.api_url = api_url
-        self.token_manager = TokenManager(api_url, user_type)
+        self.pool = pool or default_pool
+        self.token_manager = TokenManager(api_url, user_type, self.pool, token_file=token_file)
+        self.cache = cache if cache is not None else default_cache()
+        self.limiter = limiter or default_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
 
-    def request(self, endpoint, method="GET", data=None, retry_auth=True):
+    def _send(self, endpoint, method="GET", data=None, retry_auth=True, headers=None,
+              retry_unsafe=False):
+        """Send an authenticated request and return (status, headers, body)."""
+        url = f"{self.api_url}{endpoint}"
+        attempt = 0
+        auth_retried = False
+        tokens = self.token_manager
+
+        while True:
+            self.limiter.acquire()
+            verifications, creations = tokens.verifications, tokens.creations
+            token = tokens.get_token()
+
+            trace = None
+            if TRACE_TARGET:
+                trace = {"attempt": attempt, "authRetry": auth_retried,
+                         "tokenVerified": tokens.verifications > verifications,
+                         "tokenCreated": tokens.creations > creations}
+            try:
+                response = send_request(url, method, data, token, self.pool, headers, trace)
+
+            except Exception as e:
+                error_msg = str(e)
+
+                # If authentication failed and retry is enabled, get new token and retry
+                if retry_auth and ("401" in error_msg or "Unauthorized" in error_msg):
+                    retry_auth = False
+                    auth_retried = True
+                    tokens.refresh_token(token)
+                    continue
+
+                if getattr(e, "status", None) == 429:
+                    self.limiter.on_throttle(retry_after_seconds(e.headers))
+                if not self.retry_policy.should_retry(method, e, attempt, retry_unsafe):
+                    raise
+                time.sleep(self.retry_policy.delay(attempt, e))
+                attempt += 1
+                continue
+
+            self.limiter.on_success()
+            self.token_manager.mark_used()
+            return response
+
+    def request(self, endpoint, method="GET", data=None, retry_auth=True, retry_unsafe=False):
         """
         Send authenticated request with automatic token refresh.
 
+        Transient failures (connection errors, 429 and 502-504) are retried
+        with backoff for idempotent methods, or for any method when
+        `retry_unsafe` is set.
+
         Args:
             endpoint: API endpoint (e.g., "/jobs")
             method: HTTP method
             data: Request body data
             retry_auth: Whether to retry with new token if auth fails
+            retry_unsafe: Whether non-idempotent requests (POST) may be retried
 
         Returns:
             dict: Response data
         """
-        url = f"{self.api_url}{endpoint}"
+        if method != "GET" and self.cache:
+            # Writes make cached reads of the same resources stale
+            self.cache.invalidate(self._cache_scope(), invalidation_prefixes(endpoint))
+
+        return self._send(endpoint, method, data, retry_auth, retry_unsafe=retry_unsafe)[2]
+
+    def _cache_scope(self):
+        import hashlib
         token = self.token_manager.get_token()
+        identity = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        return f"{self.api_url}|{identity}"
+
+    def get(self, endpoint):
+        """Send GET request (served from the response cache when enabled)."""
+        if not self.cache:
+            return self.request(endpoint, "GET")
+
+        scope = self._cache_scope()
+        entry = self.cache.lookup(scope, endpoint)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["lastModified"]:
+                headers["If-Modified-Since"] = entry["lastModified"]
+            if not headers and self.cache.is_fresh(entry):
+                return entry["data"]
+
+        status, resp_headers, result = self._send(endpoint, "GET", headers=headers)
+        if status == 304 and entry:
+            return entry["data"]
+
+        if "no-store" not in resp_headers.get("Cache-Control", ""):
+            # Re-resolve the scope: a 401 retry may have replaced the token
+            self.cache.store(self._cache_scope(), endpoint, result,
+                             resp_headers.get("ETag"), resp_headers.get("Last-Modified"))
+        return result
+
+    def get_conditional(self, endpoint, etag=None, last_modified=None):
+        """
+        Send a conditional GET with the given validators, bypassing the response cache.
+
+        Returns:
+            tuple: (status, response headers, parsed JSON); the body is None
+            for a 304 Not Modified reply
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self._send(endpoint, "GET", headers=headers)
 
+    def iter_items(self, endpoint, page_size=DEFAULT_PAGE_SIZE, limit=None, prefetch=True):
+        """
+        Lazily iterate over the items of a paged list endpoint.
+
+        Follows the server's cursor when it returns one and page numbers
+        otherwise. The next page is fetched in the background while the
+        caller consumes the current one, and iteration stops after `limit`
+        items or when the caller stops consuming.
+
+        Args:
+            endpoint: List endpoint (e.g., "/matches")
+            page_size: Items requested per page
+            limit: Maximum number of items to yield
+            prefetch: Whether to fetch the next page ahead of time
+
+        Yields:
+            dict: One item
+        """
+        from urllib.parse import urlencode
+        page_size = max(1, int(page_size))
+
+        def fetch(page, cursor):
+            params = {PAGE_SIZE_PARAM: page_size}
+            if cursor is not None:
+                params[CURSOR_PARAM] = cursor
+            else:
+                params[PAGE_PARAM] = page
+            separator = "&" if "?" in endpoint else "?"
+            return self.get(f"{endpoint}{separator}{urlencode(params)}").get("result")
+
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
         try:
-            return http_request(url, method, data, token)
+            page, yielded, previous = 1, 0, None
+            result = fetch(page, None)
+            while True:
+                items, cursor, has_more = _page_info(result, page, page_size)
+                if not items or items == previous:
+                    return  # Empty page, or the server ignored the paging parameters
 
-        except Exception as e:
-            error_msg = str(e)
+                want_more = has_more and (limit is None or yielded + len(items) < limit)
+                next_page = None
+                if want_more:
+                    page += 1
+                    next_page = executor.submit(fetch, page, cursor) if executor else None
 
-            # If authentication failed and retry is enabled, get new token and retry
-            if retry_auth and ("401" in error_msg or "Unauthorized" in error_msg):
-                self.token_manager.clear_token()
-                token = self.token_manager.get_token()
-                return http_request(url, method, data, token)
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
 
-            raise
+                if not want_more:
+                    return
+                result = next_page.result() if next_page else fetch(page, cursor)
+                previous = items
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
-    def get(self, endpoint):
-        """Send GET request."""
-        return self.request(endpoint, "GET")
+    def get_list(self, endpoint, limit=None, page_size=None):
+        """GET a list endpoint, paging through it lazily when `limit` or `page_size` is given."""
+        if limit is None and page_size is None:
+            return self.get(endpoint)
+        items = list(self.iter_items(endpoint, page_size or DEFAULT_PAGE_SIZE, limit))
+        return {"success": True, "result": items}
 
     def post(self, endpoint, data):
         """Send POST request."""
@@ -195,6 +1441,373 @@ class AuthenticatedClient:
         return self.request(endpoint, "DELETE")
 
 
+_clients = collections.OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_client(api_url=DEFAULT_API, user_type="RECRUITER", token_file=None):
+    """
+    Return the shared AuthenticatedClient for an API endpoint, user type and token file.
+
+    Reusing one client keeps its token in memory, so long-running callers
+    (batch runs, the daemon) authenticate once instead of once per action.
+    Only the CLIENT_CACHE_SIZE most recently used clients are kept, so a run
+    over thousands of token files does not hold on to every one of them.
+    """
+    key = (api_url, user_type, token_file or TOKEN_FILE)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = AuthenticatedClient(api_url, user_type, token_file=token_file)
+            while len(_clients) > CLIENT_CACHE_SIZE:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
+
+
+class MatchSummary:
+    """
+    Single-pass summary of a match list: top-k, score buckets and percentiles.
+
+    Feed matches one at a time with add() (from a list, a paged iterator or
+    an async generator) and read the compact result with result(). Only the
+    scores and the current top k matches are kept in memory.
+    """
+
+    def __init__(self, top=3, min_score=None):
+        self.top = max(0, int(top))
+        self.min_score = min_score
+        self.total = 0
+        self.filtered = 0
+        self.unscored = 0
+        self.scores = []
+        self.buckets = dict.fromkeys([name for name, _ in SCORE_BUCKETS] + ["below"], 0)
+        self._heap = []
+
+    @staticmethod
+    def score_of(match):
+        """Return a match's similarity score, or None when it carries none."""
+        for key in MATCH_SCORE_KEYS:
+            value = match.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return float(value)
+        return None
+
+    def add(self, match):
+        import heapq
+        self.total += 1
+        score = self.score_of(match) if isinstance(match, dict) else None
+        if score is None:
+            self.unscored += 1
+            return
+        if self.min_score is not None and score < self.min_score:
+            self.filtered += 1
+            return
+
+        self.scores.append(score)
+        self.buckets[next((name for name, low in SCORE_BUCKETS if score > low), "below")] += 1
+        if self.top:
+            # Ties keep the match the server listed first
+            entry = (score, -self.total, match)
+            if len(self._heap) < self.top:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    @staticmethod
+    def brief(match, score):
+        """Return the identifying fields of a match, without long texts."""
+        brief = {"score": score}
+        record = match
+        for key, value in match.items():
+            if isinstance(value, dict) and record is match:
+                record = value  # The matched job or candidate
+            elif key.endswith("Id"):
+                brief[key] = value
+        for key in MATCH_BRIEF_FIELDS:
+            if key in record and not (key == "id" and record[key] in brief.values()):
+                brief[key] = record[key]
+        return brief
+
+    def result(self):
+        scores = sorted(self.scores)
+        percentiles = None
+        if scores:
+            def at(fraction):
+                return scores[min(len(scores) - 1, int(round(fraction * (len(scores) - 1))))]
+            percentiles = {"min": scores[0], "p25": at(0.25), "p50": at(0.5), "p75": at(0.75),
+                           "p90": at(0.9), "max": scores[-1],
+                           "mean": round(sum(scores) / len(scores), 4)}
+
+        top = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return {
+            "total": self.total,
+            "counted": len(scores),
+            "filtered": self.filtered,
+            "unscored": self.unscored,
+            "buckets": self.buckets,
+            "percentiles": percentiles,
+            "top": [dict(rank=rank, **self.brief(match, score))
+                    for rank, (score, _, match) in enumerate(top, 1)],
+        }
+
+
+def summarize_matches(matches, top=3, min_score=None):
+    """
+    Summarize matches in one pass (see MatchSummary).
+
+    Args:
+        matches: Iterable of match dicts (e.g., client.iter_items("/matches"))
+        top: Number of best matches to return
+        min_score: Leave out matches scoring below this
+
+    Returns:
+        dict: total, counted, filtered, unscored, buckets, percentiles and top
+    """
+    summary = MatchSummary(top, min_score)
+    for match in matches:
+        summary.add(match)
+    return summary.result()
+
+
+def _parse_record(line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+def read_input(argv=None, stdin=None, records=False):
+    """
+    Parse a script's JSON input from the first argument or stdin.
+
+    A single JSON object (pretty-printed or not) is returned as a dict. A JSON
+    array, or an NDJSON stream of one object per line, is returned as an
+    iterator of records; NDJSON lines are read lazily as they arrive and
+    lines that fail to parse are yielded as the ValueError.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+        stdin: Text stream read when there is no argument (defaults to sys.stdin)
+        records: Return a single-line object on stdin as an NDJSON stream
+            of one record (see read_stream)
+
+    Returns:
+        dict, iterator or None: None when there is no input
+    """
+    argv = sys.argv if argv is None else argv
+    stdin = sys.stdin if stdin is None else stdin
+
+    if len(argv) > 1:
+        data = json.loads(argv[1])
+        return iter(data) if isinstance(data, list) else data
+    if stdin.isatty():
+        return None
+    return read_stream(stdin, records)
+
+
+def read_stream(stream, records=False):
+    """
+    Parse a single JSON object, a JSON array or NDJSON from a text stream (see read_input).
+
+    With `records`, a lone single-line object is an NDJSON stream of one and
+    is returned as a one-item list, so callers can still tell it apart from
+    a longer stream; a pretty-printed object is returned as a dict.
+    """
+    first = stream.readline()
+    while first and not first.strip():
+        first = stream.readline()
+    if not first:
+        return None
+    if first.lstrip().startswith("["):
+        return iter(json.loads(first + stream.read()))
+
+    record = _parse_record(first)
+    if isinstance(record, ValueError):
+        # A pretty-printed object spans several lines
+        return json.loads(first + stream.read())
+
+    second = stream.readline()
+    while second and not second.strip():
+        second = stream.readline()
+    if not second:
+        return [record] if records else record
+
+    def stream_records():
+        yield record
+        yield _parse_record(second)
+        for line in stream:
+            if line.strip():
+                yield _parse_record(line)
+
+    return stream_records()
+
+
+def run_batch(records, handler, workers=BATCH_WORKERS, out=None):
+    """
+    Run `handler` over `records` with bounded concurrency.
+
+    One NDJSON line is written per record as soon as it finishes, carrying
+    the record's `index` and its `correlationId` when it has one, followed
+    by a summary line. A failing record never aborts the batch. A record's
+    `fields` and `truncate` options prune its line (see shape_output).
+
+    Args:
+        records: Iterable of input dicts
+        handler: Callable taking one record and returning a result dict
+        workers: Maximum number of records processed at once
+        out: Text stream for the NDJSON output (defaults to stdout)
+
+    Returns:
+        dict: Summary with total, succeeded, failed and elapsedMs
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    out = out or sys.stdout
+    workers = max(1, int(workers))
+    started = time.time()
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+    lock = threading.Lock()
+    # Bound the records read ahead so long streams are not buffered in memory
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def process(index, record):
+        correlation_id = record.get("correlationId") if isinstance(record, dict) else None
+        try:
+            if isinstance(record, Exception):
+                raise Exception(f"Invalid JSON: {record}")
+            if not isinstance(record, dict):
+                raise Exception("Batch items must be JSON objects")
+            record = dict(record)
+            options = pop_output_options(record)
+            result = handler(record)
+            if "result" in result and (options.get("fields") or options.get("truncate")):
+                result = dict(result, result=shape_output(result["result"], options.get("fields"),
+                                                          options.get("truncate")))
+            line = {"index": index, **result}
+        except Exception as e:
+            line = {"index": index, "success": False, "error": str(e)}
+        if correlation_id is not None:
+            line["correlationId"] = correlation_id
+
+        with lock:
+            summary["total"] += 1
+            summary["succeeded" if line.get("success", True) else "failed"] += 1
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+
+    def release(_):
+        slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index, record in enumerate(records):
+            slots.acquire()
+            executor.submit(process, index, record).add_done_callback(release)
+
+    summary["elapsedMs"] = round((time.time() - started) * 1000)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+    return summary
+
+
+def pop_output_options(data):
+    """Remove the output options (fields, compact, truncate) from a script's input and return them."""
+    return {key: data.pop(key) for key in OUTPUT_OPTIONS if key in data}
+
+
+def _field_tree(fields):
+    """Turn dotted paths into a nested dict; None marks a value that is kept whole."""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    tree = {}
+    for path in fields:
+        parts = [part for part in path.strip().split(".") if part]
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                break
+            node = child
+        else:
+            if parts:
+                node[parts[-1]] = None
+    return tree
+
+
+def _merge_trees(a, b):
+    if a is None or b is None:
+        return None
+    merged = dict(a)
+    for key, sub in b.items():
+        merged[key] = _merge_trees(merged[key], sub) if key in merged else sub
+    return merged
+
+
+def _project(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    projected = {}
+    for key, item in value.items():
+        subtrees = [tree[k] for k in (key, "*") if k in tree]
+        if subtrees:
+            sub = subtrees[0] if len(subtrees) == 1 else _merge_trees(*subtrees)
+            projected[key] = _project(item, sub)
+    return projected
+
+
+def _truncate(value, limit):
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}… (+{len(value) - limit} chars)"
+    if isinstance(value, list):
+        return [_truncate(item, limit) for item in value]
+    if isinstance(value, dict):
+        return {key: _truncate(item, limit) for key, item in value.items()}
+    return value
+
+
+def shape_output(value, fields=None, truncate=None):
+    """
+    Prune a result before it is printed.
+
+    Args:
+        value: Value to prune (a script's "result", or one streamed record)
+        fields: Dotted paths to keep, as a list or comma-separated string
+            (e.g., "matches.score,matches.job.title"); lists are projected
+            item by item and "*" matches any key
+        truncate: Cut strings longer than this many characters
+
+    Returns:
+        The pruned copy (the value itself when there is nothing to do)
+    """
+    if fields:
+        value = _project(value, _field_tree(fields))
+    if truncate:
+        value = _truncate(value, max(1, int(truncate)))
+    return value
+
+
+def render_output(response, fields=None, compact=False, truncate=None):
+    """
+    Serialize a script's response for printing.
+
+    `fields` and `truncate` apply to its "result" (see shape_output); the
+    envelope (success, error, token, ...) is always printed. `compact`
+    prints one line without indentation instead of indented JSON.
+
+    Returns:
+        str: JSON text
+    """
+    if isinstance(response, dict) and "result" in response and (fields or truncate):
+        response = dict(response, result=shape_output(response["result"], fields, truncate))
+    if compact:
+        return json.dumps(response, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(response, ensure_ascii=False, indent=2)
+
+
 def format_response(data, include_token=False):
     """
     Format response data for output.
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Asyncio counterparts of the shared API client.
+
+AsyncAuthenticatedClient mirrors AuthenticatedClient on stdlib asyncio
+streams: pooled keep-alive connections, the same token file, 401 token
+refresh, retries with backoff, client-side rate limiting and the
+optional response cache. Use it from code that already runs an event
+loop; the scripts' command lines keep using the synchronous client.
+"""
+import io
+import time
+import gzip
+import asyncio
+import hashlib
+import weakref
+import functools
+import collections
+import contextlib
+import http.client
+from urllib.parse import urljoin, urlencode
+
+from base import (
+    DEFAULT_API, DEFAULT_TIMEOUT, DEFAULT_PAGE_SIZE, PAGE_PARAM, PAGE_SIZE_PARAM,
+    CURSOR_PARAM, REDIRECT_CODES, TOKEN_FILE, CLIENT_CACHE_SIZE, IDEMPOTENT_METHODS,
+    ConnectionPool, TokenManager, APIError, FileLock, TOKEN_TOUCH_INTERVAL, RetryPolicy,
+    default_pool, default_limiter, default_cache, read_token_file, retry_after_seconds,
+    invalidation_prefixes, _build_request, _parse_response, _page_info, _proxy_route
+)
+
+
+async def _blocking(fn, *args):
+    """Run file or database I/O in the default executor, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+
+
+# Per event loop: path -> asyncio.Lock queueing that loop's tasks for the file lock
+_file_locks = weakref.WeakKeyDictionary()
+
+
+@contextlib.asynccontextmanager
+async def file_lock(path):
+    """
+    Hold FileLock(path) across awaits.
+
+    Tasks of one event loop queue on an asyncio.Lock, and the file lock
+    itself is polled without blocking, so waiting for it ties up neither
+    the event loop nor an executor thread.
+    """
+    locks = _file_locks.setdefault(asyncio.get_running_loop(), {})
+    async with locks.setdefault(path, asyncio.Lock()):
+        lock = FileLock(path)
+        delay = 0.005
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            lock.release()
+
+
+class AsyncConnectionPool:
+    """
+    Keeps persistent HTTP/1.1 stream connections per host.
+
+    At most `max_per_host` requests per host are in flight at once (default:
+    max_idle_per_host); further requests wait for a free slot instead of
+    opening more sockets. Proxies are used like ConnectionPool does.
+    """
+
+    def __init__(self, max_idle_per_host=16, timeout=DEFAULT_TIMEOUT, max_per_host=None):
+        self.max_idle_per_host = max_idle_per_host
+        self.max_per_host = max_per_host or max_idle_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._slots = {}
+
+    # Hosts that accept gzip request bodies are tracked by the shared sync pool
+    def accepts_gzip(self, url):
+        return default_pool.accepts_gzip(url)
+
+    def set_accepts_gzip(self, url, accepted):
+        default_pool.set_accepts_gzip(url, accepted)
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        ssl_context = default_pool.ssl_context() if scheme == "https" else None
+        route = _proxy_route(scheme, host)
+        if route is None:
+            return await asyncio.wait_for(asyncio.open_connection(
+                host, port, ssl=ssl_context, server_hostname=host if ssl_context else None
+            ), self.timeout)
+
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(route[0], route[1]), self.timeout)
+        if ssl_context is None:
+            return reader, writer
+        try:
+            if not hasattr(writer, "start_tls"):
+                raise APIError("HTTPS through a proxy needs Python 3.11 or newer in the asyncio client")
+            await asyncio.wait_for(self._tunnel(reader, writer, host, port, route[2]), self.timeout)
+            await asyncio.wait_for(writer.start_tls(ssl_context, server_hostname=host), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    @staticmethod
+    async def _tunnel(reader, writer, host, port, proxy_headers):
+        """Ask the proxy on this stream for a CONNECT tunnel to host:port."""
+        target = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+        lines = [f"CONNECT {target} HTTP/1.1", f"Host: {target}"]
+        lines += [f"{name}: {value}" for name, value in proxy_headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        status = status_line.split(None, 2)
+        if len(status) < 2 or status[1] != b"200":
+            raise ConnectionRefusedError(f"Proxy refused the tunnel: {status_line.decode('latin-1').strip()}")
+
+    def _slot(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    async def _acquire(self, key):
+        """Return (reader, writer, reused) - an idle connection if one is available."""
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await self._connect(key)
+        return reader, writer, False
+
+    def _release(self, key, reader, writer):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_idle_per_host:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def request(self, method, url, body=None, headers=None):
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: Full URL to request
+            body: Request body bytes
+            headers: Request headers
+
+        Returns:
+            tuple: (status, response headers, response body bytes)
+        """
+        key, parts = ConnectionPool._key(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        default_port = 443 if key[0] == "https" else 80
+        host = key[1] if key[2] == default_port else f"{key[1]}:{key[2]}"
+        route = _proxy_route(key[0], key[1]) if key[0] == "http" else None
+        if route:
+            # A forward proxy takes the absolute URI, and its credentials with every request
+            path = f"http://{parts.netloc.rpartition('@')[2]}{path}"
+            headers = {**(headers or {}), **route[2]}
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body or b'')}")
+        message = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        async with self._slot(key):
+            while True:
+                reader, writer, reused = await self._acquire(key)
+                sent = False
+                try:
+                    writer.write(message)
+                    await asyncio.wait_for(writer.drain(), self.timeout)
+                    sent = True
+                    status, resp_headers, payload, will_close = await asyncio.wait_for(
+                        self._read_response(reader, method), self.timeout
+                    )
+                except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError,
+                        http.client.RemoteDisconnected):
+                    writer.close()
+                    # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    # Once the whole request went out the server may have acted on it,
+                    # so then only an idempotent one is sent again
+                    if reused and (idempotent or not sent):
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+
+                if will_close:
+                    writer.close()
+                else:
+                    self._release(key, reader, writer)
+                break
+
+            # Servers may advertise the request encodings they accept (RFC 7694)
+            if "gzip" in (resp_headers.get("Accept-Encoding") or "").lower():
+                self.set_accepts_gzip(url, True)
+            return status, resp_headers, payload
+
+    @staticmethod
+    async def _read_response(reader, method):
+        """Read one response and return (status, headers, body, will_close)."""
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise http.client.RemoteDisconnected("Remote end closed connection without response")
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+
+            header_lines = []
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise asyncio.IncompleteReadError(b"".join(header_lines), None)
+                header_lines.append(line)
+                if line in (b"\r\n", b"\n"):
+                    break
+            headers = http.client.parse_headers(io.BytesIO(b"".join(header_lines)))
+
+            # Skip interim responses (e.g., 100 Continue)
+            if status >= 200 or status == 101:
+                break
+
+        will_close = version == "HTTP/1.0" or "close" in (headers.get("Connection") or "").lower()
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            return status, headers, b"", will_close
+
+        if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Discard trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return status, headers, b"".join(chunks), will_close
+
+        length = headers.get("Content-Length")
+        if length is not None:
+            return status, headers, await reader.readexactly(int(length)), will_close
+        return status, headers, await reader.read(), True
+
+    async def close(self):
+        """Close all idle connections."""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+
+async def send_request(url, method="GET", data=None, token=None, pool=None, headers=None):
+    """
+    Send HTTP request and return the status, headers and parsed JSON body.
+
+    Args:
+        url: Full URL to request
+        method: HTTP method (GET, POST, PUT, DELETE)
+        data: Request body data (will be JSON encoded)
+        token: Optional authentication token
+        pool: AsyncConnectionPool to send through (a one-off pool if omitted)
+        headers: Extra request headers (e.g., conditional-GET validators)
+
+    Returns:
+        tuple: (status, response headers, parsed JSON); the body is None
+        for a 304 Not Modified reply
+
+    Raises:
+        APIError: If request fails
+    """
+    if pool is None:
+        pool = AsyncConnectionPool()
+        try:
+            return await send_request(url, method, data, token, pool, headers)
+        finally:
+            await pool.close()
+
+    body, request_headers = _build_request(url, data, token, pool, headers)
+    compressed = "Content-Encoding" in request_headers
+
+    try:
+        for _ in range(5):
+            status, resp_headers, raw = await pool.request(method, url, body, request_headers)
+            if status == 415 and compressed:
+                # The server refused the compressed body; resend it as-is
+                pool.set_accepts_gzip(url, False)
+                compressed = False
+                body = gzip.decompress(body)
+                del request_headers["Content-Encoding"]
+                continue
+            location = resp_headers.get("Location")
+            if status not in REDIRECT_CODES or not location:
+                break
+            # Follow redirects the way urllib does: 307/308 keep the method and body
+            url = urljoin(url, location)
+            if status not in (307, 308) and method not in ("GET", "HEAD"):
+                method, body = "GET", None
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+            http.client.HTTPException, ValueError) as e:
+        raise APIError(f"Connection error: {e}")
+
+    return _parse_response(status, resp_headers, raw)
+
+
+class AsyncTokenManager(TokenManager):
+    """TokenManager whose network calls run on the event loop."""
+
+    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER", pool=None,
+                 trust_ttl=None, token_file=None):
+        super().__init__(api_url, user_type, default_pool, trust_ttl, token_file)
+        self.async_pool = pool
+        self._async_lock = asyncio.Lock()
+
+    async def get_token_async(self):
+        """Get valid token (from cache, file, or create new)."""
+        if self._token:
+            return self._token
+
+        # Tasks sharing this manager wait for one of them to load or create it
+        async with self._async_lock:
+            if not self._token:
+                self._token = await self._load_or_create_token_async()
+            return self._token
+
+    async def _load_or_create_token_async(self):
+        meta = await _blocking(read_token_file, self.token_file)
+        if meta and not self._is_expired(meta):
+            # Trust a recently verified token; otherwise verify it now
+            if self._is_fresh(meta):
+                self._meta = meta
+                return meta["token"]
+            if await self._verify_token_async(meta["token"]):
+                meta["verifiedAt"] = time.time()
+                await _blocking(self._touch, meta)
+                self._meta = meta
+                return meta["token"]
+
+        return await self._mint_async(meta["token"] if meta else None)
+
+    async def _mint_async(self, rejected):
+        """Asyncio counterpart of TokenManager._mint()."""
+        # Waiting for the file lock, minting and releasing the lock all happen
+        # in one worker thread: a cancelled caller can never leave it held
+        return await _blocking(self._mint, rejected)
+
+    async def mark_used_async(self):
+        """Asyncio counterpart of TokenManager.mark_used(); the token file is written off the loop."""
+        meta = self._meta
+        if not meta or meta.get("token") != self._token:
+            return
+        now = time.time()
+        if now - (meta.get("verifiedAt") or 0) >= TOKEN_TOUCH_INTERVAL:
+            meta["verifiedAt"] = now
+            await _blocking(self._touch, meta)
+
+    async def refresh_token_async(self, stale_token):
+        """Asyncio counterpart of TokenManager.refresh_token()."""
+        async with self._async_lock:
+            if self._token and self._token != stale_token:
+                return self._token
+            self._token = None
+            self._meta = None
+            self._token = await self._mint_async(stale_token)
+            return self._token
+
+    async def _verify_token_async(self, token):
+        self.verifications += 1
+        try:
+            result = (await send_request(
+                f"{self.api_url}/auth/verify", "GET", token=token, pool=self.async_pool
+            ))[2]
+            return result.get("result", {}).get("valid", False)
+        except Exception:
+            return False
+
+
+class AsyncAuthenticatedClient:
+    """Asyncio HTTP client with automatic token management."""
+
+    def __init__(self, api_url=DEFAULT_API, user_type="RECRUITER", pool=None,
+                 token_file=None, cache=None, limiter=None, retry_policy=None):
+        self.api_url = api_url
+        self.pool = pool or AsyncConnectionPool()
+        self.token_manager = AsyncTokenManager(api_url, user_type, self.pool, token_file=token_file)
+        self.cache = cache if cache is not None else default_cache()
+        self.limiter = limiter or default_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _limit(self, name, *args):
+        # A limiter shared through a state file reads and rewrites it on every call
+        fn = getattr(self.limiter, name)
+        if getattr(self.limiter, "state_file", None):
+            return await _blocking(fn, *args)
+        return fn(*args)
+
+    async def _send(self, endpoint, method="GET", data=None, retry_auth=True, headers=None,
+                    retry_unsafe=False):
+        """Send an authenticated request and return (status, headers, body)."""
+        url = f"{self.api_url}{endpoint}"
+        attempt = 0
+
+        while True:
+            wait = await self._limit("try_acquire")
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            token = await self.token_manager.get_token_async()
+
+            try:
+                response = await send_request(url, method, data, token, self.pool, headers)
+
+            except Exception as e:
+                error_msg = str(e)
+
+                # If authentication failed and retry is enabled, get new token and retry
+                if retry_auth and ("401" in error_msg or "Unauthorized" in error_msg):
+                    retry_auth = False
+                    await self.token_manager.refresh_token_async(token)
+                    continue
+
+                if getattr(e, "status", None) == 429:
+                    await self._limit("on_throttle", retry_after_seconds(e.headers))
+                if not self.retry_policy.should_retry(method, e, attempt, retry_unsafe):
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt, e))
+                attempt += 1
+                continue
+
+            await self._limit("on_success")
+            await self.token_manager.mark_used_async()
+            return response
+
+    async def request(self, endpoint, method="GET", data=None, retry_auth=True, retry_unsafe=False):
+        """
+        Send authenticated request with automatic token refresh.
+
+        Args:
+            endpoint: API endpoint (e.g., "/jobs")
+            method: HTTP method
+            data: Request body data
+            retry_auth: Whether to retry with new token if auth fails
+            retry_unsafe: Whether non-idempotent requests (POST) may be retried
+
+        Returns:
+            dict: Response data
+        """
+        if method != "GET" and self.cache:
+            # Writes make cached reads of the same resources stale
+            await _blocking(self.cache.invalidate, await self._cache_scope(), invalidation_prefixes(endpoint))
+
+        return (await self._send(endpoint, method, data, retry_auth, retry_unsafe=retry_unsafe))[2]
+
+    async def _cache_scope(self):
+        token = await self.token_manager.get_token_async()
+        identity = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        return f"{self.api_url}|{identity}"
+
+    async def get(self, endpoint):
+        """Send GET request (served from the response cache when enabled)."""
+        if not self.cache:
+            return await self.request(endpoint, "GET")
+
+        scope = await self._cache_scope()
+        entry = await _blocking(self.cache.lookup, scope, endpoint)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["lastModified"]:
+                headers["If-Modified-Since"] = entry["lastModified"]
+            if not headers and self.cache.is_fresh(entry):
+                return entry["data"]
+
+        status, resp_headers, result = await self._send(endpoint, "GET", headers=headers)
+        if status == 304 and entry:
+            return entry["data"]
+
+        if "no-store" not in resp_headers.get("Cache-Control", ""):
+            # Re-resolve the scope: a 401 retry may have replaced the token
+            await _blocking(self.cache.store, await self._cache_scope(), endpoint, result,
+                            resp_headers.get("ETag"), resp_headers.get("Last-Modified"))
+        return result
+
+    async def iter_items(self, endpoint, page_size=DEFAULT_PAGE_SIZE, limit=None, prefetch=True):
+        """
+        Lazily iterate over the items of a paged list endpoint.
+
+        Same paging rules as AuthenticatedClient.iter_items; the next page
+        is fetched in a task while the caller consumes the current one.
+
+        Args:
+            endpoint: List endpoint (e.g., "/matches")
+            page_size: Items requested per page
+            limit: Maximum number of items to yield
+            prefetch: Whether to fetch the next page ahead of time
+
+        Yields:
+            dict: One item
+        """
+        page_size = max(1, int(page_size))
+
+        async def fetch(page, cursor):
+            params = {PAGE_SIZE_PARAM: page_size}
+            if cursor is not None:
+                params[CURSOR_PARAM] = cursor
+            else:
+                params[PAGE_PARAM] = page
+            separator = "&" if "?" in endpoint else "?"
+            return (await self.get(f"{endpoint}{separator}{urlencode(params)}")).get("result")
+
+        next_page = None
+        try:
+            page, yielded, previous = 1, 0, None
+            result = await fetch(page, None)
+            while True:
+                items, cursor, has_more = _page_info(result, page, page_size)
+                if not items or items == previous:
+                    return  # Empty page, or the server ignored the paging parameters
+
+                want_more = has_more and (limit is None or yielded + len(items) < limit)
+                if want_more:
+                    page += 1
+                    next_page = asyncio.ensure_future(fetch(page, cursor)) if prefetch else None
+
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+
+                if not want_more:
+                    return
+                result = await next_page if next_page else await fetch(page, cursor)
+                next_page, previous = None, items
+        finally:
+            if next_page and not next_page.done():
+                next_page.cancel()
+
+    async def get_list(self, endpoint, limit=None, page_size=None):
+        """GET a list endpoint, paging through it lazily when `limit` or `page_size` is given."""
+        if limit is None and page_size is None:
+            return await self.get(endpoint)
+        items = [item async for item in self.iter_items(endpoint, page_size or DEFAULT_PAGE_SIZE, limit)]
+        return {"success": True, "result": items}
+
+    async def post(self, endpoint, data):
+        """Send POST request."""
+        return await self.request(endpoint, "POST", data)
+
+    async def put(self, endpoint, data):
+        """Send PUT request."""
+        return await self.request(endpoint, "PUT", data)
+
+    async def delete(self, endpoint):
+        """Send DELETE request."""
+        return await self.request(endpoint, "DELETE")
+
+    async def close(self):
+        """Close the client's pooled connections."""
+        await self.pool.close()
+
+
+_clients = collections.OrderedDict()
+
+
+def get_async_client(api_url=DEFAULT_API, user_type="RECRUITER", token_file=None):
+    """
+    Return the shared AsyncAuthenticatedClient for the running event loop.
+
+    Stream connections belong to the loop that opened them, so clients are
+    shared per loop as well as per API endpoint, user type and token file.
+    Beyond CLIENT_CACHE_SIZE clients the least recently used is dropped and
+    its idle connections are closed.
+    """
+    loop = asyncio.get_running_loop()
+    for stale in [key for key in _clients if key[0] is not loop and key[0].is_closed()]:
+        del _clients[stale]
+
+    key = (loop, api_url, user_type, token_file or TOKEN_FILE)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = AsyncAuthenticatedClient(api_url, user_type, token_file=token_file)
+        while len(_clients) > CLIENT_CACHE_SIZE:
+            (owner, *_), evicted = _clients.popitem(last=False)
+            if owner is loop:
+                loop.create_task(evicted.close())
+    else:
+        _clients.move_to_end(key)
+    return client
@@ -5,33 +5,56 @@ View your published jobs and matched candidates.
 """
 import sys
 import json
-from base import AuthenticatedClient, DEFAULT_API
+import time
+from base import get_client, pop_output_options, shape_output, render_output, MatchSummary, DEFAULT_API
+from daemon import forward
+import snapshot
+
+# Default number of concurrent requests when fetching matches for many jobs
+DEFAULT_WORKERS = 8
 
 
 def get_jobs(api_url):
     """Get all published jobs by this recruiter."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    client = get_client(api_url, "RECRUITER")
     result = client.get("/jobs/my-jobs")
     return result
 
 
 def get_job_detail(api_url, job_id):
     """Get details of a specific job."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    client = get_client(api_url, "RECRUITER")
     result = client.get(f"/jobs/{job_id}")
     return result
 
 
-def get_job_matches(api_url, job_id):
-    """Get matched candidates for a specific job."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
-    result = client.get(f"/matches/job/{job_id}")
+def get_job_matches(api_url, job_id, limit=None, page_size=None):
+    """Get matched candidates for a specific job (paged lazily when limit or page_size is given)."""
+    client = get_client(api_url, "RECRUITER")
+    result = client.get_list(f"/matches/job/{job_id}", limit, page_size)
     return result
 
 
-def get_all_matches(api_url):
-    """Get all matches across all jobs."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+def _fetch_job_matches(client, job):
+    """Fetch matches for one job, capturing failures in the record."""
+    job_id = job.get("id")
+    try:
+        matches_result = client.get(f"/matches/job/{job_id}")
+        return {
+            "job": job,
+            "matches": matches_result.get("result", [])
+        }
+    except Exception as e:
+        return {
+            "job": job,
+            "matches": [],
+            "error": str(e)
+        }
+
+
+def get_all_matches(api_url, workers=DEFAULT_WORKERS):
+    """Get all matches across all jobs, fetching up to `workers` jobs at a time."""
+    client = get_client(api_url, "RECRUITER")
 
     # First get all jobs
     jobs_result = client.get("/jobs/my-jobs")
@@ -41,22 +64,12 @@ def get_all_matches(api_url):
 
     jobs = jobs_result.get("result", [])
 
-    # Get matches for each job
-    all_matches = {}
-    for job in jobs:
-        job_id = job.get("id")
-        try:
-            matches_result = client.get(f"/matches/job/{job_id}")
-            all_matches[job_id] = {
-                "job": job,
-                "matches": matches_result.get("result", [])
-            }
-        except Exception as e:
-            all_matches[job_id] = {
-                "job": job,
-                "matches": [],
-                "error": str(e)
-            }
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Get matches for each job; map() keeps the records in job order
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+        records = executor.map(lambda job: _fetch_job_matches(client, job), jobs)
+        all_matches = {job.get("id"): record for job, record in zip(jobs, records)}
 
     return {
         "success": True,
@@ -64,14 +77,183 @@ def get_all_matches(api_url):
     }
 
 
-def get_full_info(api_url, job_id=None):
-    """Get complete information: jobs + matches."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+def iter_all_matches(api_url, workers=DEFAULT_WORKERS):
+    """
+    Yield one {"jobId", "job", "matches"[, "error"]} record per job as soon
+    as its matches arrive, so callers never hold every job's matches at once.
+    """
+    client = get_client(api_url, "RECRUITER")
+
+    jobs_result = client.get("/jobs/my-jobs")
+    if not jobs_result.get("success"):
+        raise Exception(jobs_result.get("error", "Failed to list jobs"))
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    executor = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+    try:
+        pending = {
+            executor.submit(_fetch_job_matches, client, job)
+            for job in jobs_result.get("result", [])
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                yield {"jobId": record["job"].get("id"), **record}
+    finally:
+        # Stop fetching if the consumer goes away early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def stream_all_matches(api_url, workers=DEFAULT_WORKERS, out=None, fields=None, truncate=None):
+    """
+    Write one compact NDJSON record per job as it completes, then a summary line.
+
+    `fields` and `truncate` prune each record (see base.shape_output).
+
+    Returns:
+        dict: Summary with jobs, failed and elapsedMs
+    """
+    out = out or sys.stdout
+    started = time.time()
+    summary = {"jobs": 0, "failed": 0}
+
+    for record in iter_all_matches(api_url, workers):
+        summary["jobs"] += 1
+        if "error" in record:
+            summary["failed"] += 1
+        out.write(json.dumps(shape_output(record, fields, truncate), ensure_ascii=False) + "\n")
+        out.flush()
 
+    summary["elapsedMs"] = round((time.time() - started) * 1000)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+    return summary
+
+
+class CandidateIndex:
+    """
+    Cross-job match results with each candidate stored once.
+
+    Built from per-job match records (see iter_all_matches), it keeps a
+    candidate table keyed by candidate id, an index from each candidate to
+    the jobs they match and one from each job to its candidates, both with
+    scores. Memory and output grow with the unique candidates rather than
+    with the job x candidate pairs.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.candidates = {}
+        self.by_candidate = {}
+        self.by_job = {}
+        self.errors = {}
+        self.pairs = 0
+
+    @staticmethod
+    def candidate_of(match):
+        """Return (candidate id, candidate payload) of a match."""
+        payload = match.get("jobSeeker") or match.get("candidate")
+        if not isinstance(payload, dict):
+            payload = {k: v for k, v in match.items() if k not in ("score", "jobId")}
+        candidate_id = (match.get("jobSeekerId") or match.get("candidateId") or payload.get("id"))
+        return candidate_id, payload
+
+    def add(self, record):
+        """Add one {"jobId", "job", "matches"[, "error"]} record."""
+        job_id = record.get("jobId")
+        self.jobs[job_id] = record.get("job")
+        if "error" in record:
+            self.errors[job_id] = record["error"]
+        entries = self.by_job.setdefault(job_id, [])
+        for match in record.get("matches") or []:
+            candidate_id, payload = self.candidate_of(match)
+            if candidate_id is None:
+                continue
+            score = MatchSummary.score_of(match)
+            self.candidates.setdefault(candidate_id, payload)
+            self.by_candidate.setdefault(candidate_id, []).append({"jobId": job_id, "score": score})
+            entries.append({"candidateId": candidate_id, "score": score})
+            self.pairs += 1
+
+    def result(self, min_jobs=None, best_job=False):
+        """
+        Return the index, optionally narrowed to candidates matching at least `min_jobs` jobs.
+
+        Each candidate's jobs and each job's candidates are ordered best
+        score first; `best_job` adds a candidate -> best job map.
+        """
+        def by_score(entry):
+            return entry["score"] if entry["score"] is not None else float("-inf")
+
+        keep = {cid for cid, jobs in self.by_candidate.items() if len(jobs) >= (min_jobs or 1)}
+        by_candidate = {cid: sorted(jobs, key=by_score, reverse=True)
+                        for cid, jobs in self.by_candidate.items() if cid in keep}
+        index = {
+            "jobs": self.jobs,
+            "candidates": {cid: payload for cid, payload in self.candidates.items() if cid in keep},
+            "byCandidate": by_candidate,
+            "byJob": {job_id: sorted((e for e in entries if e["candidateId"] in keep),
+                                     key=by_score, reverse=True)
+                      for job_id, entries in self.by_job.items()},
+            "summary": {"jobs": len(self.jobs), "pairs": self.pairs,
+                        "uniqueCandidates": len(self.candidates), "listed": len(keep),
+                        "failed": len(self.errors)},
+        }
+        if best_job:
+            index["bestJob"] = {cid: jobs[0] for cid, jobs in by_candidate.items()}
+        if self.errors:
+            index["errors"] = self.errors
+        return index
+
+
+def get_candidate_index(api_url, workers=DEFAULT_WORKERS, min_jobs=None, best_job=False):
+    """Get all matches across all jobs as a deduplicated candidate index (see CandidateIndex)."""
+    index = CandidateIndex()
+    for record in iter_all_matches(api_url, workers):
+        index.add(record)
+    return {"success": True, "result": index.result(min_jobs, best_job)}
+
+
+def sync_snapshot(api_url, force=False, workers=DEFAULT_WORKERS):
+    """Refresh the local snapshot of jobs and matches, fetching only what probably changed."""
+    return snapshot.sync_snapshot(get_client(api_url, "RECRUITER"), force, workers)
+
+
+def diff_snapshot(api_url, since=None, sync=False, force=False, workers=DEFAULT_WORKERS):
+    """Report new, removed and re-scored matches found by the last sync (or since sync `since`)."""
+    return snapshot.diff_snapshot(get_client(api_url, "RECRUITER"), since, sync, force, workers)
+
+
+def watch_matches(api_url, job_id=None, interval=snapshot.WATCH_INTERVAL,
+                  min_interval=snapshot.WATCH_MIN_INTERVAL, max_interval=snapshot.WATCH_MAX_INTERVAL,
+                  duration=None, fields=None, truncate=None):
+    """
+    Poll the matches of every job (or only job_id) until interrupted,
+    writing each change as an NDJSON line (see snapshot.Snapshot.watch) and
+    a summary line at the end.
+
+    `fields` and `truncate` prune each event (see base.shape_output).
+    """
+    shape = (lambda event: shape_output(event, fields, truncate)) if fields or truncate else None
+    return snapshot.watch_snapshot(get_client(api_url, "RECRUITER"), None, interval, min_interval,
+                                   max_interval, job_id, duration, shape)
+
+
+def get_full_info(api_url, job_id=None, workers=DEFAULT_WORKERS):
+    """Get complete information: jobs + matches."""
     if job_id:
+        from concurrent.futures import ThreadPoolExecutor
+        client = get_client(api_url, "RECRUITER")
+        # Resolve the token once so both requests can go out together
+        client.token_manager.get_token()
+
         # Get specific job and its matches
-        job_result = client.get(f"/jobs/{job_id}")
-        matches_result = client.get(f"/matches/job/{job_id}")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            job_future = executor.submit(client.get, f"/jobs/{job_id}")
+            matches_future = executor.submit(client.get, f"/matches/job/{job_id}")
+            job_result = job_future.result()
+            matches_result = matches_future.result()
 
         return {
             "success": True,
@@ -82,7 +264,7 @@ def get_full_info(api_url, job_id=None):
         }
     else:
         # Get all jobs and all matches
-        return get_all_matches(api_url)
+        return get_all_matches(api_url, workers)
 
 
 # Action handlers
@@ -92,9 +274,176 @@ ACTIONS = {
     "matches": get_job_matches,
     "all-matches": get_all_matches,
     "full": get_full_info,
+    "sync": sync_snapshot,
+    "diff": diff_snapshot,
 }
 
 
+def run(data):
+    """Execute the action described by `data` (the script's JSON input)."""
+    # Extract parameters
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "full")
+    job_id = data.get("jobId")
+    workers = data.get("workers", DEFAULT_WORKERS)
+
+    # Execute action
+    fn = ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ACTIONS)}")
+
+    # Call function with appropriate parameters
+    if action in ("all-matches", "full") and not job_id and data.get("output") == "candidates":
+        return get_candidate_index(api_url, workers, data.get("minJobs"), data.get("bestJob", False))
+    if action in ["job", "matches"]:
+        if not job_id:
+            raise Exception(f"Action '{action}' requires jobId parameter")
+        if action == "matches":
+            return fn(api_url, job_id, data.get("limit"), data.get("pageSize"))
+        return fn(api_url, job_id)
+    elif action == "all-matches":
+        return fn(api_url, workers)
+    elif action == "full":
+        return fn(api_url, job_id, workers)
+    elif action == "sync":
+        return fn(api_url, data.get("force", False), workers)
+    elif action == "diff":
+        return fn(api_url, data.get("since"), data.get("sync", False), data.get("force", False), workers)
+    else:
+        return fn(api_url)
+
+
+def _async_client(api_url):
+    # Imported on demand so the command line does not load asyncio
+    from base_async import get_async_client
+    return get_async_client(api_url, "RECRUITER")
+
+
+async def get_jobs_async(api_url):
+    """Get all published jobs by this recruiter (asyncio)."""
+    return await _async_client(api_url).get("/jobs/my-jobs")
+
+
+async def get_job_detail_async(api_url, job_id):
+    """Get details of a specific job (asyncio)."""
+    return await _async_client(api_url).get(f"/jobs/{job_id}")
+
+
+async def get_job_matches_async(api_url, job_id, limit=None, page_size=None):
+    """Get matched candidates for a specific job (asyncio; paged lazily when limit or page_size is given)."""
+    return await _async_client(api_url).get_list(f"/matches/job/{job_id}", limit, page_size)
+
+
+async def _fetch_job_matches_async(client, job, semaphore):
+    """Fetch matches for one job, capturing failures in the record."""
+    async with semaphore:
+        try:
+            matches_result = await client.get(f"/matches/job/{job.get('id')}")
+            return {"job": job, "matches": matches_result.get("result", [])}
+        except Exception as e:
+            return {"job": job, "matches": [], "error": str(e)}
+
+
+async def get_all_matches_async(api_url, workers=DEFAULT_WORKERS):
+    """Get all matches across all jobs, fetching up to `workers` jobs at a time (asyncio)."""
+    import asyncio
+    client = _async_client(api_url)
+
+    jobs_result = await client.get("/jobs/my-jobs")
+    if not jobs_result.get("success"):
+        return jobs_result
+
+    jobs = jobs_result.get("result", [])
+    semaphore = asyncio.Semaphore(max(1, int(workers)))
+    # gather() keeps the records in job order
+    records = await asyncio.gather(*(_fetch_job_matches_async(client, job, semaphore) for job in jobs))
+
+    return {
+        "success": True,
+        "result": {job.get("id"): record for job, record in zip(jobs, records)}
+    }
+
+
+async def get_candidate_index_async(api_url, workers=DEFAULT_WORKERS, min_jobs=None, best_job=False):
+    """Get all matches across all jobs as a deduplicated candidate index (asyncio)."""
+    import asyncio
+    client = _async_client(api_url)
+
+    jobs_result = await client.get("/jobs/my-jobs")
+    if not jobs_result.get("success"):
+        return jobs_result
+
+    semaphore = asyncio.Semaphore(max(1, int(workers)))
+    index = CandidateIndex()
+    tasks = [asyncio.ensure_future(_fetch_job_matches_async(client, job, semaphore))
+             for job in jobs_result.get("result", [])]
+    # Index each job's matches as they arrive instead of holding them all
+    for task in asyncio.as_completed(tasks):
+        record = await task
+        index.add({"jobId": record["job"].get("id"), **record})
+    return {"success": True, "result": index.result(min_jobs, best_job)}
+
+
+async def get_full_info_async(api_url, job_id=None, workers=DEFAULT_WORKERS):
+    """Get complete information: jobs + matches (asyncio)."""
+    import asyncio
+    if not job_id:
+        return await get_all_matches_async(api_url, workers)
+
+    client = _async_client(api_url)
+    # Resolve the token once so both requests can go out together
+    await client.token_manager.get_token_async()
+
+    job_result, matches_result = await asyncio.gather(
+        client.get(f"/jobs/{job_id}"), client.get(f"/matches/job/{job_id}")
+    )
+
+    return {
+        "success": True,
+        "result": {
+            "job": job_result.get("result"),
+            "matches": matches_result.get("result")
+        }
+    }
+
+
+ASYNC_ACTIONS = {
+    "jobs": get_jobs_async,
+    "job": get_job_detail_async,
+    "matches": get_job_matches_async,
+    "all-matches": get_all_matches_async,
+    "full": get_full_info_async,
+}
+
+
+async def run_async(data):
+    """Asyncio counterpart of run() for callers that already run an event loop."""
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "full")
+    job_id = data.get("jobId")
+    workers = data.get("workers", DEFAULT_WORKERS)
+
+    fn = ASYNC_ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ASYNC_ACTIONS)}")
+
+    if action in ("all-matches", "full") and not job_id and data.get("output") == "candidates":
+        return await get_candidate_index_async(api_url, workers, data.get("minJobs"),
+                                               data.get("bestJob", False))
+    if action in ["job", "matches"]:
+        if not job_id:
+            raise Exception(f"Action '{action}' requires jobId parameter")
+        if action == "matches":
+            return await fn(api_url, job_id, data.get("limit"), data.get("pageSize"))
+        return await fn(api_url, job_id)
+    elif action == "all-matches":
+        return await fn(api_url, workers)
+    elif action == "full":
+        return await fn(api_url, job_id, workers)
+    else:
+        return await fn(api_url)
+
+
 if __name__ == "__main__":
     try:
         # Parse input
@@ -110,39 +459,33 @@ if __name__ == "__main__":
             print(json.dumps({
                 "success": False,
                 "error": "Usage: get_profile.py <json> (or pipe json to stdin)\n"
-                         "Actions: jobs, job (requires jobId), matches (requires jobId), all-matches, full"
+                         "Actions: jobs, job (requires jobId), matches (requires jobId), all-matches, full, sync, diff, watch"
             }))
             sys.exit(1)
 
-        # Extract parameters
-        api_url = data.pop("apiUrl", DEFAULT_API)
-        action = data.pop("action", "full")
-        job_id = data.get("jobId")
+        options = pop_output_options(data)
 
-        # Execute action
-        fn = ACTIONS.get(action)
-        if not fn:
-            print(json.dumps({
-                "success": False,
-                "error": f"Unknown action: {action}. Use: {', '.join(ACTIONS)}"
-            }))
-            sys.exit(1)
+        # Streamed output is written as each job completes
+        if data.get("output") == "ndjson" and data.get("action", "full") in ("all-matches", "full") \
+                and not data.get("jobId"):
+            stream_all_matches(data.get("apiUrl", DEFAULT_API), data.get("workers", DEFAULT_WORKERS),
+                               fields=options.get("fields"), truncate=options.get("truncate"))
+            sys.exit(0)
+
+        # Watching runs until interrupted and streams its events, so it never goes to the daemon
+        if data.get("action") == "watch":
+            watch_matches(data.get("apiUrl", DEFAULT_API), data.get("jobId"),
+                          data.get("interval", snapshot.WATCH_INTERVAL),
+                          data.get("minInterval", snapshot.WATCH_MIN_INTERVAL),
+                          data.get("maxInterval", snapshot.WATCH_MAX_INTERVAL), data.get("duration"),
+                          options.get("fields"), options.get("truncate"))
+            sys.exit(0)
 
-        # Call function with appropriate parameters
-        if action in ["job", "matches"]:
-            if not job_id:
-                print(json.dumps({
-                    "success": False,
-                    "error": f"Action '{action}' requires jobId parameter"
-                }))
-                sys.exit(1)
-            result = fn(api_url, job_id)
-        elif action == "full" and job_id:
-            result = fn(api_url, job_id)
-        else:
-            result = fn(api_url)
-
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        # Prefer a running daemon; fall back to running in-process
+        result = forward("get_profile", data)
+        if result is None:
+            result = run(data)
+        print(render_output(result, **options))
 
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
@@ -1,66 +1,254 @@
 #!/usr/bin/env python3
 """
 Recruiter CLI: publish, update, delete job postings and list matched candidates.
+
+Every successful write is recorded in a local publish map (per API URL and
+token): the job id, the posting's externalId when it has one, and a hash
+of each field as last sent. Publishing or updating a posting then sends
+only the fields that differ, or nothing at all, and a publish with a known
+externalId updates its job instead of creating another. Writes of one
+posting run one at a time (from planning until the result is recorded),
+so concurrent publishes of an externalId create a single job; writes of
+different postings run in parallel.
 """
+import os
 import sys
 import json
-from base import AuthenticatedClient, DEFAULT_API
+import time
+import contextlib
+from base import (get_client, read_input, run_batch, pop_output_options, render_output, APIError,
+                  FileLock, DEFAULT_API)
+from daemon import forward
 
 
 JOB_FIELDS = ("title", "companyName", "requirement", "salary", "location", "jobType", "education", "experience")
 
+PUBLISH_MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".publish_map.json")
+
+# Writes of one posting are serialised on one of these lock files, picked by hash
+PUBLISH_LOCK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".publish_locks")
+PUBLISH_LOCK_STRIPES = 64
+
+
+def _digest(value):
+    import hashlib
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:32]
+
+
+def _scope(client, token):
+    return f"{client.api_url}|{_digest(token)}"
+
+
+def _read_map():
+    try:
+        with open(PUBLISH_MAP_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_map(published):
+    """Save the publish map atomically (non-critical if it fails)."""
+    tmp_path = f"{PUBLISH_MAP_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(published, f)
+        os.replace(tmp_path, PUBLISH_MAP_FILE)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def plan_publish(scope, payload, external_id=None, job_id=None, full=False):
+    """
+    Decide what a write has to send, comparing it with the publish map.
+
+    Args:
+        scope: Publish map scope (API URL and token)
+        payload: Job fields to write
+        external_id: Caller's key for the posting (e.g. the ATS requisition id)
+        job_id: Job to update; looked up by external_id when not given
+        full: Send every field of the payload, changed or not
+
+    Returns:
+        dict: mode ("create", "update" or "skip"), jobId, externalId, and
+        the request: method, endpoint and body (only the fields that differ)
+    """
+    jobs = _read_map().get(scope, {})
+    if job_id is None and external_id is not None:
+        job_id = next((known for known, entry in jobs.items() if entry.get("externalId") == external_id), None)
+    plan = {"jobId": job_id, "externalId": external_id}
+    if job_id is None:
+        return {**plan, "mode": "create", "method": "POST", "endpoint": "/jobs", "body": payload}
+
+    sent = {} if full else jobs.get(str(job_id), {}).get("fields", {})
+    body = {k: v for k, v in payload.items() if sent.get(k) != _digest(v)}
+    return {**plan, "mode": "update" if body else "skip", "method": "PUT", "endpoint": f"/jobs/{job_id}",
+            "body": body}
+
+
+def _posting_lock(scope, external_id=None, job_id=None):
+    """
+    Return the lock file that serialises writes of one posting.
+
+    A posting is keyed by its externalId, also when it is written by jobId
+    and the map knows its externalId. A new posting without externalId
+    needs no lock (None): nothing else can refer to it yet.
+    """
+    if external_id is None and job_id is not None:
+        external_id = _read_map().get(scope, {}).get(str(job_id), {}).get("externalId")
+    if external_id is not None:
+        key = [scope, "externalId", external_id]
+    elif job_id is not None:
+        key = [scope, "jobId", str(job_id)]
+    else:
+        return None
+    os.makedirs(PUBLISH_LOCK_DIR, exist_ok=True)
+    return os.path.join(PUBLISH_LOCK_DIR, f"{int(_digest(key), 16) % PUBLISH_LOCK_STRIPES}.lock")
+
+
+def _record_publish(scope, job_id, external_id, body):
+    """
+    Add the fields just written to a job's publish map entry.
+
+    Only postings with an externalId get an entry; a write by jobId
+    refreshes an existing one, so the map stays as large as the set of
+    externalIds in use.
+    """
+    with FileLock(PUBLISH_MAP_FILE + ".lock"):
+        published = _read_map()
+        jobs = published.setdefault(scope, {})
+        if external_id is None and str(job_id) not in jobs:
+            return
+        if external_id is not None:
+            # An externalId names one job; a re-created posting replaces the old entry
+            for known in [known for known, entry in jobs.items() if entry.get("externalId") == external_id]:
+                if known != str(job_id):
+                    del jobs[known]
+        entry = jobs.setdefault(str(job_id), {"fields": {}})
+        if external_id is not None:
+            entry["externalId"] = external_id
+        entry["fields"].update({k: _digest(v) for k, v in body.items()})
+        entry["updatedAt"] = time.time()
+        _write_map(published)
+
+
+def _forget_job(scope, job_id):
+    with FileLock(PUBLISH_MAP_FILE + ".lock"):
+        published = _read_map()
+        if published.get(scope, {}).pop(str(job_id), None) is not None:
+            _write_map(published)
+
+
+def _report(plan, dry_run=False):
+    """Describe a planned write; a dry run also shows the body it would send."""
+    report = {"mode": plan["mode"], "jobId": plan["jobId"], "fields": sorted(plan["body"])}
+    if plan["externalId"] is not None:
+        report["externalId"] = plan["externalId"]
+    if dry_run:
+        report.update(dryRun=True, method=plan["method"], endpoint=plan["endpoint"], body=plan["body"])
+    return report
+
+
+def _finish(scope, plan, result):
+    """Record a successful write in the publish map and attach its report to the result."""
+    if result.get("success", True):
+        job_id = plan["jobId"]
+        if job_id is None and isinstance(result.get("result"), dict):
+            job_id = result["result"].get("id")
+            plan = {**plan, "jobId": job_id}
+        if job_id is not None:
+            _record_publish(scope, job_id, plan["externalId"], plan["body"])
+    result["publish"] = _report(plan)
+    return result
+
+
+def _write(client, payload, external_id=None, job_id=None, full=False, dry_run=False, create=True):
+    """
+    Send only what changed since the posting was last written (see plan_publish).
+
+    Without `create`, a posting that is not in the publish map is an error
+    rather than a new job.
+    """
+    token = client.token_manager.get_token()
+    scope = _scope(client, token)
+    lock_path = _posting_lock(scope, external_id, job_id)
+    with contextlib.ExitStack() as stack:
+        # Two writes planned against the same map would both create the posting
+        if lock_path:
+            stack.enter_context(FileLock(lock_path))
+        plan = plan_publish(scope, payload, external_id, job_id, full)
+        if plan["mode"] == "create" and not create:
+            return {"success": False, "error": f"Unknown externalId: {external_id}"}
+        if dry_run or plan["mode"] == "skip":
+            return {"success": True, "result": None, "publish": _report(plan, dry_run), "token": token}
+
+        try:
+            if plan["method"] == "POST":
+                result = client.post(plan["endpoint"], plan["body"])
+            else:
+                result = client.put(plan["endpoint"], plan["body"])
+        except APIError as e:
+            # The job found by externalId is gone from the server: publish the posting again
+            if e.status != 404 or not create or plan["jobId"] is None:
+                raise
+            _forget_job(scope, plan["jobId"])
+            plan = plan_publish(scope, payload, external_id)
+            result = client.post(plan["endpoint"], plan["body"])
+        result = _finish(scope, plan, result)
+    result["token"] = client.token_manager.get_token()
+    return result
+
 
 def publish_job(api_url, data):
-    """Publish a new job posting."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    """Publish a job posting; with a known externalId, update its job with the fields that changed."""
+    client = get_client(api_url, "RECRUITER")
 
     payload = {k: data[k] for k in JOB_FIELDS}
     payload["status"] = data.get("status", "ACTIVE")
 
-    result = client.post("/jobs", payload)
-    result["token"] = client.token_manager.get_token()
-    return result
+    return _write(client, payload, data.get("externalId"), None, data.get("full", False), data.get("dryRun", False))
 
 
 def update_job(api_url, data):
-    """Update an existing job posting (partial update supported)."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    """Update an existing job posting (partial update supported; unchanged fields are not sent)."""
+    client = get_client(api_url, "RECRUITER")
 
     job_id = data.get("jobId")
-    if not job_id:
+    if not job_id and data.get("externalId") is None:
         return {"success": False, "error": "jobId is required for update"}
 
     payload = {k: data[k] for k in (*JOB_FIELDS, "status") if k in data}
     if not payload:
         return {"success": False, "error": "No fields to update"}
 
-    result = client.put(f"/jobs/{job_id}", payload)
-    result["token"] = client.token_manager.get_token()
-    return result
+    return _write(client, payload, data.get("externalId"), job_id or None, data.get("full", False),
+                  data.get("dryRun", False), create=False)
 
 
 def delete_job(api_url, data):
-    """Soft-delete a job posting by setting status to INACTIVE."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    """Soft-delete a job posting by setting status to INACTIVE (always sent, even if recorded as such)."""
+    client = get_client(api_url, "RECRUITER")
 
     job_id = data.get("jobId")
-    if not job_id:
+    if not job_id and data.get("externalId") is None:
         return {"success": False, "error": "jobId is required for delete"}
 
-    result = client.put(f"/jobs/{job_id}", {"status": "INACTIVE"})
-    result["token"] = client.token_manager.get_token()
-    return result
+    return _write(client, {"status": "INACTIVE"}, data.get("externalId"), job_id or None, True,
+                  data.get("dryRun", False), create=False)
 
 
 def list_matches(api_url, data):
     """List matched candidates for a specific job posting."""
-    client = AuthenticatedClient(api_url, "RECRUITER")
+    client = get_client(api_url, "RECRUITER")
 
     job_id = data.get("jobId")
     if not job_id:
         return {"success": False, "error": "jobId is required for listing matches"}
 
-    result = client.get(f"/matches/job/{job_id}")
+    result = client.get_list(f"/matches/job/{job_id}", data.get("limit"), data.get("pageSize"))
     result["token"] = client.token_manager.get_token()
     return result
 
@@ -74,39 +262,151 @@ ACTIONS = {
 }
 
 
+def run(data):
+    """Execute the action described by `data` (the script's JSON input)."""
+    # Extract parameters
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "publish")
+
+    # Execute action
+    fn = ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ACTIONS)}")
+
+    return fn(api_url, data)
+
+
+def _async_client(api_url):
+    # Imported on demand so the command line does not load asyncio
+    from base_async import get_async_client
+    return get_async_client(api_url, "RECRUITER")
+
+
+async def _write_async(client, payload, external_id=None, job_id=None, full=False, dry_run=False, create=True):
+    """Asyncio counterpart of _write()."""
+    from base_async import file_lock
+    token = await client.token_manager.get_token_async()
+    scope = _scope(client, token)
+    lock_path = _posting_lock(scope, external_id, job_id)
+    async with contextlib.AsyncExitStack() as stack:
+        if lock_path:
+            await stack.enter_async_context(file_lock(lock_path))
+        plan = plan_publish(scope, payload, external_id, job_id, full)
+        if plan["mode"] == "create" and not create:
+            return {"success": False, "error": f"Unknown externalId: {external_id}"}
+        if dry_run or plan["mode"] == "skip":
+            return {"success": True, "result": None, "publish": _report(plan, dry_run), "token": token}
+
+        try:
+            if plan["method"] == "POST":
+                result = await client.post(plan["endpoint"], plan["body"])
+            else:
+                result = await client.put(plan["endpoint"], plan["body"])
+        except APIError as e:
+            if e.status != 404 or not create or plan["jobId"] is None:
+                raise
+            _forget_job(scope, plan["jobId"])
+            plan = plan_publish(scope, payload, external_id)
+            result = await client.post(plan["endpoint"], plan["body"])
+        result = _finish(scope, plan, result)
+    result["token"] = await client.token_manager.get_token_async()
+    return result
+
+
+async def publish_job_async(api_url, data):
+    """Publish a job posting (asyncio; see publish_job)."""
+    client = _async_client(api_url)
+
+    payload = {k: data[k] for k in JOB_FIELDS}
+    payload["status"] = data.get("status", "ACTIVE")
+
+    return await _write_async(client, payload, data.get("externalId"), None, data.get("full", False),
+                              data.get("dryRun", False))
+
+
+async def update_job_async(api_url, data):
+    """Update an existing job posting (asyncio; partial update supported; unchanged fields are not sent)."""
+    client = _async_client(api_url)
+
+    job_id = data.get("jobId")
+    if not job_id and data.get("externalId") is None:
+        return {"success": False, "error": "jobId is required for update"}
+
+    payload = {k: data[k] for k in (*JOB_FIELDS, "status") if k in data}
+    if not payload:
+        return {"success": False, "error": "No fields to update"}
+
+    return await _write_async(client, payload, data.get("externalId"), job_id or None, data.get("full", False),
+                              data.get("dryRun", False), create=False)
+
+
+async def delete_job_async(api_url, data):
+    """Soft-delete a job posting by setting status to INACTIVE (asyncio)."""
+    client = _async_client(api_url)
+
+    job_id = data.get("jobId")
+    if not job_id and data.get("externalId") is None:
+        return {"success": False, "error": "jobId is required for delete"}
+
+    return await _write_async(client, {"status": "INACTIVE"}, data.get("externalId"), job_id or None,
+                              True, data.get("dryRun", False), create=False)
+
+
+async def list_matches_async(api_url, data):
+    """List matched candidates for a specific job posting (asyncio)."""
+    client = _async_client(api_url)
+
+    job_id = data.get("jobId")
+    if not job_id:
+        return {"success": False, "error": "jobId is required for listing matches"}
+
+    result = await client.get_list(f"/matches/job/{job_id}", data.get("limit"), data.get("pageSize"))
+    result["token"] = await client.token_manager.get_token_async()
+    return result
+
+
+ASYNC_ACTIONS = {
+    "publish": publish_job_async,
+    "update": update_job_async,
+    "delete": delete_job_async,
+    "matches": list_matches_async,
+}
+
+
+async def run_async(data):
+    """Asyncio counterpart of run() for callers that already run an event loop."""
+    api_url = data.pop("apiUrl", DEFAULT_API)
+    action = data.pop("action", "publish")
+
+    fn = ASYNC_ACTIONS.get(action)
+    if not fn:
+        raise Exception(f"Unknown action: {action}. Use: {', '.join(ASYNC_ACTIONS)}")
+
+    return await fn(api_url, data)
+
+
 if __name__ == "__main__":
     try:
-        # Parse input
-        data = None
-        if len(sys.argv) > 1:
-            data = json.loads(sys.argv[1])
-        elif not sys.stdin.isatty():
-            input_data = sys.stdin.read()
-            if input_data.strip():
-                data = json.loads(input_data)
+        # Parse input: one action, or a JSON array / NDJSON stream of actions
+        data = read_input()
 
         if not data:
             print(json.dumps({
                 "success": False,
-                "error": "Usage: publish_job.py <json> (or pipe json to stdin)"
+                "error": "Usage: publish_job.py <json> (or pipe json, a json array or ndjson to stdin)"
             }))
             sys.exit(1)
 
-        # Extract parameters
-        api_url = data.pop("apiUrl", DEFAULT_API)
-        action = data.pop("action", "publish")
-
-        # Execute action
-        fn = ACTIONS.get(action)
-        if not fn:
-            print(json.dumps({
-                "success": False,
-                "error": f"Unknown action: {action}. Use: {', '.join(ACTIONS)}"
-            }))
-            sys.exit(1)
+        if not isinstance(data, dict):
+            summary = run_batch(data, run)
+            sys.exit(1 if summary["failed"] else 0)
 
-        result = fn(api_url, data)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        # Prefer a running daemon; fall back to running in-process
+        options = pop_output_options(data)
+        result = forward("publish_job", data)
+        if result is None:
+            result = run(data)
+        print(render_output(result, **options))
 
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}))
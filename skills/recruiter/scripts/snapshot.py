@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+Local snapshot of jobs, profile and matches, for incremental sync and diff.
+
+A sync refreshes only what has probably changed: endpoints that returned an
+ETag or Last-Modified validator are revalidated with a conditional GET,
+others are fetched again once they are older than their maximum age, and
+the matches of a job (or profile) whose updatedAt changed are always
+fetched. Each sync records the matches it found new, removed or re-scored,
+and diff() reports them without touching the network. watch() keeps
+revalidating match lists and emits each change as it is found.
+"""
+import os
+import sys
+import json
+import time
+from base import FileLock, MatchSummary, MATCH_BRIEF_FIELDS, PAGE_ITEM_KEYS
+
+SNAPSHOT_FILE = os.environ.get(
+    "JOBCLAW_SNAPSHOT_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshot.db")
+)
+
+# Seconds after which an endpoint without validators is fetched again, by endpoint prefix
+SNAPSHOT_MAX_AGE = (
+    ("/job-seekers/profile", 900),
+    ("/jobs/my-jobs", 300),
+    ("/matches", 120),
+)
+DEFAULT_MAX_AGE = 120
+
+# Score changes smaller than this are not reported as re-scored
+RESCORE_EPSILON = 0.001
+
+# Seconds between polls of a watched match list: the starting interval and
+# its bounds. A change shortens the interval to the minimum; each quiet poll
+# stretches it by WATCH_BACKOFF up to the maximum.
+WATCH_INTERVAL = 30
+WATCH_MIN_INTERVAL = 10
+WATCH_MAX_INTERVAL = 60
+WATCH_BACKOFF = 1.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS endpoints (
+    scope TEXT, endpoint TEXT, etag TEXT, last_modified TEXT, fetched_at REAL,
+    PRIMARY KEY (scope, endpoint));
+CREATE TABLE IF NOT EXISTS records (
+    scope TEXT, kind TEXT, id TEXT, version TEXT, brief TEXT,
+    PRIMARY KEY (scope, kind, id));
+CREATE TABLE IF NOT EXISTS matches (
+    scope TEXT, owner TEXT, id TEXT, score REAL, brief TEXT,
+    PRIMARY KEY (scope, owner, id));
+CREATE TABLE IF NOT EXISTS syncs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, scope TEXT, started_at REAL, finished_at REAL, stats TEXT);
+CREATE TABLE IF NOT EXISTS changes (
+    sync_id INTEGER, scope TEXT, kind TEXT, owner TEXT, id TEXT, before TEXT, after TEXT);
+CREATE INDEX IF NOT EXISTS changes_by_sync ON changes (scope, sync_id);
+"""
+
+
+def max_age(endpoint):
+    """Return how long an endpoint without validators is trusted, in seconds."""
+    return next((age for prefix, age in SNAPSHOT_MAX_AGE if endpoint.startswith(prefix)), DEFAULT_MAX_AGE)
+
+
+def _items(result):
+    """Return the items of a list response (a plain list or a page object)."""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        return next((result[key] for key in PAGE_ITEM_KEYS if isinstance(result.get(key), list)), [])
+    return []
+
+
+def match_id(match, owner=""):
+    """
+    Return the id of the matched item: the job of a job seeker's match, or
+    the candidate of a match listed under a recruiter's job (`owner`). The
+    rows of one job all carry the same jobId, so it never identifies them.
+    """
+    if owner:
+        keys, nested_keys = ("jobSeekerId", "candidateId"), ("jobSeeker", "candidate")
+    else:
+        keys, nested_keys = ("jobId",), ("job",)
+    for key in keys:
+        if match.get(key) is not None:
+            return str(match[key])
+    nested = next((match[key] for key in nested_keys if isinstance(match.get(key), dict)), None)
+    if nested is None:
+        nested = next((value for value in match.values() if isinstance(value, dict)), match)
+    return str(nested["id"]) if nested.get("id") is not None else None
+
+
+def _version(record):
+    """Return what tells two copies of a record apart: updatedAt, or a content hash."""
+    if record.get("updatedAt"):
+        return str(record["updatedAt"])
+    import hashlib
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+class Snapshot:
+    """
+    SQLite store of the last synced API state of one API URL and identity.
+
+    Args:
+        client: AuthenticatedClient of the job seeker or recruiter
+        path: Database file (defaults to SNAPSHOT_FILE)
+    """
+
+    def __init__(self, client, path=None):
+        import sqlite3
+        import hashlib
+        import threading
+        self.client = client
+        self.path = path or SNAPSHOT_FILE
+        token = client.token_manager.get_token()
+        self.scope = f"{client.api_url}|{hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]}"
+        self._lock = threading.Lock()
+        self._events = None
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.executescript(SCHEMA)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def close(self):
+        self._db.close()
+
+    # Fetching
+
+    def refresh(self, endpoint, force=False):
+        """
+        Fetch an endpoint unless the snapshot of it is still fresh.
+
+        Returns:
+            tuple: (state, result, response headers); state is "skipped",
+            "notModified", "fetched" or "failed" (result is then the error)
+        """
+        rows = self._query("SELECT etag, last_modified, fetched_at FROM endpoints"
+                           " WHERE scope = ? AND endpoint = ?", (self.scope, endpoint))
+        etag, last_modified, fetched_at = rows[0] if rows else (None, None, None)
+        if rows and not force and not (etag or last_modified) \
+                and time.time() - fetched_at < max_age(endpoint):
+            return "skipped", None, None
+        try:
+            status, headers, result = self.client.get_conditional(endpoint, etag, last_modified)
+        except Exception as e:
+            return "failed", str(e), None
+        if status == 304 and rows:
+            return "notModified", None, headers
+        return "fetched", result, headers
+
+    def _mark_fetched(self, endpoint, headers):
+        self._db.execute(
+            "INSERT OR REPLACE INTO endpoints VALUES (?, ?, ?, ?, ?)",
+            (self.scope, endpoint, headers.get("ETag"), headers.get("Last-Modified"), time.time())
+        )
+
+    def _forget(self, endpoint):
+        self._db.execute("DELETE FROM endpoints WHERE scope = ? AND endpoint = ?", (self.scope, endpoint))
+
+    # Storing
+
+    def _change(self, sync_id, kind, owner, item_id, before, after):
+        self._db.execute(
+            "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (sync_id, self.scope, kind, owner, item_id, before, after)
+        )
+        if self._events is not None:
+            self._events.append((kind, owner, item_id, before, after))
+
+    def _store_records(self, sync_id, kind, records):
+        """Replace the records of a kind; return the ids of new and updated ones."""
+        stored = {row[0]: row[1:] for row in self._db.execute(
+            "SELECT id, version, brief FROM records WHERE scope = ? AND kind = ?", (self.scope, kind))}
+        changed = set()
+        for record_id, record in records.items():
+            version = _version(record)
+            brief = json.dumps({k: record[k] for k in MATCH_BRIEF_FIELDS if k in record},
+                               ensure_ascii=False)
+            old = stored.pop(record_id, None)
+            if old and old[0] == version:
+                continue
+            self._db.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)",
+                             (self.scope, kind, record_id, version, brief))
+            self._change(sync_id, kind, "", record_id, old[1] if old else None, brief)
+            changed.add(record_id)
+        for record_id, (_, brief) in stored.items():
+            self._db.execute("DELETE FROM records WHERE scope = ? AND kind = ? AND id = ?",
+                             (self.scope, kind, record_id))
+            self._change(sync_id, kind, "", record_id, brief, None)
+        return changed
+
+    def _store_matches(self, sync_id, owner, matches):
+        """Replace the matches of one owner (a job id, or "" for the job seeker); return change counts."""
+        counts = {"new": 0, "removed": 0, "rescored": 0}
+        stored = {row[0]: row[1:] for row in self._db.execute(
+            "SELECT id, score, brief FROM matches WHERE scope = ? AND owner = ?", (self.scope, owner))}
+        for match in matches:
+            item_id = match_id(match, owner) if isinstance(match, dict) else None
+            if item_id is None:
+                continue
+            score = MatchSummary.score_of(match)
+            brief = json.dumps(MatchSummary.brief(match, score), ensure_ascii=False)
+            old = stored.pop(item_id, None)
+            if old:
+                old_score, old_brief = old
+                if old_score == score or (old_score is not None and score is not None
+                                          and abs(score - old_score) < RESCORE_EPSILON):
+                    continue
+                counts["rescored"] += 1
+                self._change(sync_id, "match", owner, item_id, old_brief, brief)
+            else:
+                counts["new"] += 1
+                self._change(sync_id, "match", owner, item_id, None, brief)
+            self._db.execute("INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?)",
+                             (self.scope, owner, item_id, score, brief))
+        for item_id, (_, brief) in stored.items():
+            counts["removed"] += 1
+            self._db.execute("DELETE FROM matches WHERE scope = ? AND owner = ? AND id = ?",
+                             (self.scope, owner, item_id))
+            self._change(sync_id, "match", owner, item_id, brief, None)
+        return counts
+
+    def _store_jobs(self, sync_id, result, changes):
+        """Replace the recruiter's jobs, dropping the matches of jobs that are gone; return changed job ids."""
+        jobs = {str(job["id"]): job for job in _items(result.get("result"))
+                if isinstance(job, dict) and job.get("id") is not None}
+        changed = self._store_records(sync_id, "job", jobs)
+        for (job_id,) in self._db.execute(
+                "SELECT DISTINCT owner FROM matches WHERE scope = ? AND owner != ''",
+                (self.scope,)).fetchall():
+            if job_id not in jobs:
+                for key, value in self._store_matches(sync_id, job_id, []).items():
+                    changes[key] += value
+                self._forget(f"/matches/job/{job_id}")
+        return changed
+
+    def _job_ids(self):
+        return [row[0] for row in self._query(
+            "SELECT id FROM records WHERE scope = ? AND kind = 'job' ORDER BY rowid", (self.scope,))]
+
+    def _apply(self, fn, *args):
+        """Run one storing step in its own transaction."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(*args)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    # Sync
+
+    def sync(self, force=False, workers=8):
+        """
+        Bring the snapshot up to date.
+
+        Args:
+            force: Fetch endpoints without validators even when they are still fresh
+            workers: Maximum number of job match lists fetched at once (recruiters)
+
+        Returns:
+            dict: syncId, fetched, notModified, skipped, failed, the match
+            changes found (new, removed, rescored) and per-endpoint errors
+        """
+        # One sync at a time per snapshot file, so changes are recorded once
+        with FileLock(self.path + ".lock"):
+            with self._lock:
+                sync_id = self._db.execute("INSERT INTO syncs (scope, started_at) VALUES (?, ?)",
+                                           (self.scope, time.time())).lastrowid
+            stats = {"syncId": sync_id, "fetched": 0, "notModified": 0, "skipped": 0, "failed": 0,
+                     "changes": {"new": 0, "removed": 0, "rescored": 0}, "errors": {}}
+            if self.client.token_manager.user_type == "RECRUITER":
+                self._sync_recruiter(sync_id, stats, force, workers)
+            else:
+                self._sync_job_seeker(sync_id, stats, force)
+            if not stats["errors"]:
+                del stats["errors"]
+            with self._lock:
+                self._db.execute("UPDATE syncs SET finished_at = ?, stats = ? WHERE id = ?",
+                                 (time.time(), json.dumps(stats), sync_id))
+            return stats
+
+    def _count(self, stats, endpoint, state, result):
+        stats[state] += 1
+        if state == "failed":
+            stats["errors"][endpoint] = result
+
+    def _add_changes(self, stats, counts):
+        for key, value in counts.items():
+            stats["changes"][key] += value
+
+    def _sync_job_seeker(self, sync_id, stats, force):
+        endpoint = "/job-seekers/profile"
+        state, result, headers = self.refresh(endpoint, force)
+        self._count(stats, endpoint, state, result)
+        profile_changed = False
+        if state in ("fetched", "notModified"):
+            def store_profile():
+                self._mark_fetched(endpoint, headers)
+                if state == "fetched":
+                    return bool(self._store_records(sync_id, "profile", {"me": result.get("result") or {}}))
+                return False
+            profile_changed = self._apply(store_profile)
+
+        # A changed profile is re-matched, so its matches are fetched regardless of age
+        endpoint = "/matches"
+        state, result, headers = self.refresh(endpoint, force or profile_changed)
+        self._store_fetched(sync_id, stats, endpoint, "", state, result, headers)
+
+    def _store_fetched(self, sync_id, stats, endpoint, owner, state, result, headers):
+        self._count(stats, endpoint, state, result)
+        if state not in ("fetched", "notModified"):
+            return
+
+        def store():
+            self._mark_fetched(endpoint, headers)
+            if state == "fetched":
+                return self._store_matches(sync_id, owner, _items(result.get("result")))
+            return {}
+        self._add_changes(stats, self._apply(store))
+
+    def _sync_recruiter(self, sync_id, stats, force, workers):
+        endpoint = "/jobs/my-jobs"
+        state, result, headers = self.refresh(endpoint, force)
+        self._count(stats, endpoint, state, result)
+        changed_jobs = set()
+        if state in ("fetched", "notModified"):
+            def store_jobs():
+                self._mark_fetched(endpoint, headers)
+                if state != "fetched":
+                    return set()
+                return self._store_jobs(sync_id, result, stats["changes"])
+            changed_jobs = self._apply(store_jobs)
+
+        job_ids = self._job_ids()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # An updated job is re-matched, so its matches are fetched regardless of age
+        def fetch(job_id):
+            return self.refresh(f"/matches/job/{job_id}", force or job_id in changed_jobs)
+
+        with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+            for job_id, (state, result, headers) in zip(job_ids, executor.map(fetch, job_ids)):
+                self._store_fetched(sync_id, stats, f"/matches/job/{job_id}", job_id,
+                                    state, result, headers)
+
+    # Watch
+
+    def watch(self, emit, interval=WATCH_INTERVAL, min_interval=WATCH_MIN_INTERVAL,
+              max_interval=WATCH_MAX_INTERVAL, job_id=None, duration=None, stop=None):
+        """
+        Poll match lists until stopped, emitting each change as it is found.
+
+        Each match list is revalidated with a conditional GET on its own
+        schedule, so a quiet poll costs a 304 and emits nothing. Recruiter
+        jobs start evenly spread over the interval so their polls do not
+        arrive together; the job list itself is polled every max_interval
+        to pick up new and closed jobs. Polls run one at a time on the
+        client's connection pool, which keeps one connection open for the
+        whole watch. Changes are recorded in the snapshot as one sync, so
+        diff() reports them afterwards.
+
+        Args:
+            emit: Called with each event dict: a match "new", "removed" or
+                "rescored"; a job "jobAdded", "jobUpdated" or "jobRemoved";
+                "baseline" for a list seen for the first time (its items are
+                stored, not emitted); "error" for a failed poll
+            interval: Starting seconds between polls of a match list
+            min_interval: Seconds until the next poll after a change
+            max_interval: Longest interval reached by backing off
+            job_id: Watch only this job's matches (recruiters)
+            duration: Stop after this many seconds (default: until stopped)
+            stop: threading.Event that ends the watch when set
+
+        Returns:
+            dict: syncId, polls, notModified, failed, events, the match
+            changes found (new, removed, rescored) and elapsedMs
+        """
+        import heapq
+        import itertools
+        import threading
+        stop = stop or threading.Event()
+        interval = float(interval)
+        min_interval = min(float(min_interval), interval)
+        max_interval = max(float(max_interval), interval)
+        started = time.time()
+        deadline = started + float(duration) if duration else None
+        with self._lock:
+            sync_id = self._db.execute("INSERT INTO syncs (scope, started_at) VALUES (?, ?)",
+                                       (self.scope, started)).lastrowid
+        stats = {"syncId": sync_id, "polls": 0, "notModified": 0, "failed": 0, "events": 0,
+                 "changes": {"new": 0, "removed": 0, "rescored": 0}}
+
+        # Poll queue entries: [due, order, endpoint, owner, interval]; owner None is the job list
+        queue = []
+        order = itertools.count()
+        watched = {}
+
+        def schedule(due, endpoint, owner, every):
+            entry = [due, next(order), endpoint, owner, every]
+            heapq.heappush(queue, entry)
+            if owner is not None:
+                watched[owner] = entry
+
+        def send(event):
+            stats["events"] += 1
+            emit(event)
+
+        if self.client.token_manager.user_type != "RECRUITER":
+            schedule(started, "/matches", "", interval)
+        elif job_id is not None:
+            schedule(started, f"/matches/job/{job_id}", str(job_id), interval)
+        else:
+            schedule(started, "/jobs/my-jobs", None, max_interval)
+
+        try:
+            while queue:
+                due = queue[0][0]
+                if deadline is not None and due >= deadline:
+                    stop.wait(max(0.0, deadline - time.time()))
+                    break
+                if stop.wait(max(0.0, due - time.time())):
+                    break
+                entry = heapq.heappop(queue)
+                _, _, endpoint, owner, every = entry
+                if owner is not None and watched.get(owner) is not entry:
+                    continue  # the job is gone
+
+                changed = self._watch_poll(sync_id, stats, endpoint, owner, send)
+                now = time.time()
+                if owner is None:
+                    schedule(now + every, endpoint, None, every)
+                    job_ids = self._job_ids()
+                    for gone in set(watched) - set(job_ids):
+                        del watched[gone]
+                    new_ids = [job for job in job_ids if job not in watched]
+                    for position, job in enumerate(new_ids):
+                        schedule(now + position * interval / len(new_ids), f"/matches/job/{job}", job, interval)
+                else:
+                    every = min_interval if changed else min(max_interval, every * WATCH_BACKOFF)
+                    schedule(now + every, endpoint, owner, every)
+        finally:
+            stats["elapsedMs"] = round((time.time() - started) * 1000)
+            with self._lock:
+                self._db.execute("UPDATE syncs SET finished_at = ?, stats = ? WHERE id = ?",
+                                 (time.time(), json.dumps(stats), sync_id))
+        return stats
+
+    def _watch_poll(self, sync_id, stats, endpoint, owner, send):
+        """Revalidate and store one watched list, emitting its changes; return whether matches changed."""
+        with FileLock(self.path + ".lock"):
+            known = bool(self._query("SELECT 1 FROM endpoints WHERE scope = ? AND endpoint = ?",
+                                     (self.scope, endpoint)))
+            state, result, headers = self.refresh(endpoint, force=True)
+            stats["polls"] += 1
+            if state == "failed":
+                stats["failed"] += 1
+                send({"event": "error", "endpoint": endpoint, "error": result, "ts": round(time.time(), 3)})
+                return False
+            if state == "notModified":
+                stats["notModified"] += 1
+
+            def store():
+                self._mark_fetched(endpoint, headers)
+                if state != "fetched":
+                    return
+                # Changes are counted as they are emitted, so a baseline adds none
+                if owner is None:
+                    self._store_jobs(sync_id, result, {"new": 0, "removed": 0, "rescored": 0})
+                else:
+                    self._store_matches(sync_id, owner, _items(result.get("result")))
+
+            self._events = events = []
+            try:
+                self._apply(store)
+            finally:
+                self._events = None
+
+        if state != "fetched":
+            return False
+        ts = round(time.time(), 3)
+        if not known:
+            items = len(_items(result.get("result")))
+            send({"event": "baseline", "endpoint": endpoint, "items": items, "ts": ts})
+            return False
+        changed = False
+        for kind, item_owner, item_id, before, after in events:
+            before = json.loads(before) if before else None
+            after = json.loads(after) if after else None
+            if kind == "match":
+                change = self._match_change(item_owner, before, after)
+                if change:
+                    changed = True
+                    stats["changes"][change[0]] += 1
+                    send({"event": change[0], **change[1], "ts": ts})
+            else:
+                name = "jobAdded" if before is None else "jobRemoved" if after is None else "jobUpdated"
+                send({"event": name, **(after or before), "ts": ts})
+        return changed
+
+    # Diff
+
+    def diff(self, since=None):
+        """
+        Report what changed in the snapshot.
+
+        Args:
+            since: Sync id; report the net changes of every later sync
+                (default: only the changes found by the latest sync)
+
+        Returns:
+            dict: syncId, since, syncedAt, matches {new, removed, rescored}
+            and, when any changed, jobs or profile {new, removed, updated}
+        """
+        rows = self._query("SELECT id, finished_at FROM syncs WHERE scope = ? AND finished_at"
+                           " IS NOT NULL ORDER BY id DESC LIMIT 1", (self.scope,))
+        if not rows:
+            return {"syncId": None, "since": since, "syncedAt": None,
+                    "matches": {"new": [], "removed": [], "rescored": []}}
+        last_id, finished_at = rows[0]
+        if since is None:
+            changes = self._query("SELECT kind, owner, id, before, after FROM changes"
+                                  " WHERE scope = ? AND sync_id = ? ORDER BY rowid", (self.scope, last_id))
+        else:
+            changes = self._query("SELECT kind, owner, id, before, after FROM changes"
+                                  " WHERE scope = ? AND sync_id > ? AND sync_id <= ? ORDER BY sync_id, rowid",
+                                  (self.scope, int(since), last_id))
+
+        # Collapse several syncs into one net change per item: first before, last after
+        net = {}
+        for kind, owner, item_id, before, after in changes:
+            key = (kind, owner, item_id)
+            net[key] = (net[key][0] if key in net else before, after)
+
+        report = {"syncId": last_id, "since": since, "syncedAt": finished_at,
+                  "matches": {"new": [], "removed": [], "rescored": []}}
+        for (kind, owner, item_id), (before, after) in net.items():
+            before = json.loads(before) if before else None
+            after = json.loads(after) if after else None
+            if kind == "match":
+                change = self._match_change(owner, before, after)
+                if change:
+                    report["matches"][change[0]].append(change[1])
+            elif before is not None or after is not None:
+                name = "jobs" if kind == "job" else kind
+                section = report.setdefault(name, {"new": [], "removed": [], "updated": []})
+                if before is None:
+                    section["new"].append(after)
+                elif after is None:
+                    section["removed"].append(before)
+                else:
+                    section["updated"].append(after)
+
+        for entries in report["matches"].values():
+            entries.sort(key=lambda entry: entry.get("score") or 0, reverse=True)
+        return report
+
+    @staticmethod
+    def _match_change(owner, before, after):
+        """Return (change, entry) for a match's briefs before and after, or None if it did not change."""
+        prefix = {"jobId": owner} if owner else {}
+        if before is None and after is not None:
+            return "new", {**prefix, **after}
+        if after is None and before is not None:
+            return "removed", {**prefix, **before}
+        if before and after:
+            old, new = before.get("score"), after.get("score")
+            if old is None or new is None or abs(new - old) >= RESCORE_EPSILON:
+                return "rescored", {**prefix, **after, "previousScore": old}
+        return None
+
+
+def sync_snapshot(client, force=False, workers=8):
+    """Sync the snapshot of a client's account (see Snapshot.sync)."""
+    snapshot = Snapshot(client)
+    try:
+        return {"success": True, "result": snapshot.sync(force, workers)}
+    finally:
+        snapshot.close()
+
+
+def watch_snapshot(client, out=None, interval=WATCH_INTERVAL, min_interval=WATCH_MIN_INTERVAL,
+                   max_interval=WATCH_MAX_INTERVAL, job_id=None, duration=None, shape=None):
+    """
+    Watch a client's matches, writing each change as an NDJSON line and a
+    summary line at the end (see Snapshot.watch).
+
+    SIGINT and SIGTERM end the watch after the poll in progress. `shape`
+    is applied to each event before it is written.
+
+    Returns:
+        dict: The watch summary
+    """
+    import signal
+    import threading
+    out = out or sys.stdout
+    stop = threading.Event()
+
+    def emit(event):
+        out.write(json.dumps(shape(event) if shape else event, ensure_ascii=False) + "\n")
+        out.flush()
+
+    # Signal handlers can only be installed from the main thread
+    handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            handlers[signum] = signal.signal(signum, lambda *_: stop.set())
+    snapshot = Snapshot(client)
+    try:
+        summary = snapshot.watch(emit, interval, min_interval, max_interval, job_id, duration, stop)
+    finally:
+        snapshot.close()
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+    return summary
+
+
+def diff_snapshot(client, since=None, sync=False, force=False, workers=8):
+    """Report changes recorded in the snapshot, optionally syncing first (see Snapshot.diff)."""
+    snapshot = Snapshot(client)
+    try:
+        if sync:
+            snapshot.sync(force, workers)
+        return {"success": True, "result": snapshot.diff(since)}
+    finally:
+        snapshot.close()
@@ -0,0 +1,42 @@
+"""
+Shared fixtures: the skill scripts and benchmarks/mock_api.py on sys.path,
+and a mock JobClaw API served in-process.
+
+The two skills ship modules of the same names (base, snapshot, ...); the
+tests import the job-seeker copies, which the recruiter copies mirror.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT, "skills", "job-seeker", "scripts"))
+
+# Default settings only: no daemon, response cache, shared limiter state, trace or proxy
+for name in [name for name in os.environ if name.startswith("JOBCLAW_") or name.lower().endswith("_proxy")]:
+    del os.environ[name]
+os.environ["JOBCLAW_DAEMON"] = "0"
+
+
+@pytest.fixture
+def mock_api():
+    """Yield (MockAPI, base URL) of a mock API listening on a free port."""
+    from mock_api import MockAPI
+    api = MockAPI(jobs=1, matches=2)
+    url = api.start()
+    try:
+        yield api, url
+    finally:
+        api.stop()
+
+
+@pytest.fixture
+def client_for(tmp_path):
+    """Return a factory of AuthenticatedClients with their own token file and no response cache."""
+    from base import AuthenticatedClient
+
+    def make(url, user_type):
+        return AuthenticatedClient(url, user_type, token_file=str(tmp_path / f".token-{user_type}"), cache=False)
+    return make
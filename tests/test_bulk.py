@@ -0,0 +1,71 @@
+"""Bulk candidate onboarding input and the bounded per-identity client cache."""
+import io
+import json
+import asyncio
+import collections
+
+import base
+import base_async
+import submit_resume
+from base import read_input, read_stream, get_client
+
+CANDIDATE = {"action": "submit", "name": "Ada", "email": "ada@example.com", "phone": "555-0100",
+             "jobIntention": "Engineer", "resumeText": "Engineer"}
+
+
+def test_single_piped_line_is_a_stream_of_one_record():
+    line = json.dumps(CANDIDATE) + "\n"
+    assert read_input(["script"], io.StringIO(line)) == CANDIDATE
+    assert list(read_input(["script"], io.StringIO(line), records=True)) == [CANDIDATE]
+
+    # A pretty-printed object is still one action
+    pretty = json.dumps(CANDIDATE, indent=2)
+    assert read_stream(io.StringIO(pretty), records=True) == CANDIDATE
+
+
+def test_single_record_is_onboarded_under_its_identity(mock_api, tmp_path, monkeypatch, capsys):
+    api, url = mock_api
+    monkeypatch.setattr(submit_resume, "IDENTITY_DIR", str(tmp_path / ".identities"))
+    monkeypatch.setattr(base, "_clients", collections.OrderedDict())
+    records = read_input(["script"], io.StringIO(json.dumps(CANDIDATE) + "\n"), records=True)
+
+    summary = submit_resume.bulk_submit(url, records)
+    assert (summary["total"], summary["failed"]) == (1, 0)
+    line = json.loads(capsys.readouterr().out.splitlines()[0])
+    assert line["identity"] == "ada@example.com"
+    assert base.read_token_file(submit_resume.identity_path("ada@example.com", ".token"))
+    assert not any(key[2] == base.TOKEN_FILE for key in base._clients)
+
+
+def test_client_cache_keeps_the_most_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(base, "CLIENT_CACHE_SIZE", 2)
+    monkeypatch.setattr(base, "_clients", collections.OrderedDict())
+    a, b, c = (str(tmp_path / name) for name in "abc")
+
+    first = get_client("http://api.test", "JOB_SEEKER", a)
+    get_client("http://api.test", "JOB_SEEKER", b)
+    assert get_client("http://api.test", "JOB_SEEKER", a) is first
+    get_client("http://api.test", "JOB_SEEKER", c)
+
+    assert [key[2] for key in base._clients] == [a, c]
+    assert get_client("http://api.test", "JOB_SEEKER", a) is first
+
+
+def test_async_client_cache_closes_evicted_clients(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_async, "CLIENT_CACHE_SIZE", 1)
+    monkeypatch.setattr(base_async, "_clients", collections.OrderedDict())
+    closed = []
+
+    async def main():
+        first = base_async.get_async_client("http://api.test", "JOB_SEEKER", str(tmp_path / "a"))
+
+        async def close():
+            closed.append(first)
+        first.close = close
+        second = base_async.get_async_client("http://api.test", "JOB_SEEKER", str(tmp_path / "b"))
+        await asyncio.sleep(0)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert closed == [first]
+    assert list(base_async._clients.values()) == [second]
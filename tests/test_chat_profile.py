@@ -0,0 +1,89 @@
+"""The upload ledger of submit_chat_profile.py: delta planning, fallbacks and concurrent submissions."""
+import time
+import threading
+
+import pytest
+
+import submit_chat_profile as chat
+from base import APIError
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Replace the API with a recorder of submitted conversations; set `reject` to refuse deltas."""
+    monkeypatch.setattr(chat, "LEDGER_FILE", str(tmp_path / ".chat_ledger.json"))
+
+    class Server:
+        received = []
+        reject = None
+        delay = 0
+
+        def __call__(self, url, method, body, token):
+            time.sleep(self.delay)
+            conversation = body["rawConversation"]
+            if self.reject and not conversation.startswith(FULL):
+                raise APIError("Partial conversation refused", self.reject)
+            self.received.append(conversation)
+            return {"success": True, "result": {"received": len(conversation)}}
+
+    fake = Server()
+    fake.received = []
+    monkeypatch.setattr(chat, "http_request", fake)
+    return fake
+
+
+FULL = "hello\n\nI am a data engineer"
+
+
+def submit(conversation, profile="portrait", **kwargs):
+    return chat.submit_chat_profile("http://api.test", "token-1", profile, conversation, **kwargs)
+
+
+def test_plan_upload_counts_repeated_turns():
+    digests = [chat._digest(turn) for turn in ("a", "b", "a", "c")]
+    entry = {"segments": {digests[0]: 1, digests[1]: 1}, "profile": chat._digest("p")}
+    # The second "a" was only uploaded once
+    assert chat.plan_upload(entry, digests, "p") == [2, 3]
+    assert chat.plan_upload(entry, digests[:2], "p") is None
+    assert chat.plan_upload(entry, digests[:2], "new portrait") == []
+
+
+def test_full_then_delta_then_skipped(server):
+    assert submit(FULL)["upload"]["mode"] == "full"
+    assert submit(FULL + "\n\nlooking for remote work")["upload"] == {"mode": "delta", "segments": 1, "total": 3}
+    assert submit(FULL + "\n\nlooking for remote work")["upload"]["mode"] == "skipped"
+    assert server.received == [FULL, "looking for remote work"]
+
+
+def test_rejected_delta_falls_back_to_the_whole_conversation(server):
+    submit(FULL)
+    server.reject = 422
+    result = submit(FULL + "\n\nmore")
+    assert result["upload"] == {"mode": "full", "segments": 3, "total": 3}
+    assert server.received == [FULL, FULL + "\n\nmore"]
+
+
+def test_rejected_delta_without_new_turns_is_not_reuploaded(server):
+    submit(FULL)
+    server.reject = 422
+    result = submit(FULL, profile="updated portrait")
+    assert result["success"] is False
+    assert result["upload"]["mode"] == "skipped"
+    assert server.received == [FULL]
+
+
+def test_concurrent_submissions_send_new_turns_once(server):
+    submit(FULL)
+    server.delay = 0.1
+    results = []
+
+    def run():
+        results.append(submit(FULL + "\n\nnew turn"))
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.received == [FULL, "new turn"]
+    assert sorted(result["upload"]["mode"] for result in results) == ["delta", "skipped", "skipped", "skipped"]
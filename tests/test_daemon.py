@@ -0,0 +1,101 @@
+"""Forwarding script actions to the resident daemon (daemon.py)."""
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import subprocess
+
+import pytest
+
+import daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "d.sock")
+    monkeypatch.setattr(daemon, "SOCKET_PATH", path)
+    monkeypatch.delenv("JOBCLAW_DAEMON")
+    return path
+
+
+def _fake_daemon(path, reply=None):
+    """Listen on `path` and answer each message with `reply`; None reads it and never answers."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(4)
+    received = []
+    held = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            received.append(json.loads(conn.makefile("rb").readline()))
+            if reply is None:
+                held.append(conn)
+            else:
+                conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+                conn.close()
+    threading.Thread(target=serve, daemon=True).start()
+    return server, received
+
+
+def test_forward_without_daemon_runs_in_process(socket_path):
+    assert daemon.forward("get_profile", {"action": "profile"}) is None
+
+
+def test_forward_returns_the_daemon_result(socket_path):
+    server, received = _fake_daemon(socket_path, {"result": {"success": True, "result": 42}})
+    try:
+        assert daemon.forward("get_profile", {"action": "profile"}) == {"success": True, "result": 42}
+    finally:
+        server.close()
+    assert received[0]["script"] == "get_profile"
+    assert received[0]["context"] == daemon._context()
+
+
+def test_declined_action_runs_in_process(socket_path):
+    server, _ = _fake_daemon(socket_path, {"declined": "settings differ"})
+    try:
+        assert daemon.forward("get_profile", {"action": "profile"}) is None
+    finally:
+        server.close()
+
+
+def test_unanswered_action_is_an_error_not_a_fallback(socket_path, monkeypatch):
+    monkeypatch.setattr(daemon, "FORWARD_TIMEOUT", 0.3)
+    server, received = _fake_daemon(socket_path)
+    try:
+        with pytest.raises(Exception, match="did not answer"):
+            daemon.forward("publish_job", {"action": "publish"})
+    finally:
+        server.close()
+    assert len(received) == 1
+
+
+def test_real_daemon_forwards_matching_callers_and_declines_others(socket_path, monkeypatch):
+    env = dict(os.environ, JOBCLAW_DAEMON_SOCKET=socket_path)
+    proc = subprocess.Popen([sys.executable, daemon.__file__, "serve"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 10
+        while daemon.status()["result"]["running"] is False:
+            assert time.time() < deadline and proc.poll() is None
+            time.sleep(0.05)
+
+        # Run by the daemon: its error comes back instead of a fallback
+        with pytest.raises(Exception, match="Unknown action: bogus"):
+            daemon.forward("get_profile", {"action": "bogus"})
+
+        # Different settings: declined, so the caller runs it (no daemon error)
+        monkeypatch.setenv("JOBCLAW_TOKEN_TTL", "5")
+        assert daemon.forward("get_profile", {"action": "bogus"}) is None
+    finally:
+        daemon.stop()
+        proc.wait(10)
@@ -0,0 +1,63 @@
+"""Paged list traversal (AuthenticatedClient.iter_items / get_list) against the mock API."""
+import pytest
+
+
+def _requests(api, endpoint):
+    return api.stats()["byEndpoint"].get(endpoint, 0)
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_page_number_paging(mock_api, client_for, prefetch):
+    api, url = mock_api
+    api.configure(matches=10)
+    client = client_for(url, "JOB_SEEKER")
+    client.token_manager.get_token()
+    api.reset_stats()
+
+    items = list(client.iter_items("/matches", page_size=3, prefetch=prefetch))
+    assert [item["jobId"] for item in items] == [f"j{k}" for k in range(10)]
+    # 3 + 3 + 3 + 1: the short last page ends the traversal
+    assert _requests(api, "/matches") == 4
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_cursor_paging(mock_api, client_for, prefetch):
+    api, url = mock_api
+    api.configure(matches=10)
+    client = client_for(url, "RECRUITER")
+    client.token_manager.get_token()
+    api.reset_stats()
+
+    items = list(client.iter_items("/matches/job/j0", page_size=4, prefetch=prefetch))
+    assert [item["jobSeekerId"] for item in items] == [f"c{k}" for k in range(10)]
+    # 4 + 4 + 2, the last page without a nextCursor
+    assert _requests(api, "/matches/job/{id}") == 3
+
+
+@pytest.mark.parametrize("endpoint, user_type, key", [
+    ("/matches", "JOB_SEEKER", "jobId"),
+    ("/matches/job/j0", "RECRUITER", "jobSeekerId"),
+])
+def test_limit_stops_early(mock_api, client_for, endpoint, user_type, key):
+    api, url = mock_api
+    api.configure(matches=50)
+    client = client_for(url, user_type)
+    client.token_manager.get_token()
+    api.reset_stats()
+
+    result = client.get_list(endpoint, limit=5, page_size=3)
+    assert [item[key][1:] for item in result["result"]] == ["0", "1", "2", "3", "4"]
+    # The second page reaches the limit, so no third page is requested
+    assert api.stats()["requests"] == 2
+
+
+def test_get_list_without_paging_is_one_request(mock_api, client_for):
+    api, url = mock_api
+    api.configure(matches=7)
+    client = client_for(url, "JOB_SEEKER")
+    client.token_manager.get_token()
+    api.reset_stats()
+
+    result = client.get_list("/matches")
+    assert len(result["result"]) == 7
+    assert api.stats()["requests"] == 1
@@ -0,0 +1,134 @@
+"""Requests through an HTTP(S) proxy configured the way urllib reads it (http_proxy, no_proxy, ...)."""
+import socket
+import asyncio
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+import pytest
+
+from base import ConnectionPool
+
+
+class ForwardProxy:
+    """
+    Minimal forward proxy recording each request line and Proxy-Authorization.
+
+    Absolute-URI requests are relayed to their origin. CONNECT is refused
+    (there is no TLS origin to tunnel to), which still shows it was asked for.
+    """
+
+    def __init__(self):
+        self.seen = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.address = f"127.0.0.1:{self._sock.getsockname()[1]}"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        reader = conn.makefile("rb")
+        try:
+            while True:
+                request_line = reader.readline().decode("latin-1").strip()
+                if not request_line:
+                    return
+                headers = {}
+                for line in iter(reader.readline, b"\r\n"):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.seen.append((request_line, headers.get("proxy-authorization")))
+                method, target, _ = request_line.split(" ", 2)
+                if method == "CONNECT":
+                    conn.sendall(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+                    return
+
+                body = reader.read(int(headers.get("content-length") or 0))
+                parts = urlsplit(target)
+                origin = http.client.HTTPConnection(parts.hostname, parts.port)
+                forwarded = {k: v for k, v in headers.items() if k not in ("proxy-authorization", "connection")}
+                origin.request(method, parts.path + (f"?{parts.query}" if parts.query else ""), body or None,
+                               forwarded)
+                resp = origin.getresponse()
+                payload = resp.read()
+                origin.close()
+                head = [f"HTTP/1.1 {resp.status} {resp.reason}"]
+                head += [f"{k}: {v}" for k, v in resp.getheaders()
+                         if k.lower() not in ("content-length", "transfer-encoding", "connection")]
+                head.append(f"Content-Length: {len(payload)}")
+                conn.sendall(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        except OSError:
+            return
+        finally:
+            reader.close()
+            conn.close()
+
+    def close(self):
+        self._sock.close()
+
+
+@pytest.fixture
+def proxy():
+    server = ForwardProxy()
+    yield server
+    server.close()
+
+
+def test_http_requests_go_through_the_proxy(mock_api, client_for, proxy, monkeypatch):
+    api, url = mock_api
+    monkeypatch.setenv("http_proxy", f"http://user:p%40ss@{proxy.address}")
+    client = client_for(url, "JOB_SEEKER")
+    client.pool = client.token_manager.pool = ConnectionPool()
+
+    assert client.get("/job-seekers/profile")["result"]["name"] == "Candidate"
+    lines = [line for line, _ in proxy.seen]
+    assert f"GET {url}/job-seekers/profile HTTP/1.1" in lines
+    assert f"POST {url}/auth/token HTTP/1.1" in lines
+    assert {auth for _, auth in proxy.seen} == {"Basic dXNlcjpwQHNz"}  # user:p@ss
+
+
+def test_no_proxy_connects_directly(mock_api, client_for, proxy, monkeypatch):
+    api, url = mock_api
+    monkeypatch.setenv("http_proxy", f"http://{proxy.address}")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    client = client_for(url, "JOB_SEEKER")
+    client.pool = client.token_manager.pool = ConnectionPool()
+
+    assert client.get("/job-seekers/profile")["result"]["name"] == "Candidate"
+    assert proxy.seen == []
+
+
+def test_https_requests_open_a_connect_tunnel(proxy, monkeypatch):
+    monkeypatch.setenv("https_proxy", f"http://user:pw@{proxy.address}")
+    with pytest.raises(OSError, match="403"):
+        ConnectionPool(timeout=5).request("GET", "https://api.example.test/jobs")
+    [(request_line, auth)] = proxy.seen
+    assert request_line.startswith("CONNECT api.example.test:443 ")
+    assert auth == "Basic dXNlcjpwdw=="
+
+
+def test_asyncio_client_uses_the_proxy(mock_api, proxy, tmp_path, monkeypatch):
+    from base_async import AsyncConnectionPool, AsyncAuthenticatedClient
+    api, url = mock_api
+    monkeypatch.setenv("http_proxy", f"http://{proxy.address}")
+    monkeypatch.setenv("https_proxy", f"http://{proxy.address}")
+
+    async def main():
+        client = AsyncAuthenticatedClient(url, "JOB_SEEKER", token_file=str(tmp_path / ".token"), cache=False)
+        profile = await client.get("/job-seekers/profile")
+        with pytest.raises(ConnectionRefusedError, match="403"):
+            await AsyncConnectionPool(timeout=5).request("GET", "https://api.example.test/jobs")
+        return profile
+
+    assert asyncio.run(main())["result"]["name"] == "Candidate"
+    lines = [line for line, _ in proxy.seen]
+    assert f"GET {url}/job-seekers/profile HTTP/1.1" in lines
+    assert lines[-1] == "CONNECT api.example.test:443 HTTP/1.1"
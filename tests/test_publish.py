@@ -0,0 +1,125 @@
+"""Publish map planning, skipping and recording in the recruiter's publish_job.py."""
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "skills", "recruiter", "scripts"))
+import publish_job  # noqa: E402
+
+JOB = {field: f"{field} text" for field in publish_job.JOB_FIELDS}
+
+
+@pytest.fixture(autouse=True)
+def _map_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.setattr(publish_job, "PUBLISH_MAP_FILE", str(tmp_path / ".publish_map.json"))
+    monkeypatch.setattr(publish_job, "PUBLISH_LOCK_DIR", str(tmp_path / ".publish_locks"))
+
+
+@pytest.fixture
+def recruiter(mock_api, client_for, monkeypatch):
+    """Yield (MockAPI, base URL, client); publish_job's get_client returns that client."""
+    api, url = mock_api
+    client = client_for(url, "RECRUITER")
+    monkeypatch.setattr(publish_job, "get_client", lambda api_url, user_type: client)
+    client.token_manager.get_token()
+    api.reset_stats()
+    yield api, url, client
+
+
+def _writes(api):
+    by_endpoint = api.stats()["byEndpoint"]
+    return {"POST": by_endpoint.get("/jobs", 0), "PUT": by_endpoint.get("/jobs/{id}", 0)}
+
+
+def test_plan_publish():
+    scope = "api|token"
+    assert publish_job.plan_publish(scope, JOB, "req-1")["mode"] == "create"
+
+    publish_job._record_publish(scope, "n7", "req-1", JOB)
+    assert publish_job.plan_publish(scope, JOB, "req-1")["mode"] == "skip"
+
+    plan = publish_job.plan_publish(scope, dict(JOB, salary="more"), "req-1")
+    assert (plan["mode"], plan["jobId"], plan["body"]) == ("update", "n7", {"salary": "more"})
+    assert publish_job.plan_publish(scope, JOB, "req-1", full=True)["body"] == JOB
+
+
+def test_republish_sends_only_changes(recruiter):
+    api, url, _ = recruiter
+    created = publish_job.publish_job(url, dict(JOB, externalId="req-1"))
+    assert created["publish"]["mode"] == "create"
+
+    assert publish_job.publish_job(url, dict(JOB, externalId="req-1"))["publish"]["mode"] == "skip"
+    updated = publish_job.publish_job(url, dict(JOB, salary="more", externalId="req-1"))
+    assert updated["publish"] == {"mode": "update", "jobId": created["publish"]["jobId"],
+                                  "fields": ["salary"], "externalId": "req-1"}
+    assert _writes(api) == {"POST": 1, "PUT": 1}
+
+
+def test_publish_without_external_id_is_not_recorded(recruiter):
+    api, url, _ = recruiter
+    for _ in range(3):
+        assert publish_job.publish_job(url, dict(JOB))["publish"]["mode"] == "create"
+    assert _writes(api) == {"POST": 3, "PUT": 0}
+    assert not os.path.exists(publish_job.PUBLISH_MAP_FILE)
+
+
+def test_update_by_job_id_refreshes_the_external_id_entry(recruiter):
+    api, url, _ = recruiter
+    job_id = publish_job.publish_job(url, dict(JOB, externalId="req-1"))["publish"]["jobId"]
+    publish_job.update_job(url, {"jobId": job_id, "salary": "more"})
+
+    # The map saw the new salary, so republishing it sends nothing
+    assert publish_job.publish_job(url, dict(JOB, salary="more", externalId="req-1"))["publish"]["mode"] == "skip"
+    assert _writes(api) == {"POST": 1, "PUT": 1}
+
+
+def test_delete_is_always_sent(recruiter):
+    api, url, _ = recruiter
+    publish_job.publish_job(url, dict(JOB, status="INACTIVE", externalId="req-1"))
+    for _ in range(2):
+        assert publish_job.delete_job(url, {"externalId": "req-1"})["publish"]["mode"] == "update"
+    assert _writes(api) == {"POST": 1, "PUT": 2}
+
+
+def test_concurrent_publishes_of_one_posting_create_one_job(recruiter):
+    api, url, _ = recruiter
+    results = []
+
+    def publish():
+        results.append(publish_job.publish_job(url, dict(JOB, externalId="req-1")))
+    threads = [threading.Thread(target=publish) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(result["publish"]["mode"] for result in results) == ["create"] + ["skip"] * 7
+    assert _writes(api) == {"POST": 1, "PUT": 0}
+
+
+def test_concurrent_async_publishes_do_not_starve_the_executor(recruiter, monkeypatch):
+    from base_async import AsyncAuthenticatedClient
+    api, url, client = recruiter
+    # A token due for its verifiedAt refresh makes every write touch the token file in the executor
+    token_file = client.token_manager.token_file
+    with open(token_file) as f:
+        meta = json.load(f)
+    meta["verifiedAt"] = time.time() - 300
+    with open(token_file, "w") as f:
+        json.dump(meta, f)
+
+    async def main():
+        client = AsyncAuthenticatedClient(url, "RECRUITER", token_file=token_file, cache=False)
+        monkeypatch.setattr(publish_job, "_async_client", lambda api_url: client)
+        jobs = [publish_job.publish_job_async(url, dict(JOB, externalId=f"req-{k % 4}")) for k in range(64)]
+        return await asyncio.wait_for(asyncio.gather(*jobs), 20)
+
+    results = asyncio.run(main())
+    assert sorted(result["publish"]["mode"] for result in results) == ["create"] * 4 + ["skip"] * 60
+    assert _writes(api) == {"POST": 4, "PUT": 0}
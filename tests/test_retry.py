@@ -0,0 +1,169 @@
+"""Keep-alive connection reuse, retries and the adaptive rate limiter."""
+import os
+import time
+import socket
+import threading
+
+import pytest
+
+from base import APIError, ConnectionPool, RateLimiter, RetryPolicy
+
+
+class KeepAliveServer:
+    """
+    Minimal HTTP/1.1 server answering every request with 200 and its method.
+
+    Idle connections are closed after `idle_timeout` seconds. With
+    `drop_after`, the connection is closed without a reply once that many
+    requests were answered on it.
+    """
+
+    def __init__(self, idle_timeout=5.0, drop_after=None):
+        self.idle_timeout = idle_timeout
+        self.drop_after = drop_after
+        self.received = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.url = f"http://127.0.0.1:{self._sock.getsockname()[1]}/"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        conn.settimeout(self.idle_timeout)
+        reader = conn.makefile("rb")
+        answered = 0
+        try:
+            while True:
+                request_line = reader.readline()
+                if not request_line:
+                    return
+                length = 0
+                for line in iter(reader.readline, b"\r\n"):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                reader.read(length)
+                method = request_line.split()[0].decode()
+                self.received.append(method)
+                if self.drop_after is not None and answered >= self.drop_after:
+                    return
+                reply = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s"
+                conn.sendall(reply % (len(method), method.encode()))
+                answered += 1
+        except OSError:
+            return
+        finally:
+            reader.close()
+            conn.close()
+
+    def close(self):
+        self._sock.close()
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def make(**settings):
+        servers.append(KeepAliveServer(**settings))
+        return servers[-1]
+    yield make
+    for server in servers:
+        server.close()
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_request_after_idle_close_uses_a_new_connection(server_factory, method):
+    server = server_factory(idle_timeout=0.2)
+    pool = ConnectionPool()
+    assert pool.request("GET", server.url)[0] == 200
+    time.sleep(0.5)
+
+    status, _, body = pool.request(method, server.url, body=b"{}")
+    assert (status, body) == (200, method.encode())
+    assert server.received == ["GET", method]
+
+
+def test_sent_request_is_replayed_only_if_idempotent(server_factory):
+    server = server_factory(drop_after=1)
+    pool = ConnectionPool()
+    pool.request("GET", server.url)
+    # Dropped after receiving it: a GET goes out again on a fresh connection
+    assert pool.request("GET", server.url)[0] == 200
+    assert server.received == ["GET", "GET", "GET"]
+
+    # ...but a POST the server may have acted on does not
+    with pytest.raises(ConnectionError):
+        pool.request("POST", server.url, body=b"{}")
+    assert server.received == ["GET", "GET", "GET", "POST"]
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_retries=2)
+    unavailable = APIError("Service unavailable", 503)
+    assert policy.should_retry("GET", unavailable, 0)
+    assert policy.should_retry("GET", APIError("Connection error"), 1)
+    assert not policy.should_retry("GET", unavailable, 2)
+    assert not policy.should_retry("GET", APIError("Not found", 404), 0)
+    assert not policy.should_retry("POST", unavailable, 0)
+    assert policy.should_retry("POST", unavailable, 0, retry_unsafe=True)
+    assert not policy.should_retry("GET", ValueError("bug"), 0)
+
+    assert 0 <= policy.delay(3, unavailable) <= 4
+    assert policy.delay(0, APIError("Too many requests", 429, {"Retry-After": "3"})) >= 3
+
+
+def test_client_retries_transient_errors(mock_api, client_for):
+    api, url = mock_api
+    client = client_for(url, "JOB_SEEKER")
+    client.retry_policy = RetryPolicy(max_retries=2, base_delay=0)
+    client.token_manager.get_token()
+    api.configure(error_rate=1.0, error_status=503)
+    api.reset_stats()
+
+    with pytest.raises(APIError):
+        client.get("/job-seekers/profile")
+    assert api.stats()["requests"] == 3
+
+    api.reset_stats()
+    with pytest.raises(APIError):
+        client.request("/job-seekers/resume", "POST", {"name": "x"})
+    assert api.stats()["requests"] == 1
+
+
+def test_rate_limiter_spaces_requests_and_adapts():
+    limiter = RateLimiter(rate=4, burst=1, max_rate=4, increase=1)
+    assert limiter.try_acquire() == 0
+    assert 0 < limiter.try_acquire() <= 0.25
+
+    limiter.on_throttle(retry_after=0)
+    assert limiter.rate == 2
+    limiter.on_success()
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 4
+
+
+def test_rate_limiter_state_file_is_shared_and_written_on_change(tmp_path):
+    state_file = str(tmp_path / "rate.json")
+    first = RateLimiter(rate=1, burst=1, state_file=state_file)
+    second = RateLimiter(rate=1, burst=1, state_file=state_file)
+    assert first.try_acquire() == 0
+    # The other process's bucket is already empty
+    assert second.try_acquire() > 0
+
+    written = os.stat(state_file).st_mtime_ns
+    time.sleep(0.01)
+    first.on_success()  # At max_rate already: nothing changes
+    assert os.stat(state_file).st_mtime_ns == written
+    first.on_throttle(retry_after=0)
+    second.try_acquire()
+    assert second.rate == 0.5
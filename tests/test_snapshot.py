@@ -0,0 +1,66 @@
+"""Snapshot sync and diff against the mock API."""
+from snapshot import Snapshot, match_id
+
+
+def test_match_id_depends_on_owner():
+    match = {"jobId": "j1", "jobSeekerId": "c7", "score": 0.9}
+    # A recruiter's job lists candidates; every row carries the same jobId
+    assert match_id(match, owner="j1") == "c7"
+    assert match_id({"jobId": "j1", "jobSeeker": {"id": "c8"}}, owner="j1") == "c8"
+    # A job seeker's matches are jobs
+    assert match_id(match) == "j1"
+    assert match_id({"job": {"id": "j2"}, "score": 0.8}) == "j2"
+
+
+def test_recruiter_sync_keeps_every_candidate_of_a_job(mock_api, client_for, tmp_path):
+    api, url = mock_api
+    snapshot = Snapshot(client_for(url, "RECRUITER"), str(tmp_path / "snapshot.db"))
+    try:
+        first = snapshot.sync()
+        assert first["changes"] == {"new": 2, "removed": 0, "rescored": 0}
+        assert len(snapshot._query("SELECT id FROM matches WHERE owner != ''")) == 2
+
+        api.configure(matches=3)
+        second = snapshot.sync()
+        assert second["changes"] == {"new": 1, "removed": 0, "rescored": 0}
+
+        report = snapshot.diff()
+        assert [match["jobId"] for match in report["matches"]["new"]] == ["j0"]
+        assert report["matches"]["removed"] == []
+    finally:
+        snapshot.close()
+
+
+def test_job_seeker_sync_reports_new_matches(mock_api, client_for, tmp_path):
+    api, url = mock_api
+    snapshot = Snapshot(client_for(url, "JOB_SEEKER"), str(tmp_path / "snapshot.db"))
+    try:
+        snapshot.sync()
+        api.configure(matches=4)
+        assert snapshot.sync()["changes"] == {"new": 2, "removed": 0, "rescored": 0}
+        assert len(snapshot.diff()["matches"]["new"]) == 2
+    finally:
+        snapshot.close()
+
+
+def test_recruiter_watch_emits_each_new_candidate(mock_api, client_for, tmp_path):
+    import threading
+    api, url = mock_api
+    snapshot = Snapshot(client_for(url, "RECRUITER"), str(tmp_path / "snapshot.db"))
+    stop = threading.Event()
+    events = []
+
+    def emit(event):
+        events.append(event)
+        if event["event"] == "baseline" and event["endpoint"] == "/matches/job/j0":
+            api.configure(matches=4)
+        if sum(1 for e in events if e["event"] == "new") == 2:
+            stop.set()
+
+    try:
+        summary = snapshot.watch(emit, interval=0.2, min_interval=0.1, max_interval=0.3, duration=10, stop=stop)
+    finally:
+        snapshot.close()
+    changes = [event for event in events if event["event"] not in ("baseline", "error")]
+    assert [(event["event"], event["jobId"]) for event in changes] == [("new", "j0"), ("new", "j0")]
+    assert summary["changes"] == {"new": 2, "removed": 0, "rescored": 0}
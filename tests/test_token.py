@@ -0,0 +1,94 @@
+"""Single-flight token minting and the trust TTL of TokenManager."""
+import time
+import asyncio
+import threading
+
+from base import TokenManager, read_token_file, write_token_file
+
+
+def _auth_requests(api):
+    by_endpoint = api.stats()["byEndpoint"]
+    return by_endpoint.get("/auth/token", 0), by_endpoint.get("/auth/verify", 0)
+
+
+def _in_threads(calls):
+    """Start every call in its own thread at once and return their results."""
+    results = []
+    threads = [threading.Thread(target=lambda call=call: results.append(call())) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_processes_with_an_expired_token_mint_once(mock_api, tmp_path):
+    api, url = mock_api
+    api.configure(latency_ms=50)
+    token_file = str(tmp_path / ".token")
+    write_token_file({"token": "expired", "issuedAt": 0, "verifiedAt": 0, "expiresAt": time.time() - 1}, token_file)
+
+    # One manager per "process", all sharing the token file
+    tokens = _in_threads([TokenManager(url, token_file=token_file).get_token for _ in range(8)])
+    assert len(set(tokens)) == 1 and tokens[0] != "expired"
+    assert read_token_file(token_file)["token"] == tokens[0]
+    assert _auth_requests(api) == (1, 0)
+
+
+def test_concurrent_refreshes_of_a_rejected_token_mint_once(mock_api, tmp_path):
+    api, url = mock_api
+    token_file = str(tmp_path / ".token")
+    managers = [TokenManager(url, token_file=token_file) for _ in range(8)]
+    rejected = managers[0].get_token()
+    assert {manager.get_token() for manager in managers} == {rejected}
+    api.configure(latency_ms=50)
+    api.reset_stats()
+
+    tokens = _in_threads([lambda manager=manager: manager.refresh_token(rejected) for manager in managers])
+    assert len(set(tokens)) == 1 and tokens[0] != rejected
+    assert _auth_requests(api)[0] == 1
+
+
+def test_threads_of_one_manager_share_one_mint(mock_api, tmp_path):
+    api, url = mock_api
+    api.configure(latency_ms=50)
+    manager = TokenManager(url, token_file=str(tmp_path / ".token"))
+    assert len(set(_in_threads([manager.get_token] * 8))) == 1
+    assert manager.creations == 1
+
+
+def test_token_is_trusted_until_the_ttl_then_verified(mock_api, tmp_path):
+    api, url = mock_api
+    token_file = str(tmp_path / ".token")
+    token = TokenManager(url, token_file=token_file).get_token()
+    meta = read_token_file(token_file)
+    api.reset_stats()
+
+    write_token_file(dict(meta, verifiedAt=time.time() - 30), token_file)
+    assert TokenManager(url, trust_ttl=60, token_file=token_file).get_token() == token
+    assert _auth_requests(api) == (0, 0)
+
+    write_token_file(dict(meta, verifiedAt=time.time() - 120), token_file)
+    manager = TokenManager(url, trust_ttl=60, token_file=token_file)
+    assert manager.get_token() == token
+    assert (manager.verifications, _auth_requests(api)) == (1, (0, 1))
+    # The verification is saved, so the next run trusts the token again
+    assert time.time() - read_token_file(token_file)["verifiedAt"] < 5
+    assert TokenManager(url, trust_ttl=60, token_file=token_file).get_token() == token
+    assert _auth_requests(api) == (0, 1)
+
+    assert TokenManager(url, trust_ttl=0, token_file=token_file).get_token() == token
+    assert _auth_requests(api) == (0, 2)
+
+
+def test_async_tasks_share_one_mint(mock_api, tmp_path):
+    from base_async import AsyncTokenManager
+    api, url = mock_api
+    api.configure(latency_ms=50)
+
+    async def main():
+        manager = AsyncTokenManager(url, token_file=str(tmp_path / ".token"))
+        return await asyncio.gather(*[manager.get_token_async() for _ in range(8)])
+
+    assert len(set(asyncio.run(main()))) == 1
+    assert _auth_requests(api) == (1, 0)